@@ -0,0 +1,517 @@
+"""Local HTTP API serving the toolkit's helpers
+
+Run from the repository root:
+
+    python -m api --port 8765 --workers 4 --queue-size 16
+
+Then POST the raw file as the request body, with options in the query string:
+
+    curl --data-binary @photo.jpg "http://127.0.0.1:8765/tools/compress-image?quality=70" -o small.jpg
+    curl --data-binary @site.css http://127.0.0.1:8765/tools/minify-css
+    curl --data-binary @big.iso "http://127.0.0.1:8765/tools/hash?algorithm=sha256"
+
+GET /tools lists the endpoints and their parameters, GET /health reports queue
+usage and GET /metrics exposes per-endpoint latency in Prometheus text format.
+Requests beyond the worker pool plus its queue are refused with 429 before their
+body is read. Connections are kept alive between requests. Bodies larger than
+SPOOL_MEMORY_BYTES are streamed to a temporary file rather than held in memory,
+and large responses are sent back in chunks. Streamlit is never imported.
+"""
+import argparse
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Any, Callable, Optional, Tuple, Union
+from urllib.parse import urlsplit, parse_qs
+
+from utils.batch import BatchFile, get_process_pool, discard_process_pool, MAX_BATCH_WORKERS
+from utils.metrics import measure, render_prometheus
+from utils.image_processing import RESAMPLING_FILTERS, resize_image_file, compress_image_file
+from utils.css_processing import minify_css, format_css
+from utils.log_analysis import scan_log_lines, build_log_threats
+
+# Largest accepted request body
+MAX_BODY_BYTES = int(os.getenv("API_MAX_BODY_BYTES", 512 * 1024 * 1024))
+
+# Bodies and results above this size go through temporary files instead of memory
+SPOOL_MEMORY_BYTES = int(os.getenv("API_SPOOL_MEMORY_BYTES", 8 * 1024 * 1024))
+
+# Idle keep-alive connections are closed after this many seconds
+KEEP_ALIVE_TIMEOUT = float(os.getenv("API_KEEP_ALIVE_TIMEOUT", 15))
+
+_STREAM_CHUNK_SIZE = 256 * 1024
+
+CONTENT_TYPES = {
+    'jpg': 'image/jpeg', 'jpeg': 'image/jpeg', 'png': 'image/png', 'gif': 'image/gif',
+    'bmp': 'image/bmp', 'tiff': 'image/tiff', 'webp': 'image/webp'
+}
+
+Payload = Union[bytes, str]  # in-memory bytes, or the path of a temporary file
+
+
+class RequestError(Exception):
+    """Client error that is reported with the given HTTP status"""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+# Operations; module-level so they can run in worker processes. Each takes the request
+# body (bytes or a temp file path) plus validated options and returns
+# (payload, content type, filename).
+
+def _read_source(source: Payload) -> bytes:
+    if isinstance(source, bytes):
+        return source
+    with open(source, 'rb') as body:
+        return body.read()
+
+
+def _text_source(source: Payload) -> str:
+    return _read_source(source).decode('utf-8', errors='replace')
+
+
+def _spool_result(data: bytes) -> Payload:
+    """Hand large results back as a file so they aren't pickled through the pool's pipe"""
+    if len(data) <= SPOOL_MEMORY_BYTES:
+        return data
+    with tempfile.NamedTemporaryFile(prefix="toolkit-api-", delete=False) as output:
+        output.write(data)
+        return output.name
+
+
+def compress_image_operation(source: Payload, filename: str, **options) -> Tuple[Payload, str, str]:
+    name, data = compress_image_file(BatchFile(filename, _read_source(source)), **options)
+    return _spool_result(data), CONTENT_TYPES.get(name.rsplit('.', 1)[-1].lower(), 'application/octet-stream'), name
+
+
+def resize_image_operation(source: Payload, filename: str, **options) -> Tuple[Payload, str, str]:
+    name, data = resize_image_file(BatchFile(filename, _read_source(source)), **options)
+    return _spool_result(data), CONTENT_TYPES.get(name.rsplit('.', 1)[-1].lower(), 'application/octet-stream'), name
+
+
+def minify_css_operation(source: Payload, filename: str, **options) -> Tuple[Payload, str, str]:
+    options.update(remove_empty_rules=True, merge_selectors=False)
+    css = minify_css(_text_source(source), options)
+    return _spool_result(css.encode('utf-8')), 'text/css; charset=utf-8', filename
+
+
+def format_css_operation(source: Payload, filename: str, **options) -> Tuple[Payload, str, str]:
+    css = format_css(_text_source(source), options)
+    return _spool_result(css.encode('utf-8')), 'text/css; charset=utf-8', filename
+
+
+def format_json_operation(source: Payload, filename: str, indent: int, sort_keys: bool, compact: bool,
+                          ensure_ascii: bool) -> Tuple[Payload, str, str]:
+    parsed = json.loads(_read_source(source))
+    if compact:
+        text = json.dumps(parsed, ensure_ascii=ensure_ascii, sort_keys=sort_keys, separators=(',', ':'))
+    else:
+        text = json.dumps(parsed, indent=indent, ensure_ascii=ensure_ascii, sort_keys=sort_keys)
+    return _spool_result(text.encode('utf-8')), 'application/json', filename
+
+
+def scan_logs_operation(source: Payload, filename: str) -> Tuple[Payload, str, str]:
+    if isinstance(source, bytes):
+        stats = scan_log_lines(source.decode('utf-8', errors='replace').splitlines())
+    else:
+        with open(source, 'r', encoding='utf-8', errors='replace') as body:
+            stats = scan_log_lines(line.rstrip('\r\n') for line in body)
+    report = {
+        'total_lines': stats['total_lines'],
+        'unique_ips': len(stats['ips']),
+        'error_events': stats['error_events'],
+        'threats': build_log_threats(stats)
+    }
+    return json.dumps(report).encode('utf-8'), 'application/json', filename
+
+
+def _choice(*choices):
+    return lambda value: value if value in choices else _invalid(f"must be one of: {', '.join(choices)}")
+
+
+def _int_range(low: int, high: int):
+    def parse(value):
+        number = int(value)
+        return number if low <= number <= high else _invalid(f"must be between {low} and {high}")
+    return parse
+
+
+def _float_range(low: float, high: float):
+    def parse(value):
+        number = float(value)
+        return number if low <= number <= high else _invalid(f"must be between {low} and {high}")
+    return parse
+
+
+def _flag(value: str) -> bool:
+    if value.lower() in ('1', 'true', 'yes', 'on'):
+        return True
+    if value.lower() in ('0', 'false', 'no', 'off'):
+        return False
+    return _invalid("must be true or false")
+
+
+def _invalid(message: str):
+    raise ValueError(message)
+
+
+# name: (operation, runs in "process" or "thread", {param: (parser, default)}, description)
+ENDPOINTS: Dict[str, Tuple[Callable, str, Dict[str, Tuple[Callable, Any]], str]] = {
+    'compress-image': (compress_image_operation, "process", {
+        'compression_method': (_choice("Quality Reduction", "Resize + Quality", "Format Optimization",
+                                       "Target File Size"), "Quality Reduction"),
+        'quality': (_int_range(1, 100), 75),
+        'scale_factor': (_float_range(0.01, 1.0), 0.8),
+        'target_format': (_choice("Keep Original", "JPEG", "PNG", "WEBP"), "Keep Original"),
+        'target_size_kb': (_int_range(1, 100000), 150)
+    }, "Compress an image; returns the compressed image"),
+    'resize-image': (resize_image_operation, "process", {
+        'resize_method': (_choice("Exact Dimensions", "Scale by Percentage", "Fit to Width", "Fit to Height"),
+                          "Scale by Percentage"),
+        'width': (_int_range(1, 20000), None),
+        'height': (_int_range(1, 20000), None),
+        'scale': (_int_range(1, 1000), 100),
+        'maintain_aspect': (_flag, True),
+        'resampling': (_choice(*RESAMPLING_FILTERS), "LANCZOS")
+    }, "Resize an image; returns the resized image"),
+    'minify-css': (minify_css_operation, "process", {
+        'remove_comments': (_flag, True),
+        'remove_whitespace': (_flag, True),
+        'shorten_colors': (_flag, True),
+        'remove_semicolons': (_flag, True)
+    }, "Minify a stylesheet"),
+    'format-css': (format_css_operation, "process", {
+        'indent_type': (_choice("Spaces", "Tabs"), "Spaces"),
+        'indent_size': (_int_range(1, 8), 2),
+        'brace_style': (_choice("Same Line", "New Line"), "Same Line")
+    }, "Pretty-print a stylesheet"),
+    'format-json': (format_json_operation, "process", {
+        'indent': (_int_range(0, 8), 4),
+        'sort_keys': (_flag, False),
+        'compact': (_flag, False),
+        'ensure_ascii': (_flag, False)
+    }, "Pretty-print or compact a JSON document"),
+    'scan-logs': (scan_logs_operation, "process", {},
+                  "Scan a log for brute force, SQL injection and error spikes; returns JSON findings"),
+    'hash': (None, "thread", {
+        'algorithm': (_choice('md5', 'sha1', 'sha256', 'sha512', 'blake2b'), "sha256")
+    }, "Hash the body while it streams in; returns JSON with the hex digest"),
+}
+
+
+def parse_options(endpoint: str, query: Dict[str, list]) -> Dict[str, Any]:
+    """Validate query parameters against an endpoint's spec, filling in defaults"""
+    spec = ENDPOINTS[endpoint][2]
+    unknown = set(query) - set(spec) - {'filename'}
+    if unknown:
+        raise RequestError(400, f"Unknown parameter(s): {', '.join(sorted(unknown))}")
+
+    options = {}
+    for name, (parser, default) in spec.items():
+        if name not in query:
+            options[name] = default
+            continue
+        try:
+            options[name] = parser(query[name][-1])
+        except ValueError as e:
+            raise RequestError(400, f"Invalid {name}: {e}")
+
+    if endpoint == 'resize-image':
+        method = options['resize_method']
+        if method in ("Exact Dimensions", "Fit to Width") and not options['width']:
+            raise RequestError(400, f"width is required for {method}")
+        if method in ("Exact Dimensions", "Fit to Height") and not options['height']:
+            raise RequestError(400, f"height is required for {method}")
+    return options
+
+
+class AdmissionControl:
+    """Counts requests holding a worker slot or waiting for one and refuses the rest"""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.active = 0
+        self.rejected = 0
+        self._lock = threading.Lock()
+
+    def try_acquire(self) -> bool:
+        with self._lock:
+            if self.active >= self.limit:
+                self.rejected += 1
+                return False
+            self.active += 1
+            return True
+
+    def release(self):
+        with self._lock:
+            self.active -= 1
+
+
+class ToolServer(ThreadingHTTPServer):
+    """HTTP server owning the worker pools and admission control"""
+
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int], workers: int = MAX_BATCH_WORKERS, queue_size: int = 16,
+                 mode: str = "process", max_body_bytes: int = MAX_BODY_BYTES):
+        super().__init__(address, ToolRequestHandler)
+        self.workers = max(1, workers)
+        self.mode = mode
+        self.max_body_bytes = max_body_bytes
+        self.admission = AdmissionControl(self.workers + queue_size)
+        self.quiet = False
+        self.thread_pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="api")
+
+    def run_operation(self, kind: str, func: Callable, *args, **kwargs):
+        """Run an operation on the process pool (or threads when configured) and wait for it"""
+        if kind == "process" and self.mode == "process":
+            try:
+                return get_process_pool(self.workers).submit(func, *args, **kwargs).result()
+            except BrokenProcessPool:
+                discard_process_pool(self.workers)
+                raise
+        return self.thread_pool.submit(func, *args, **kwargs).result()
+
+    def server_close(self):
+        super().server_close()
+        self.thread_pool.shutdown(wait=False, cancel_futures=True)
+
+
+class ToolRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "ToolkitAPI/1.0"
+    timeout = KEEP_ALIVE_TIMEOUT
+
+    # Responses
+
+    def _send(self, status: int, payload: Payload, content_type: str, headers: Optional[Dict[str, str]] = None):
+        """Send a response, streaming file payloads in chunks"""
+        size = len(payload) if isinstance(payload, bytes) else os.path.getsize(payload)
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(size))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        if self.close_connection:
+            self.send_header("Connection", "close")
+        self.end_headers()
+
+        if self.command == "HEAD":
+            return
+        if isinstance(payload, bytes):
+            view = memoryview(payload)
+            for offset in range(0, size, _STREAM_CHUNK_SIZE):
+                self.wfile.write(view[offset:offset + _STREAM_CHUNK_SIZE])
+        else:
+            with open(payload, 'rb') as body:
+                for chunk in iter(lambda: body.read(_STREAM_CHUNK_SIZE), b''):
+                    self.wfile.write(chunk)
+
+    def _send_json(self, status: int, data: Any, headers: Optional[Dict[str, str]] = None):
+        self._send(status, json.dumps(data).encode('utf-8'), "application/json", headers)
+
+    def _send_error(self, status: int, message: str, headers: Optional[Dict[str, str]] = None):
+        self._send_json(status, {'error': message}, headers)
+
+    def log_message(self, format, *args):
+        if not self.server.quiet:
+            super().log_message(format, *args)
+
+    # Request bodies
+
+    def _iter_body(self):
+        """Yield the request body in chunks, decoding chunked transfer encoding"""
+        if self.headers.get("Transfer-Encoding", "").lower() == "chunked":
+            received = 0
+            while True:
+                size_line = self.rfile.readline(1024)
+                try:
+                    size = int(size_line.split(b';', 1)[0].strip(), 16)
+                except ValueError:
+                    raise RequestError(400, "Malformed chunked body")
+                if size == 0:
+                    while self.rfile.readline(1024) not in (b'\r\n', b'\n', b''):
+                        pass  # trailers
+                    return
+                received += size
+                if received > self.server.max_body_bytes:
+                    raise RequestError(413, f"Body exceeds {self.server.max_body_bytes:,} bytes")
+                remaining = size
+                while remaining:
+                    chunk = self.rfile.read(min(remaining, _STREAM_CHUNK_SIZE))
+                    if not chunk:
+                        raise RequestError(400, "Body ended early")
+                    remaining -= len(chunk)
+                    yield chunk
+                self.rfile.readline(1024)
+        else:
+            remaining = self._content_length()
+            while remaining:
+                chunk = self.rfile.read(min(remaining, _STREAM_CHUNK_SIZE))
+                if not chunk:
+                    raise RequestError(400, "Body ended early")
+                remaining -= len(chunk)
+                yield chunk
+
+    def _content_length(self) -> int:
+        length = self.headers.get("Content-Length")
+        if length is None:
+            raise RequestError(411, "Content-Length or chunked Transfer-Encoding is required")
+        try:
+            length = int(length)
+        except ValueError:
+            raise RequestError(400, "Invalid Content-Length")
+        if length < 0:
+            raise RequestError(400, "Invalid Content-Length")
+        if length > self.server.max_body_bytes:
+            raise RequestError(413, f"Body exceeds {self.server.max_body_bytes:,} bytes")
+        return length
+
+    def _read_body(self) -> Payload:
+        """Collect the body in memory, moving it to a temporary file once it outgrows SPOOL_MEMORY_BYTES"""
+        buffer = bytearray()
+        spool = None
+        try:
+            for chunk in self._iter_body():
+                if spool is None:
+                    buffer += chunk
+                    if len(buffer) > SPOOL_MEMORY_BYTES:
+                        spool = tempfile.NamedTemporaryFile(prefix="toolkit-api-", delete=False)
+                        spool.write(buffer)
+                        buffer = None
+                else:
+                    spool.write(chunk)
+        except BaseException:
+            if spool is not None:
+                spool.close()
+                os.remove(spool.name)
+            raise
+        if spool is None:
+            return bytes(buffer)
+        spool.close()
+        return spool.name
+
+    # Routing
+
+    def do_GET(self):
+        path = urlsplit(self.path).path.rstrip('/')
+        if path == "/health":
+            admission = self.server.admission
+            self._send_json(200, {'status': 'ok', 'active': admission.active, 'limit': admission.limit,
+                                  'rejected': admission.rejected, 'workers': self.server.workers,
+                                  'mode': self.server.mode})
+        elif path == "/metrics":
+            self._send(200, render_prometheus().encode('utf-8'), "text/plain; version=0.0.4")
+        elif path in ("", "/tools"):
+            self._send_json(200, {
+                name: {
+                    'method': 'POST',
+                    'path': f"/tools/{name}",
+                    'description': description,
+                    'parameters': {param: default for param, (_parser, default) in params.items()}
+                }
+                for name, (_func, _kind, params, description) in ENDPOINTS.items()
+            })
+        elif path.startswith("/tools/") and path[len("/tools/"):] in ENDPOINTS:
+            self._send_error(405, "Use POST with the file as the request body", {"Allow": "POST"})
+        else:
+            self._send_error(404, f"Not found: {path}")
+
+    do_HEAD = do_GET
+
+    def do_POST(self):
+        url = urlsplit(self.path)
+        endpoint = url.path.rstrip('/')[len("/tools/"):] if url.path.startswith("/tools/") else None
+        if endpoint not in ENDPOINTS:
+            self.close_connection = True
+            self._send_error(404, f"Not found: {url.path}")
+            return
+
+        # Refuse before reading the body; the unread body means the connection can't be reused
+        if not self.server.admission.try_acquire():
+            self.close_connection = True
+            self._send_error(429, "Server is at capacity, retry later", {"Retry-After": "1"})
+            return
+
+        source = None
+        try:
+            query = parse_qs(url.query, keep_blank_values=True)
+            options = parse_options(endpoint, query)
+            filename = os.path.basename(query.get('filename', [''])[-1]) or self._default_filename(endpoint)
+            with measure(f"api.{endpoint}", kind="api"):
+                if endpoint == "hash":
+                    hasher = hashlib.new(options['algorithm'])
+                    size = 0
+                    for chunk in self._iter_body():
+                        hasher.update(chunk)
+                        size += len(chunk)
+                    self._send_json(200, {'algorithm': options['algorithm'], 'digest': hasher.hexdigest(),
+                                          'bytes': size})
+                    return
+
+                source = self._read_body()
+                func, kind, _params, _description = ENDPOINTS[endpoint]
+                try:
+                    payload, content_type, result_name = self.server.run_operation(kind, func, source, filename,
+                                                                                   **options)
+                except BrokenProcessPool:
+                    self._send_error(503, "Worker process died, retry the request")
+                    return
+                except Exception as e:
+                    self._send_error(422, f"Could not process {filename}: {e}")
+                    return
+            try:
+                self._send(200, payload, content_type,
+                           {"Content-Disposition": f'attachment; filename="{result_name}"'})
+            finally:
+                if isinstance(payload, str):
+                    os.remove(payload)
+        except RequestError as e:
+            # The body may be partly unread, so don't try to reuse the connection
+            self.close_connection = True
+            self._send_error(e.status, str(e))
+        finally:
+            self.server.admission.release()
+            if isinstance(source, str):
+                os.remove(source)
+
+    @staticmethod
+    def _default_filename(endpoint: str) -> str:
+        return {'compress-image': "image.png", 'resize-image': "image.png", 'minify-css': "style.min.css",
+                'format-css': "style.css", 'format-json': "document.json"}.get(endpoint, "upload")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m api", description="Serve the toolkit's helpers over HTTP")
+    parser.add_argument("--host", default="127.0.0.1", help="interface to bind (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=MAX_BATCH_WORKERS,
+                        help="concurrent operations (default: one per CPU core)")
+    parser.add_argument("--queue-size", type=int, default=16,
+                        help="requests allowed to wait for a worker before returning 429 (default: 16)")
+    parser.add_argument("--mode", choices=["process", "thread"], default="process",
+                        help="run CPU-bound operations in processes or threads (default: process)")
+    parser.add_argument("--max-body-mb", type=float, default=MAX_BODY_BYTES / (1024 * 1024))
+    parser.add_argument("-q", "--quiet", action="store_true", help="don't log each request")
+    args = parser.parse_args(argv)
+
+    server = ToolServer((args.host, args.port), args.workers, args.queue_size, args.mode,
+                        int(args.max_body_mb * 1024 * 1024))
+    server.quiet = args.quiet
+    print(f"Serving on http://{args.host}:{server.server_address[1]} "
+          f"({server.workers} {args.mode} workers, queue {args.queue_size})", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
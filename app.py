@@ -1,12 +1,11 @@
 import streamlit as st
 import os
 from utils.common import init_session_state, display_tool_grid, search_tools
-from tools import (
-    text_tools, image_tools, security_tools, css_tools, coding_tools,
-    audio_video_tools, file_tools, ai_tools, social_media_tools,
-    color_tools, web_dev_tools, seo_marketing_tools, data_tools,
-    science_math_tools
-)
+from utils.tool_registry import load_tool_module, get_import_report
+from utils.metrics import instrument, measure, get_metrics_summary, render_prometheus, reset_metrics
+from utils.jobs import job_manager
+from utils.result_cache import result_cache
+from utils.session_memory import enforce_session_budget, get_session_memory_report
 
 # Configure page
 st.set_page_config(
@@ -20,95 +19,102 @@ st.set_page_config(
 init_session_state()
 
 # Tool categories configuration
+# Modules are referenced by import path and only imported when their category is opened
 TOOL_CATEGORIES = {
     "AI Tools": {
         "icon": "🤖",
         "description": "Artificial intelligence and machine learning tools",
-        "module": ai_tools,
+        "module": "tools.ai_tools",
         "color": "#F7DC6F"
     },
     "Text Tools": {
         "icon": "📝",
         "description": "Text processing, analysis, and manipulation tools",
-        "module": text_tools,
+        "module": "tools.text_tools",
         "color": "#FF6B6B"
     },
     "Image Tools": {
         "icon": "🖼️",
         "description": "Image editing, conversion, and analysis tools",
-        "module": image_tools,
+        "module": "tools.image_tools",
         "color": "#4ECDC4"
     },
     "Security/Privacy Tools": {
         "icon": "🔒",
         "description": "Cybersecurity, privacy, and encryption tools",
-        "module": security_tools,
+        "module": "tools.security_tools",
         "color": "#45B7D1"
     },
     "CSS Tools": {
         "icon": "🎨",
         "description": "CSS generators, validators, and design tools",
-        "module": css_tools,
+        "module": "tools.css_tools",
         "color": "#96CEB4"
     },
     "Coding Tools": {
         "icon": "💻",
         "description": "Programming utilities and development tools",
-        "module": coding_tools,
+        "module": "tools.coding_tools",
         "color": "#FFEAA7"
     },
     "Audio/Video Tools": {
         "icon": "🎵",
         "description": "Media processing and editing tools",
-        "module": audio_video_tools,
+        "module": "tools.audio_video_tools",
         "color": "#DDA0DD"
     },
     "File Tools": {
         "icon": "📁",
         "description": "File management and conversion utilities",
-        "module": file_tools,
+        "module": "tools.file_tools",
         "color": "#98D8C8"
     },
     "Social Media Tools": {
         "icon": "📱",
         "description": "Social media management and analytics",
-        "module": social_media_tools,
+        "module": "tools.social_media_tools",
         "color": "#BB8FCE"
     },
     "Color Tools": {
         "icon": "🌈",
         "description": "Color palettes, converters, and design tools",
-        "module": color_tools,
+        "module": "tools.color_tools",
         "color": "#85C1E9"
     },
     "Web Developer Tools": {
         "icon": "🌐",
         "description": "Web development and testing utilities",
-        "module": web_dev_tools,
+        "module": "tools.web_dev_tools",
         "color": "#F8C471"
     },
     "SEO/Marketing Tools": {
         "icon": "📈",
         "description": "Search optimization and marketing analytics",
-        "module": seo_marketing_tools,
+        "module": "tools.seo_marketing_tools",
         "color": "#82E0AA"
     },
     "Data Tools": {
         "icon": "📊",
         "description": "Data analysis and visualization tools",
-        "module": data_tools,
+        "module": "tools.data_tools",
         "color": "#F1948A"
     },
     "Science/Math Tools": {
         "icon": "🧮",
         "description": "Scientific calculators and mathematical tools",
-        "module": science_math_tools,
+        "module": "tools.science_math_tools",
         "color": "#AED6F1"
     }
 }
 
 
+@instrument("app.main", kind="page")
 def main():
+    # Keep this session within its memory budget before rendering anything that reads state
+    evicted = enforce_session_budget()
+    if evicted:
+        st.toast(f"Freed session memory: {', '.join(evicted)}")
+
     # Header
     st.title("🛠️ Ultimate All-in-One Digital Toolkit")
     st.markdown("### *500+ Professional Tools Across 14 Specialized Categories*")
@@ -145,6 +151,43 @@ def main():
         st.metric("Total Tools", "500+")
         st.metric("Active Users", "1,000+")
 
+        with st.expander("⏱️ Import Report"):
+            st.dataframe(get_import_report(TOOL_CATEGORIES), hide_index=True)
+
+        with st.expander("📈 Performance Metrics"):
+            metrics_summary = get_metrics_summary()
+            if metrics_summary:
+                st.dataframe(metrics_summary, hide_index=True)
+            else:
+                st.caption("No tool invocations recorded yet.")
+            cache_stats = result_cache.get_stats()
+            st.caption(f"Result cache: {cache_stats['entries']} entries, "
+                       f"{cache_stats['memory_bytes'] / (1024 * 1024):.1f} MB, "
+                       f"{cache_stats['hit_rate']:.0%} hit rate")
+            st.download_button("Download Prometheus Metrics", render_prometheus(), "toolkit_metrics.prom",
+                               "text/plain")
+            if st.button("Reset Metrics"):
+                reset_metrics()
+                st.rerun()
+
+        with st.expander("🧵 Background Jobs"):
+            jobs = job_manager.list_jobs()
+            if jobs:
+                st.dataframe(jobs, hide_index=True)
+            else:
+                st.caption("No background jobs.")
+
+        with st.expander("🧠 Session Memory"):
+            memory_report = get_session_memory_report()
+            st.progress(min(1.0, memory_report['total_bytes'] / memory_report['budget_bytes']),
+                        text=f"{memory_report['total_bytes'] / (1024 * 1024):.1f} MB of "
+                             f"{memory_report['budget_bytes'] / (1024 * 1024):.0f} MB in "
+                             f"{memory_report['entries']} entries")
+            st.dataframe(memory_report['top_consumers'], hide_index=True)
+            if memory_report['recent_evictions']:
+                st.caption("Recent evictions")
+                st.dataframe(memory_report['recent_evictions'], hide_index=True)
+
         # Quick access
         st.markdown("---")
         st.subheader("⚡ Quick Access")
@@ -236,7 +279,8 @@ def main():
 
         # Load and display category tools
         try:
-            category_info['module'].display_tools()
+            with measure(st.session_state.selected_category, kind="category"):
+                load_tool_module(category_info['module']).display_tools()
         except Exception as e:
             st.error(f"Error loading {st.session_state.selected_category}: {str(e)}")
             st.info("Please try refreshing the page or selecting a different category.")
@@ -0,0 +1,407 @@
+"""Benchmarks for the UI-free helper functions in tools/
+
+Run from the repository root:
+
+    python -m benchmarks.helpers --scales 1KB,64KB,1MB --output results.json
+    python -m benchmarks.helpers --output new.json --compare results.json
+
+Inputs are generated once per case and scale from a fixed seed and are not part of
+the timed region. Each measurement repeats the call enough times to fill
+--min-time, with garbage collection disabled, and the per-call median is the
+figure compared between revisions.
+"""
+import argparse
+import gc
+import importlib
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List, Any, Callable, Optional, Tuple
+
+SCALES = {
+    "1KB": 1024,
+    "64KB": 64 * 1024,
+    "1MB": 1024 * 1024,
+    "16MB": 16 * 1024 * 1024,
+    "100MB": 100 * 1024 * 1024,
+    "500MB": 500 * 1024 * 1024
+}
+
+DEFAULT_SCALES = ["1KB", "64KB", "1MB"]
+
+_WORDS = [
+    "performance", "toolkit", "image", "content", "analysis", "security", "network", "python",
+    "server", "request", "response", "marketing", "keyword", "design", "layout", "color",
+    "stream", "buffer", "memory", "latency", "cache", "quality", "subtitle", "video", "audio",
+    "data", "report", "value", "format", "style", "the", "and", "for", "with", "from", "into"
+]
+
+_CSS_COLORS = ["#ffffff", "#000000", "#ff0000", "#336699", "#aabbcc", "#123456", "#eeeeee"]
+_CSS_PROPERTIES = ["color", "background-color", "margin", "padding", "font-size", "border", "display"]
+
+
+def _repeat_to_size(unit: str, size: int) -> str:
+    """Repeat a generated unit until the text reaches size characters, ending on a unit boundary"""
+    if len(unit) >= size:
+        return unit
+    return unit * (size // len(unit))
+
+
+def _words(rng: random.Random, count: int) -> str:
+    return " ".join(rng.choice(_WORDS) for _ in range(count))
+
+
+def _text(size: int, rng: random.Random) -> str:
+    # Unique words keep vocabulary-sized structures growing with the input, like real text
+    unit = " ".join(f"{rng.choice(_WORDS)}{rng.randint(0, 5000)}" if rng.random() < 0.2 else rng.choice(_WORDS)
+                    for _ in range(min(size // 6 + 1, 20000))) + " "
+    return _repeat_to_size(unit, size)
+
+
+def _css(size: int, rng: random.Random) -> str:
+    rules = []
+    for i in range(min(size // 120 + 1, 2000)):
+        declarations = "\n".join(
+            f"    {rng.choice(_CSS_PROPERTIES)}: {rng.choice(_CSS_COLORS) if rng.random() < 0.5 else str(rng.randint(0, 40)) + 'px'};"
+            for _ in range(rng.randint(1, 4))
+        )
+        comment = f"/* section {i} */\n" if rng.random() < 0.2 else ""
+        rules.append(f"{comment}.selector-{i} > .child-{rng.randint(0, 99)} {{\n{declarations}\n}}\n")
+    return _repeat_to_size("\n".join(rules) + "\n", size)
+
+
+def _log(size: int, rng: random.Random) -> str:
+    templates = [
+        "{ip} - - [12/Mar/2024:10:{m:02d}:{s:02d}] \"GET /index.html HTTP/1.1\" 200 512",
+        "{ip} - - [12/Mar/2024:10:{m:02d}:{s:02d}] \"POST /login HTTP/1.1\" 401 128 failed login",
+        "{ip} - - [12/Mar/2024:10:{m:02d}:{s:02d}] \"GET /search?q=1' UNION SELECT * FROM users HTTP/1.1\" 500 64",
+        "2024-03-12 10:{m:02d}:{s:02d} ERROR Connection refused from {ip}",
+        "2024-03-12 10:{m:02d}:{s:02d} INFO Authentication failed for user admin from {ip}"
+    ]
+    lines = []
+    for _ in range(min(size // 80 + 1, 5000)):
+        ip = f"10.0.{rng.randint(0, 255)}.{rng.randint(1, 254)}"
+        lines.append(rng.choice(templates).format(ip=ip, m=rng.randint(0, 59), s=rng.randint(0, 59)))
+    return _repeat_to_size("\n".join(lines) + "\n", size)
+
+
+def _srt(size: int, rng: random.Random) -> str:
+    blocks = []
+    for i in range(1, min(size // 70 + 2, 5000)):
+        start = i * 3
+        blocks.append(f"{i}\n00:{start // 60 % 60:02d}:{start % 60:02d},000 --> "
+                      f"00:{(start + 2) // 60 % 60:02d}:{(start + 2) % 60:02d},500\n{_words(rng, 6)}\n")
+    return _repeat_to_size("\n".join(blocks) + "\n", size)
+
+
+def _json_document(size: int, rng: random.Random) -> Any:
+    # Roughly 200 bytes of serialized JSON per record
+    return {
+        "meta": {"generated": "2024-03-12", "version": 1},
+        "records": [
+            {
+                "id": i,
+                "name": _words(rng, 2),
+                "tags": [rng.choice(_WORDS) for _ in range(3)],
+                "owner": {"id": rng.randint(1, 1000), "roles": ["reader", "writer"]},
+                "score": rng.random()
+            }
+            for i in range(max(1, size // 200))
+        ]
+    }
+
+
+def _duplicate_files(size: int, rng: random.Random) -> list:
+    from utils.batch import BatchFile
+
+    file_size = max(256, min(size // 8, 4 * 1024 * 1024))
+    count = max(2, size // file_size)
+    files = []
+    for i in range(count):
+        if i % 4 == 3:
+            source = files[rng.randrange(len(files))]
+            files.append(BatchFile(f"copy_of_{source.name}", source.getvalue()))
+        else:
+            files.append(BatchFile(f"file_{i}.bin", rng.randbytes(file_size)))
+    return files
+
+
+def _jpeg_photo(size: int, rng: random.Random):
+    """A 4:3 photo-like JPEG (smooth gradients plus sensor noise) of roughly `size` bytes"""
+    import io
+    from PIL import Image, ImageChops
+    from utils.batch import BatchFile
+
+    # Content like this encodes to about 0.25 bytes per pixel at quality 90
+    height = max(16, int((size * 4 * 3 / 4) ** 0.5))
+    width = height * 4 // 3
+    tile = Image.frombytes('L', (256, 256), rng.randbytes(256 * 256)).point(lambda v: v // 16)
+    noise = Image.new('L', (width, height))
+    for top in range(0, height, 256):
+        for left in range(0, width, 256):
+            noise.paste(tile, (left, top))
+    horizontal = Image.linear_gradient('L').rotate(90).resize((width, height))
+    vertical = Image.linear_gradient('L').resize((width, height))
+    channels = [ImageChops.add(channel, noise, 1.0, -8)
+                for channel in (horizontal, vertical, ImageChops.blend(horizontal, vertical, 0.5))]
+    output = io.BytesIO()
+    Image.merge('RGB', channels).save(output, format="JPEG", quality=90)
+    return BatchFile("photo.jpg", output.getvalue(), "image/jpeg")
+
+
+def _input_size(args: tuple) -> int:
+    """Total size of the text and file arguments, used for throughput figures"""
+    total = 0
+    for value in args:
+        if isinstance(value, str):
+            total += len(value)
+        elif isinstance(value, list) and value and hasattr(value[0], 'size'):
+            total += sum(item.size for item in value)
+        elif hasattr(value, 'read') and isinstance(getattr(value, 'size', None), int):
+            total += value.size
+    return total
+
+
+class BenchmarkCase:
+    """One helper function plus a generator that builds its arguments for a target input size"""
+
+    def __init__(self, name: str, target: str, make_args: Callable[[int, random.Random], Tuple[tuple, dict]],
+                 max_scale: str = "500MB", unit: str = "bytes"):
+        self.name = name
+        self.target = target
+        self.make_args = make_args
+        self.max_bytes = SCALES[max_scale]
+        self.unit = unit
+
+    def load(self) -> Callable:
+        module_path, func_name = self.target.split(":")
+        return getattr(importlib.import_module(module_path), func_name)
+
+
+MINIFY_OPTIONS = {
+    'remove_comments': True, 'remove_whitespace': True, 'remove_empty_rules': True,
+    'merge_selectors': False, 'shorten_colors': True, 'remove_semicolons': True
+}
+
+FORMAT_OPTIONS = {
+    'indent_size': 2, 'indent_type': 'Spaces', 'brace_style': 'Same Line',
+    'sort_properties': False, 'add_missing_semicolons': True, 'normalize_quotes': False
+}
+
+CASES = [
+    BenchmarkCase("minify_css", "utils.css_processing:minify_css",
+                  lambda size, rng: ((_css(size, rng), MINIFY_OPTIONS), {})),
+    BenchmarkCase("format_css", "utils.css_processing:format_css",
+                  lambda size, rng: ((_css(size, rng), FORMAT_OPTIONS), {}), max_scale="100MB"),
+    BenchmarkCase("validate_css", "utils.css_processing:validate_css",
+                  lambda size, rng: ((_css(size, rng),), {})),
+    BenchmarkCase("detect_log_threats", "utils.log_analysis:detect_log_threats",
+                  lambda size, rng: ((_log(size, rng),), {})),
+    BenchmarkCase("calculate_keyword_density", "tools.seo_marketing_tools:calculate_keyword_density",
+                  lambda size, rng: ((_text(size, rng),), {})),
+    # The sieve allocates one list slot per candidate, so the scale is the upper bound n itself
+    BenchmarkCase("generate_primes", "tools.science_math_tools:generate_primes",
+                  lambda size, rng: ((size,), {}), max_scale="16MB", unit="n"),
+    BenchmarkCase("calculate_similarity", "tools.text_tools:calculate_similarity",
+                  lambda size, rng: ((_text(size // 2, rng), _text(size - size // 2, rng)), {})),
+    BenchmarkCase("analyze_json_structure", "tools.coding_tools:analyze_json_structure",
+                  lambda size, rng: ((_json_document(size, rng),), {}), max_scale="100MB"),
+    BenchmarkCase("parse_srt_content", "tools.audio_video_tools:parse_srt_content",
+                  lambda size, rng: ((_srt(size, rng),), {})),
+    BenchmarkCase("find_duplicates", "tools.file_tools:find_duplicates",
+                  lambda size, rng: ((_duplicate_files(size, rng), "Content + Size", False, False), {})),
+    # Downscale-heavy paths: the target size is fixed, so larger photos mostly cost decode time
+    BenchmarkCase("resize_image_file", "utils.image_processing:resize_image_file",
+                  lambda size, rng: ((_jpeg_photo(size, rng), "Fit to Width"), {'width': 800}), max_scale="16MB"),
+    BenchmarkCase("compress_image_file", "utils.image_processing:compress_image_file",
+                  lambda size, rng: ((_jpeg_photo(size, rng), "Resize + Quality"), {'scale_factor': 0.2}),
+                  max_scale="16MB"),
+    BenchmarkCase("quantize_colors", "utils.color_quantization:quantize_colors",
+                  lambda size, rng: ((_jpeg_photo(size, rng), 8), {}), max_scale="16MB"),
+    # Scale is the number of password characters produced (16-character passwords)
+    BenchmarkCase("generate_secure_passwords", "tools.security_tools:generate_secure_passwords",
+                  lambda size, rng: ((16, max(1, size // 16), True, True, True, True, False, False, True), {}),
+                  max_scale="16MB", unit="chars"),
+]
+
+
+def measure(func: Callable, args: tuple, kwargs: dict, min_time: float, repeat: int,
+            warmup: int) -> Dict[str, Any]:
+    """Time func(*args, **kwargs) and return per-call statistics in seconds"""
+    for _ in range(warmup):
+        func(*args, **kwargs)
+
+    # Calibrate loops so one round lasts about min_time / repeat, as timeit.autorange does
+    loops = 1
+    target = min_time / repeat
+    while True:
+        started = time.perf_counter()
+        for _ in range(loops):
+            func(*args, **kwargs)
+        elapsed = time.perf_counter() - started
+        if elapsed >= target or loops >= 1_000_000:
+            break
+        loops *= 10 if elapsed < target / 10 else 2
+
+    samples = []
+    gc_enabled = gc.isenabled()
+    try:
+        for _ in range(repeat):
+            gc.collect()
+            gc.disable()
+            started = time.perf_counter()
+            for _ in range(loops):
+                func(*args, **kwargs)
+            samples.append((time.perf_counter() - started) / loops)
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+    return {
+        'loops': loops,
+        'rounds': repeat,
+        'min': min(samples),
+        'median': statistics.median(samples),
+        'mean': statistics.fmean(samples),
+        'stdev': statistics.stdev(samples) if len(samples) > 1 else 0.0
+    }
+
+
+def _git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True, cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def environment_info() -> Dict[str, Any]:
+    """Describe the machine and revision so results are only compared like for like"""
+    return {
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'cpu_count': os.cpu_count(),
+        'revision': _git_revision(),
+        'timestamp': time.strftime("%Y-%m-%dT%H:%M:%S%z")
+    }
+
+
+def run_benchmarks(case_names: List[str], scale_names: List[str], min_time: float = 0.5, repeat: int = 5,
+                   warmup: int = 1, seed: int = 0, log=print) -> Dict[str, Any]:
+    """Run the selected cases at the selected scales and return a JSON-serializable report"""
+    results = []
+    for case in CASES:
+        if case.name not in case_names:
+            continue
+        func = case.load()
+        for scale_name in scale_names:
+            size = SCALES[scale_name]
+            if size > case.max_bytes:
+                log(f"{case.name:<28} {scale_name:>6}  skipped (max {case.max_bytes // 1024 ** 2}MB)")
+                continue
+
+            args, kwargs = case.make_args(size, random.Random(seed))
+            input_bytes = _input_size(args) or size
+            stats = measure(func, args, kwargs, min_time, repeat, warmup)
+            del args, kwargs
+
+            result = {
+                'case': case.name,
+                'scale': scale_name,
+                'input_size': input_bytes,
+                'unit': case.unit,
+                **stats
+            }
+            if case.unit == "bytes":
+                result['throughput_mb_s'] = input_bytes / stats['median'] / (1024 * 1024) if stats['median'] else None
+            results.append(result)
+            log(f"{case.name:<28} {scale_name:>6}  median {stats['median'] * 1000:10.3f} ms  "
+                f"min {stats['min'] * 1000:10.3f} ms  stdev {stats['stdev'] * 1000:8.3f} ms  x{stats['loops']}")
+
+    return {
+        'environment': environment_info(),
+        'settings': {'min_time': min_time, 'repeat': repeat, 'warmup': warmup, 'seed': seed},
+        'results': results
+    }
+
+
+def compare_reports(current: Dict[str, Any], baseline: Dict[str, Any],
+                    threshold: float = 0.10) -> List[Dict[str, Any]]:
+    """Pair results by case and scale; a ratio above 1 + threshold is a regression"""
+    baseline_results = {(result['case'], result['scale']): result for result in baseline.get('results', [])}
+    comparisons = []
+    for result in current['results']:
+        previous = baseline_results.get((result['case'], result['scale']))
+        if previous is None or not previous['median']:
+            continue
+        ratio = result['median'] / previous['median']
+        comparisons.append({
+            'case': result['case'],
+            'scale': result['scale'],
+            'baseline_median': previous['median'],
+            'current_median': result['median'],
+            'ratio': ratio,
+            'regression': ratio > 1 + threshold
+        })
+    return comparisons
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the toolkit's pure helper functions")
+    parser.add_argument("--cases", default=",".join(case.name for case in CASES),
+                        help="comma-separated case names (default: all)")
+    parser.add_argument("--scales", default=",".join(DEFAULT_SCALES),
+                        help=f"comma-separated input scales from {', '.join(SCALES)}")
+    parser.add_argument("--min-time", type=float, default=0.5, help="seconds to spend timing each case/scale")
+    parser.add_argument("--repeat", type=int, default=5, help="timed rounds per case/scale")
+    parser.add_argument("--warmup", type=int, default=1, help="untimed calls before measuring")
+    parser.add_argument("--seed", type=int, default=0, help="seed for the synthetic inputs")
+    parser.add_argument("--output", help="write the JSON report to this path")
+    parser.add_argument("--compare", help="baseline JSON report to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="slowdown ratio above which a comparison fails (default 0.10 = 10%%)")
+    parser.add_argument("--list", action="store_true", help="list cases and exit")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        for case in CASES:
+            print(f"{case.name:<28} {case.target}  (up to {case.max_bytes // 1024 ** 2}MB)")
+        return 0
+
+    case_names = [name.strip() for name in args.cases.split(",") if name.strip()]
+    scale_names = [name.strip() for name in args.scales.split(",") if name.strip()]
+    unknown = [name for name in case_names if name not in {case.name for case in CASES}]
+    unknown += [name for name in scale_names if name not in SCALES]
+    if unknown:
+        parser.error(f"unknown case or scale: {', '.join(unknown)}")
+
+    report = run_benchmarks(case_names, scale_names, args.min_time, args.repeat, args.warmup, args.seed)
+
+    exit_code = 0
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as baseline_file:
+            comparisons = compare_reports(report, json.load(baseline_file), args.threshold)
+        report['comparison'] = {'baseline': args.compare, 'threshold': args.threshold, 'results': comparisons}
+        print()
+        for comparison in comparisons:
+            flag = "REGRESSION" if comparison['regression'] else ""
+            print(f"{comparison['case']:<28} {comparison['scale']:>6}  {comparison['ratio']:6.2f}x  {flag}")
+        if any(comparison['regression'] for comparison in comparisons):
+            exit_code = 1
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as output_file:
+            json.dump(report, output_file, indent=2)
+
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,178 @@
+"""Load test for the HTTP API (python -m api)
+
+Start a server, then run from the repository root:
+
+    python -m api --port 8765 --queue-size 16 &
+    python -m benchmarks.load_test --endpoint minify-css --concurrency 16 --requests 2000
+    python -m benchmarks.load_test --endpoint compress-image --payload-size 1MB --duration 30
+
+Each client thread holds one keep-alive connection and sends requests back to back.
+Payloads are synthetic and seeded. The report covers throughput, latency percentiles
+of successful requests and a count per status code, so 429 backpressure shows up
+separately from failures. Use --output to save it as JSON.
+"""
+import argparse
+import http.client
+import io
+import json
+import random
+import statistics
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Dict, List, Any, Optional
+from urllib.parse import urlsplit
+
+from benchmarks.helpers import SCALES, _css, _log
+
+
+def make_payload(endpoint: str, size: int, seed: int) -> bytes:
+    """Synthetic request body of roughly `size` bytes for an endpoint"""
+    rng = random.Random(seed)
+    if endpoint in ("compress-image", "resize-image"):
+        from PIL import Image
+        # Noise compresses poorly, so the side length tracks the requested byte size
+        side = max(16, int((size / 3) ** 0.5))
+        image = Image.frombytes('RGB', (side, side), rng.randbytes(side * side * 3))
+        output = io.BytesIO()
+        image.save(output, format="PNG")
+        return output.getvalue()
+    if endpoint in ("minify-css", "format-css"):
+        return _css(size, rng).encode('utf-8')
+    if endpoint == "scan-logs":
+        return _log(size, rng).encode('utf-8')
+    if endpoint == "format-json":
+        records = [{'id': i, 'name': f"item-{i}", 'tags': ["a", "b"], 'price': rng.random()}
+                   for i in range(max(1, size // 64))]
+        return json.dumps(records).encode('utf-8')
+    return rng.randbytes(size)
+
+
+def _percentile(sorted_values: List[float], q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+
+def run_load_test(url: str, endpoint: str, query: str, payload: bytes, concurrency: int,
+                  requests: Optional[int], duration: Optional[float], timeout: float) -> Dict[str, Any]:
+    """Drive the server from `concurrency` keep-alive clients and collect per-request outcomes"""
+    parts = urlsplit(url)
+    path = f"/tools/{endpoint}" + (f"?{query}" if query else "")
+    latencies: List[float] = []
+    statuses: Counter = Counter()
+    connections_opened = [0]
+    lock = threading.Lock()
+    remaining = [requests]
+    deadline = time.perf_counter() + duration if duration else None
+
+    def take_ticket() -> bool:
+        with lock:
+            if deadline is not None and time.perf_counter() >= deadline:
+                return False
+            if remaining[0] is not None:
+                if remaining[0] <= 0:
+                    return False
+                remaining[0] -= 1
+            return True
+
+    def client():
+        connection = None
+        while take_ticket():
+            if connection is None:
+                connection = http.client.HTTPConnection(parts.hostname, parts.port or 80, timeout=timeout)
+                with lock:
+                    connections_opened[0] += 1
+            started = time.perf_counter()
+            try:
+                connection.request("POST", path, body=payload,
+                                   headers={"Content-Type": "application/octet-stream"})
+                response = connection.getresponse()
+                response.read()
+                status = str(response.status)
+                if response.will_close:
+                    connection.close()
+                    connection = None
+            except (OSError, http.client.HTTPException) as e:
+                status = type(e).__name__
+                connection.close()
+                connection = None
+            elapsed = time.perf_counter() - started
+            with lock:
+                statuses[status] += 1
+                if status == "200":
+                    latencies.append(elapsed)
+            if status == "429":
+                time.sleep(0.01)
+        if connection is not None:
+            connection.close()
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=client, daemon=True) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    wall = time.perf_counter() - started
+
+    latencies.sort()
+    total = sum(statuses.values())
+    return {
+        'endpoint': endpoint,
+        'payload_bytes': len(payload),
+        'concurrency': concurrency,
+        'wall_seconds': wall,
+        'requests': total,
+        'connections_opened': connections_opened[0],
+        'statuses': dict(statuses),
+        'throughput_rps': statuses["200"] / wall if wall > 0 else 0.0,
+        'latency_seconds': {
+            'min': latencies[0] if latencies else 0.0,
+            'p50': _percentile(latencies, 0.50),
+            'p95': _percentile(latencies, 0.95),
+            'p99': _percentile(latencies, 0.99),
+            'max': latencies[-1] if latencies else 0.0,
+            'mean': statistics.mean(latencies) if latencies else 0.0
+        }
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Load-test a running toolkit API server")
+    parser.add_argument("--url", default="http://127.0.0.1:8765", help="server base URL")
+    parser.add_argument("--endpoint", default="minify-css", help="tool endpoint, e.g. compress-image")
+    parser.add_argument("--query", default="", help="query string with tool options, e.g. quality=60")
+    parser.add_argument("--payload-size", default="64KB", help=f"body size, one of {', '.join(SCALES)}")
+    parser.add_argument("--concurrency", type=int, default=8, help="parallel keep-alive clients")
+    parser.add_argument("--requests", type=int, help="total requests to send (default: 500 unless --duration)")
+    parser.add_argument("--duration", type=float, help="seconds to keep sending instead of a request count")
+    parser.add_argument("--timeout", type=float, default=60.0, help="per-request socket timeout")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write the JSON report to this path")
+    args = parser.parse_args(argv)
+
+    if args.payload_size not in SCALES:
+        parser.error(f"unknown payload size: {args.payload_size}")
+    requests = args.requests if args.requests or args.duration else 500
+
+    payload = make_payload(args.endpoint, SCALES[args.payload_size], args.seed)
+    report = run_load_test(args.url, args.endpoint, args.query, payload, args.concurrency,
+                           requests, args.duration, args.timeout)
+
+    latency = report['latency_seconds']
+    print(f"{report['endpoint']}: {report['requests']} requests in {report['wall_seconds']:.2f}s "
+          f"over {report['connections_opened']} connection(s), {report['throughput_rps']:.1f} ok/s")
+    print(f"latency ms  p50 {latency['p50'] * 1000:.1f}  p95 {latency['p95'] * 1000:.1f}  "
+          f"p99 {latency['p99'] * 1000:.1f}  max {latency['max'] * 1000:.1f}")
+    print("statuses    " + "  ".join(f"{status}: {count}" for status, count in sorted(report['statuses'].items())))
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as output_file:
+            json.dump(report, output_file, indent=2)
+
+    return 0 if "200" in report['statuses'] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1 @@
+# CLI package initialization
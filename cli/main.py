@@ -0,0 +1,347 @@
+"""Headless command-line entry point for the toolkit's helpers
+
+Run from the repository root:
+
+    python -m cli compress-images photos/ -o out/ --quality 70 --workers 8
+    python -m cli minify-css "assets/**/*.css" -o dist/
+    python -m cli scan-logs /var/log/app/ --pattern "*.log" > findings.jsonl
+
+Inputs may be files, directories (walked recursively) or glob patterns. Files are
+processed in parallel and each output file or JSON Lines record is written as soon as
+its input finishes, so memory stays flat however many files a run covers. Streamlit
+is never imported.
+"""
+import argparse
+import fnmatch
+import glob
+import hashlib
+import json
+import os
+import sys
+from typing import Dict, List, Any, Callable, Optional, Tuple
+
+from utils.batch import run_batch, BatchFile, BATCH_MODES
+from utils.progress import ProgressTracker
+from utils.image_processing import RESAMPLING_FILTERS, resize_image_file, compress_image_file
+from utils.css_processing import minify_css, format_css, validate_css
+from utils.log_analysis import scan_log_lines, build_log_threats
+
+IMAGE_EXTENSIONS = ['jpg', 'jpeg', 'png', 'gif', 'bmp', 'tiff', 'webp']
+HASH_ALGORITHMS = ['md5', 'sha1', 'sha256', 'sha512', 'blake2b']
+
+_READ_CHUNK_SIZE = 1024 * 1024
+
+
+# Inputs and outputs
+
+def expand_inputs(inputs: List[str], extensions: Optional[List[str]] = None,
+                  pattern: Optional[str] = None) -> List[Tuple[str, str]]:
+    """Resolve files, directories and globs to (path, output-relative name) pairs
+
+    Directory and glob results keep their layout relative to the directory or the
+    glob's fixed prefix. Directory contents are filtered by `pattern` when given,
+    otherwise by `extensions`; explicitly named files are always included.
+    """
+    def wanted(name):
+        if pattern:
+            return fnmatch.fnmatch(name, pattern)
+        return not extensions or name.rsplit('.', 1)[-1].lower() in extensions
+
+    found = []
+    for spec in inputs:
+        if os.path.isdir(spec):
+            for root, dirs, names in os.walk(spec):
+                dirs.sort()
+                for name in sorted(names):
+                    if wanted(name):
+                        path = os.path.join(root, name)
+                        found.append((path, os.path.relpath(path, spec)))
+        elif glob.has_magic(spec):
+            prefix = spec
+            while glob.has_magic(prefix):
+                prefix = os.path.dirname(prefix)
+            for path in sorted(glob.glob(spec, recursive=True)):
+                if os.path.isfile(path):
+                    found.append((path, os.path.relpath(path, prefix or os.curdir)))
+        elif os.path.isfile(spec):
+            found.append((spec, os.path.basename(spec)))
+        else:
+            raise FileNotFoundError(f"No such file, directory or pattern match: {spec}")
+
+    unique = {}
+    for path, relative in found:
+        unique.setdefault(os.path.abspath(path), (path, relative))
+    return list(unique.values())
+
+
+def _read_file(path: str, relative: str) -> BatchFile:
+    with open(path, 'rb') as source:
+        return BatchFile(os.path.basename(relative), source.read())
+
+
+def _read_text(path: str) -> str:
+    with open(path, 'r', encoding='utf-8', errors='replace') as source:
+        return source.read()
+
+
+def _write_output(output_dir: str, relative: str, filename: str, data: Any) -> str:
+    """Write data next to where the input sits in the output tree and return the path"""
+    target_dir = os.path.join(output_dir, os.path.dirname(relative))
+    os.makedirs(target_dir, exist_ok=True)
+    target = os.path.join(target_dir, filename)
+    mode, encoding = ('w', 'utf-8') if isinstance(data, str) else ('wb', None)
+    with open(target, mode, encoding=encoding) as output:
+        output.write(data)
+    return target
+
+
+def _renamed(relative: str, suffix: str) -> str:
+    base_name, _, extension = os.path.basename(relative).rpartition('.')
+    return f"{base_name}{suffix}.{extension}" if base_name else f"{extension}{suffix}"
+
+
+# Work items; module-level so they can run in worker processes
+
+def compress_image_item(item: Tuple[str, str], output_dir: str, **options) -> Dict[str, Any]:
+    path, relative = item
+    filename, data = compress_image_file(_read_file(path, relative), **options)
+    target = _write_output(output_dir, relative, filename, data)
+    return {'input': path, 'output': target, 'bytes_in': os.path.getsize(path), 'bytes_out': len(data)}
+
+
+def resize_image_item(item: Tuple[str, str], output_dir: str, **options) -> Dict[str, Any]:
+    path, relative = item
+    filename, data = resize_image_file(_read_file(path, relative), **options)
+    target = _write_output(output_dir, relative, filename, data)
+    return {'input': path, 'output': target, 'bytes_in': os.path.getsize(path), 'bytes_out': len(data)}
+
+
+def minify_css_item(item: Tuple[str, str], output_dir: str, options: Dict[str, bool]) -> Dict[str, Any]:
+    path, relative = item
+    css = minify_css(_read_text(path), options)
+    target = _write_output(output_dir, relative, _renamed(relative, ".min"), css)
+    return {'input': path, 'output': target, 'bytes_in': os.path.getsize(path), 'bytes_out': len(css.encode('utf-8'))}
+
+
+def format_css_item(item: Tuple[str, str], output_dir: str, options: Dict[str, Any]) -> Dict[str, Any]:
+    path, relative = item
+    css = format_css(_read_text(path), options)
+    target = _write_output(output_dir, relative, os.path.basename(relative), css)
+    return {'input': path, 'output': target, 'bytes_in': os.path.getsize(path), 'bytes_out': len(css.encode('utf-8'))}
+
+
+def validate_css_item(item: Tuple[str, str]) -> Dict[str, Any]:
+    path, _relative = item
+    return {'input': path, **validate_css(_read_text(path))}
+
+
+def format_json_item(item: Tuple[str, str], output_dir: str, indent: int, sort_keys: bool,
+                     compact: bool, ensure_ascii: bool) -> Dict[str, Any]:
+    path, relative = item
+    with open(path, 'r', encoding='utf-8') as source:
+        parsed = json.load(source)
+    if compact:
+        text = json.dumps(parsed, ensure_ascii=ensure_ascii, sort_keys=sort_keys, separators=(',', ':'))
+    else:
+        text = json.dumps(parsed, indent=indent, ensure_ascii=ensure_ascii, sort_keys=sort_keys)
+    target = _write_output(output_dir, relative, os.path.basename(relative), text)
+    return {'input': path, 'output': target, 'bytes_in': os.path.getsize(path), 'bytes_out': len(text.encode('utf-8'))}
+
+
+def scan_log_item(item: Tuple[str, str]) -> Dict[str, Any]:
+    path, _relative = item
+    with open(path, 'r', encoding='utf-8', errors='replace') as source:
+        stats = scan_log_lines(line.rstrip('\r\n') for line in source)
+    return {
+        'input': path,
+        'total_lines': stats['total_lines'],
+        'unique_ips': len(stats['ips']),
+        'error_events': stats['error_events'],
+        'threats': build_log_threats(stats)
+    }
+
+
+def hash_item(item: Tuple[str, str], algorithm: str) -> Dict[str, Any]:
+    path, _relative = item
+    hasher = hashlib.new(algorithm)
+    with open(path, 'rb') as source:
+        for chunk in iter(lambda: source.read(_READ_CHUNK_SIZE), b''):
+            hasher.update(chunk)
+    return {'input': path, 'algorithm': algorithm, 'digest': hasher.hexdigest()}
+
+
+# Subcommand option parsing
+
+def _compress_images_options(args) -> Dict[str, Any]:
+    return {'output_dir': args.output, 'compression_method': args.method, 'quality': args.quality,
+            'scale_factor': args.scale_factor, 'target_format': args.format, 'target_size_kb': args.target_kb}
+
+
+def _resize_images_options(args) -> Dict[str, Any]:
+    if args.method in ("Exact Dimensions", "Fit to Width") and not args.width:
+        raise ValueError(f"--width is required for {args.method}")
+    if args.method in ("Exact Dimensions", "Fit to Height") and not args.height:
+        raise ValueError(f"--height is required for {args.method}")
+    return {'output_dir': args.output, 'resize_method': args.method, 'width': args.width, 'height': args.height,
+            'scale': args.scale, 'maintain_aspect': not args.no_keep_aspect, 'resampling': args.resampling}
+
+
+def _minify_css_options(args) -> Dict[str, Any]:
+    return {'output_dir': args.output, 'options': {
+        'remove_comments': not args.keep_comments,
+        'remove_whitespace': not args.keep_whitespace,
+        'remove_empty_rules': True,
+        'merge_selectors': False,
+        'shorten_colors': not args.keep_colors,
+        'remove_semicolons': not args.keep_semicolons
+    }}
+
+
+def _format_css_options(args) -> Dict[str, Any]:
+    return {'output_dir': args.output, 'options': {
+        'indent_type': args.indent_type, 'indent_size': args.indent_size, 'brace_style': args.brace_style
+    }}
+
+
+def _format_json_options(args) -> Dict[str, Any]:
+    return {'output_dir': args.output, 'indent': args.indent, 'sort_keys': args.sort_keys,
+            'compact': args.compact, 'ensure_ascii': args.ensure_ascii}
+
+
+# name: (work item, option builder, default extensions, default mode, needs --output, help)
+COMMANDS: Dict[str, Tuple[Callable, Optional[Callable], Optional[List[str]], str, bool, str]] = {
+    'compress-images': (compress_image_item, _compress_images_options, IMAGE_EXTENSIONS, "process", True,
+                        "compress images with quality or resize-plus-quality reduction"),
+    'resize-images': (resize_image_item, _resize_images_options, IMAGE_EXTENSIONS, "process", True,
+                      "resize images to exact dimensions, a percentage or a fixed width/height"),
+    'minify-css': (minify_css_item, _minify_css_options, ['css'], "process", True, "minify stylesheets"),
+    'format-css': (format_css_item, _format_css_options, ['css'], "process", True, "pretty-print stylesheets"),
+    'validate-css': (validate_css_item, None, ['css'], "process", False,
+                     "report CSS syntax errors and warnings as JSON Lines"),
+    'format-json': (format_json_item, _format_json_options, ['json'], "process", True,
+                    "pretty-print or compact JSON documents"),
+    'scan-logs': (scan_log_item, None, ['log', 'txt'], "process", False,
+                  "scan logs for brute force, SQL injection and error spikes, as JSON Lines"),
+    'hash': (hash_item, lambda args: {'algorithm': args.algorithm}, None, "thread", False,
+             "print file digests, sha256sum-style"),
+}
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m cli", description="Run toolkit helpers over files in bulk")
+    subparsers = parser.add_subparsers(dest="command", required=True, metavar="command")
+
+    for name, (_func, _options, extensions, mode, needs_output, help_text) in COMMANDS.items():
+        sub = subparsers.add_parser(name, help=help_text, description=help_text)
+        sub.add_argument("inputs", nargs="+", help="files, directories or glob patterns (quote globs)")
+        if needs_output:
+            sub.add_argument("-o", "--output", required=True, help="directory to write results to")
+        default_filter = f"*.{{{','.join(extensions)}}}" if extensions else "all files"
+        sub.add_argument("--pattern", help=f"filename glob for directory inputs (default: {default_filter})")
+        sub.add_argument("--workers", type=int, help="parallel workers (default: one per CPU core)")
+        sub.add_argument("--mode", choices=BATCH_MODES, default=mode, help=f"worker type (default: {mode})")
+        sub.add_argument("-q", "--quiet", action="store_true", help="don't draw the progress line")
+
+        if name == 'compress-images':
+            sub.add_argument("--method", default="Quality Reduction",
+                             choices=["Quality Reduction", "Resize + Quality", "Format Optimization",
+                                      "Target File Size"])
+            sub.add_argument("--quality", type=int, default=75, help="JPEG/WEBP quality 1-100 (default: 75)")
+            sub.add_argument("--scale-factor", type=float, default=0.8, help="scale for Resize + Quality")
+            sub.add_argument("--target-kb", type=int, default=150,
+                             help="per-image size budget for Target File Size, JPEG/WEBP output (default: 150)")
+            sub.add_argument("--format", default="Keep Original", choices=["Keep Original", "JPEG", "PNG", "WEBP"])
+        elif name == 'resize-images':
+            sub.add_argument("--method", default="Scale by Percentage",
+                             choices=["Exact Dimensions", "Scale by Percentage", "Fit to Width", "Fit to Height"])
+            sub.add_argument("--width", type=int)
+            sub.add_argument("--height", type=int)
+            sub.add_argument("--scale", type=int, default=100, help="percentage for Scale by Percentage")
+            sub.add_argument("--no-keep-aspect", action="store_true", help="stretch to exact dimensions")
+            sub.add_argument("--resampling", default="LANCZOS", choices=list(RESAMPLING_FILTERS))
+        elif name == 'minify-css':
+            sub.add_argument("--keep-comments", action="store_true")
+            sub.add_argument("--keep-whitespace", action="store_true")
+            sub.add_argument("--keep-colors", action="store_true", help="don't shorten #aabbcc to #abc")
+            sub.add_argument("--keep-semicolons", action="store_true")
+        elif name == 'format-css':
+            sub.add_argument("--indent-type", default="Spaces", choices=["Spaces", "Tabs"])
+            sub.add_argument("--indent-size", type=int, default=2)
+            sub.add_argument("--brace-style", default="Same Line", choices=["Same Line", "New Line"])
+        elif name == 'format-json':
+            sub.add_argument("--indent", type=int, default=4)
+            sub.add_argument("--sort-keys", action="store_true")
+            sub.add_argument("--compact", action="store_true", help="no whitespace at all")
+            sub.add_argument("--ensure-ascii", action="store_true", help="escape non-ASCII characters")
+        elif name == 'hash':
+            sub.add_argument("--algorithm", default="sha256", choices=HASH_ALGORITHMS)
+
+    return parser
+
+
+def _stderr_renderer(stream=sys.stderr) -> Callable[[ProgressTracker], None]:
+    """Redraw a single progress line in place on a terminal"""
+    def render(tracker: ProgressTracker):
+        fraction = tracker.fraction or 0.0
+        line = f"[{'#' * int(fraction * 20):<20}] {fraction:4.0%} {tracker.describe()}"
+        stream.write(f"\r{line[:160]:<160}")
+        stream.flush()
+    return render
+
+
+def _emit(result: Dict[str, Any], command: str, stream=sys.stdout):
+    """Write one finished item to stdout as soon as it completes"""
+    if command == 'hash':
+        if result['success']:
+            stream.write(f"{result['result']['digest']}  {result['result']['input']}\n")
+    elif command in ('validate-css', 'scan-logs'):
+        if result['success']:
+            stream.write(json.dumps(result['result']) + "\n")
+    stream.flush()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    func, build_options, extensions, _mode, _needs_output, _help = COMMANDS[args.command]
+
+    try:
+        options = build_options(args) if build_options else {}
+        items = expand_inputs(args.inputs, extensions, args.pattern)
+    except (ValueError, FileNotFoundError) as e:
+        parser.error(str(e))
+    if not items:
+        print("No matching input files.", file=sys.stderr)
+        return 1
+
+    show_progress = not args.quiet and sys.stderr.isatty()
+    progress = ProgressTracker(len(items), args.command, "files", render=_stderr_renderer() if show_progress else None)
+    failures = 0
+
+    def on_progress(completed, total, result):
+        nonlocal failures
+        if not result['success']:
+            failures += 1
+            if show_progress:
+                sys.stderr.write("\n")
+            print(f"error: {result['item'][0]}: {result['error']}", file=sys.stderr)
+        _emit(result, args.command)
+        progress.update(completed, os.path.basename(result['item'][0]))
+
+    try:
+        results = run_batch(items, func, mode=args.mode, max_workers=args.workers, on_progress=on_progress, **options)
+    except KeyboardInterrupt:
+        print("\nInterrupted.", file=sys.stderr)
+        return 130
+    progress.finish()
+    if show_progress:
+        sys.stderr.write("\n")
+
+    bytes_in = sum(result['result'].get('bytes_in', 0) for result in results if result['success'])
+    bytes_out = sum(result['result'].get('bytes_out', 0) for result in results if result['success'])
+    summary = f"{len(items) - failures}/{len(items)} files in {progress.elapsed:.2f}s"
+    if bytes_in:
+        summary += f", {bytes_in:,} -> {bytes_out:,} bytes"
+    if not args.quiet:
+        print(summary, file=sys.stderr)
+    return 1 if failures else 0
@@ -3,9 +3,11 @@ import json
 import base64
 import io
 from datetime import datetime
-from utils.common import create_tool_header, show_progress_bar, add_to_recent
+from utils.common import create_tool_header, show_progress_bar, add_to_recent, watch_job
+from utils.metrics import label_invocation
 from utils.file_handler import FileHandler
 from utils.ai_client import ai_client
+from utils.jobs import job_manager, job_key, DONE
 
 
 def display_tools():
@@ -50,6 +52,7 @@ def display_tools():
     st.markdown("---")
 
     add_to_recent(f"AI Tools - {selected_tool}")
+    label_invocation(f"AI Tools - {selected_tool}")
 
     # Display selected tool
     if selected_tool == "Multi-Model Chat":
@@ -190,53 +193,80 @@ def content_creator():
                                            placeholder="Any specific requirements or guidelines...")
 
     if st.button("Generate Content") and topic:
-        with st.spinner("Generating content with AI..."):
-            # Build kwargs dict with only the extra parameters we need
-            extra_kwargs = {}
-            if content_type in ["Blog Post", "Technical Documentation"]:
-                extra_kwargs['include_outline'] = locals().get('include_outline', False)
-                extra_kwargs['include_seo'] = locals().get('include_seo', False)
-            if content_type == "Social Media Post":
-                extra_kwargs['platform'] = locals().get('platform', 'general')
-                extra_kwargs['include_hashtags'] = locals().get('include_hashtags', False)
-
-            content = generate_content(
-                content_type, topic, target_audience, tone, length,
-                language, creativity, additional_instructions,
-                **extra_kwargs
+        # Build kwargs dict with only the extra parameters we need
+        extra_kwargs = {}
+        if content_type in ["Blog Post", "Technical Documentation"]:
+            extra_kwargs['include_outline'] = locals().get('include_outline', False)
+            extra_kwargs['include_seo'] = locals().get('include_seo', False)
+        if content_type == "Social Media Post":
+            extra_kwargs['platform'] = locals().get('platform', 'general')
+            extra_kwargs['include_hashtags'] = locals().get('include_hashtags', False)
+
+        prompt = build_content_prompt(
+            content_type, topic, target_audience, tone, length,
+            language, creativity, additional_instructions,
+            **extra_kwargs
+        )
+
+        st.session_state.content_creator_prompt = prompt
+        start_content_job(prompt, 0)
+
+    # Generation runs in the background, so the draft keeps streaming while widgets are used
+    job_id = st.session_state.get('content_creator_job')
+    if job_id:
+        st.subheader("Generated Content")
+    job = watch_job(job_id, render_partial=st.markdown)
+    if job and job.status == DONE:
+        content = job.result
+        st.markdown(content)
+
+        if content:
+            # Content analysis
+            st.subheader("Content Analysis")
+            analysis = analyze_content(content)
+
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                st.metric("Word Count", analysis['word_count'])
+            with col2:
+                st.metric("Reading Time", f"{analysis['reading_time']} min")
+            with col3:
+                st.metric("Readability", analysis['readability_level'])
+
+            # Download options
+            FileHandler.create_download_link(
+                content.encode(),
+                f"{content_type.lower().replace(' ', '_')}.txt",
+                "text/plain"
             )
 
-            if content:
-                st.subheader("Generated Content")
-                st.markdown(content)
+            # Regenerate options
+            col1, col2 = st.columns(2)
+            with col1:
+                if st.button("Regenerate"):
+                    st.session_state.content_creator_run = st.session_state.get('content_creator_run', 0) + 1
+                    start_content_job(st.session_state.content_creator_prompt, st.session_state.content_creator_run)
+                    st.rerun()
+            with col2:
+                if st.button("Refine Content"):
+                    refine_content(content)
 
-                # Content analysis
-                st.subheader("Content Analysis")
-                analysis = analyze_content(content)
 
-                col1, col2, col3 = st.columns(3)
-                with col1:
-                    st.metric("Word Count", analysis['word_count'])
-                with col2:
-                    st.metric("Reading Time", f"{analysis['reading_time']} min")
-                with col3:
-                    st.metric("Readability", analysis['readability_level'])
+def start_content_job(prompt, run):
+    """Start (or rejoin) the content job for a prompt; each regeneration run is a new job that skips the cache"""
+    job = job_manager.submit(stream_generated_content, prompt, 2000, refresh=run > 0, name="Content generation",
+                             key=job_key("content_creator", prompt, run))
+    st.session_state.content_creator_job = job.id
 
-                # Download options
-                FileHandler.create_download_link(
-                    content.encode(),
-                    f"{content_type.lower().replace(' ', '_')}.txt",
-                    "text/plain"
-                )
 
-                # Regenerate options
-                col1, col2 = st.columns(2)
-                with col1:
-                    if st.button("Regenerate"):
-                        st.rerun()
-                with col2:
-                    if st.button("Refine Content"):
-                        refine_content(content)
+def stream_generated_content(job, prompt, max_tokens, refresh=False):
+    """Background job: stream generated text, publishing the draft so far as it arrives"""
+    text = ""
+    for chunk in ai_client.generate_text_stream(prompt, max_tokens=max_tokens, refresh=refresh):
+        job.check_cancelled()
+        text += chunk
+        job.update(message=f"{len(text.split())} words so far", partial=text)
+    return text
 
 
 def ai_art_creator():
@@ -556,69 +586,81 @@ def text_translator():
         cultural_adaptation = st.checkbox("Cultural Adaptation", False)
 
     if st.button("Translate Text") and source_text and target_language:
-        with st.spinner(f"Translating to {target_language}..."):
-            # Enhanced translation prompt
-            translation_prompt = create_translation_prompt(
-                source_text, target_language, translation_style,
-                preserve_formatting, cultural_adaptation
-            )
-
-            translated_text = ai_client.generate_text(translation_prompt)
-
-            if translated_text:
-                st.subheader("Translation Results")
-
-                # Display original and translated text side by side
-                col1, col2 = st.columns(2)
-
-                with col1:
-                    st.markdown("**Original Text:**")
-                    st.text_area("", source_text, height=200, disabled=True, key="original")
-
-                with col2:
-                    st.markdown(f"**Translated Text ({target_language}):**")
-                    st.text_area("", translated_text, height=200, disabled=True, key="translated")
+        # Enhanced translation prompt
+        translation_prompt = create_translation_prompt(
+            source_text, target_language, translation_style,
+            preserve_formatting, cultural_adaptation
+        )
 
-                # Translation quality metrics
-                st.subheader("Translation Quality")
-                quality_metrics = assess_translation_quality(source_text, translated_text)
+        st.subheader("Translation Results")
 
-                col1, col2, col3 = st.columns(3)
-                with col1:
-                    st.metric("Estimated Quality", quality_metrics['quality_score'])
-                with col2:
-                    st.metric("Fluency", quality_metrics['fluency'])
-                with col3:
-                    st.metric("Completeness", quality_metrics['completeness'])
-
-                # Alternative translations
-                if include_alternatives:
-                    st.subheader("Alternative Translations")
-                    alternatives = generate_translation_alternatives(source_text, target_language)
+        # Display original and translated text side by side
+        col1, col2 = st.columns(2)
 
-                    for i, alt in enumerate(alternatives, 1):
-                        st.write(f"**Alternative {i}:** {alt}")
+        with col1:
+            st.markdown("**Original Text:**")
+            st.text_area("", source_text, height=200, disabled=True, key="original")
 
-                # Export translation
-                FileHandler.create_download_link(
-                    translated_text.encode(),
-                    f"translation_{target_language.lower()}.txt",
-                    "text/plain"
-                )
+        with col2:
+            st.markdown(f"**Translated Text ({target_language}):**")
+            # Stream into a placeholder, then swap in the copyable text area once complete
+            translation_placeholder = st.empty()
+            with translation_placeholder.container():
+                translated_text = st.write_stream(ai_client.generate_text_stream(translation_prompt))
+            translation_placeholder.text_area("", translated_text, height=200, disabled=True,
+                                              key="translated")
+
+        if translated_text:
+            # Translation quality metrics
+            st.subheader("Translation Quality")
+            quality_metrics = assess_translation_quality(source_text, translated_text)
+
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                st.metric("Estimated Quality", quality_metrics['quality_score'])
+            with col2:
+                st.metric("Fluency", quality_metrics['fluency'])
+            with col3:
+                st.metric("Completeness", quality_metrics['completeness'])
+
+            # Alternative translations
+            if include_alternatives:
+                st.subheader("Alternative Translations")
+                alternatives = generate_translation_alternatives(source_text, target_language)
+
+                for i, alt in enumerate(alternatives, 1):
+                    st.write(f"**Alternative {i}:** {alt}")
+
+            # Export translation
+            FileHandler.create_download_link(
+                translated_text.encode(),
+                f"translation_{target_language.lower()}.txt",
+                "text/plain"
+            )
 
 
 # Helper Functions
 
-def send_to_all_models(message, models):
+def send_to_all_models(message, models, timeout=60):
     """Send message to all selected models"""
-    responses = {}
+    responses = {model: "" for model in models}
 
+    # All models stream at once; each gets its own live placeholder
+    placeholders = {}
     for model in models:
-        try:
-            response = ai_client.generate_text(message, model=model)
-            responses[model] = response
-        except Exception as e:
-            responses[model] = f"Error: {str(e)}"
+        st.markdown(f"**🤖 {model.title()}**")
+        placeholders[model] = st.empty()
+
+    for event in ai_client.stream_text_all(message, models, timeout=timeout):
+        model = event['model']
+        if event['type'] == 'chunk':
+            responses[model] += event['text']
+            placeholders[model].markdown(responses[model] + "▌")
+        elif event['type'] == 'done':
+            placeholders[model].markdown(responses[model])
+        else:
+            responses[model] = f"Error: {event['text']}"
+            placeholders[model].warning(responses[model])
 
     # Add to chat history
     st.session_state.chat_history.append({
@@ -646,8 +688,9 @@ def export_chat_history():
         )
 
 
-def generate_content(content_type, topic, audience, tone, length, language, creativity, instructions, **kwargs):
-    """Generate content using AI"""
+def build_content_prompt(content_type, topic, audience, tone, length, language, creativity, instructions,
+                         **kwargs):
+    """Build the content generation prompt"""
     prompt = f"""
     Create a {content_type.lower()} about "{topic}" with the following specifications:
 
@@ -675,7 +718,7 @@ def generate_content(content_type, topic, audience, tone, length, language, crea
         if kwargs.get('include_hashtags'):
             prompt += "\nInclude relevant hashtags."
 
-    return ai_client.generate_text(prompt, max_tokens=2000)
+    return prompt
 
 
 def analyze_content(content):
@@ -832,7 +875,48 @@ def text_summarizer():
 
 def model_comparison():
     """AI model comparison tool"""
-    st.info("Model Comparison - Coming soon!")
+    create_tool_header("Model Comparison", "Compare responses from multiple AI models side by side", "⚖️")
+
+    available_models = ai_client.get_available_models()
+    if not available_models:
+        st.warning("No AI models available. Please check your API keys.")
+        return
+
+    selected_models = st.multiselect("Models to Compare", available_models, default=available_models)
+    prompt = st.text_area("Prompt", height=150, placeholder="Enter a prompt to send to every selected model...")
+    timeout = st.slider("Timeout per Model (seconds)", 5, 120, 60)
+
+    if st.button("Compare Models") and prompt and selected_models:
+        with st.spinner(f"Querying {len(selected_models)} models..."):
+            results = ai_client.generate_text_all(prompt, selected_models, timeout=timeout)
+
+        cols = st.columns(len(results))
+        for col, (model, outcome) in zip(cols, results.items()):
+            with col:
+                st.subheader(f"🤖 {model.title()}")
+                st.metric("Latency", f"{outcome['elapsed']:.2f}s")
+                if outcome['status'] == 'ok':
+                    st.metric("Words", len(outcome['result'].split()))
+                    st.markdown(outcome['result'])
+                elif outcome['status'] == 'timeout':
+                    st.warning(outcome['error'])
+                else:
+                    st.error(outcome['error'])
+
+        comparison_data = {
+            'prompt': prompt,
+            'results': {model: {'status': outcome['status'],
+                                'response': outcome['result'],
+                                'error': outcome.get('error'),
+                                'latency_seconds': round(outcome['elapsed'], 3)}
+                        for model, outcome in results.items()},
+            'compared_at': datetime.now().isoformat()
+        }
+        FileHandler.create_download_link(
+            json.dumps(comparison_data, indent=2).encode(),
+            "model_comparison.json",
+            "application/json"
+        )
 
 
 def prompt_optimizer():
@@ -4,6 +4,7 @@ import json
 import base64
 from datetime import datetime, timedelta
 from utils.common import create_tool_header, show_progress_bar, add_to_recent
+from utils.metrics import label_invocation
 from utils.file_handler import FileHandler
 from utils.ai_client import ai_client
 
@@ -51,6 +52,7 @@ def display_tools():
     st.markdown("---")
 
     add_to_recent(f"Audio/Video Tools - {selected_tool}")
+    label_invocation(f"Audio/Video Tools - {selected_tool}")
 
     # Display selected tool
     if selected_tool == "Format Converter":
@@ -121,12 +123,9 @@ def format_converter():
         if st.button("Convert Media"):
             with st.spinner("Converting media files..."):
                 converted_files = {}
-                progress_bar = st.progress(0)
-
-                for i, uploaded_file in enumerate(uploaded_files):
-                    # Simulate conversion process
-                    show_progress_bar(f"Converting {uploaded_file.name}", 3)
+                progress = show_progress_bar("Converting", total=len(uploaded_files), unit="files")
 
+                for uploaded_file in uploaded_files:
                     # In a real implementation, you would use libraries like FFmpeg
                     # Here we simulate the conversion
                     base_name = uploaded_file.name.rsplit('.', 1)[0]
@@ -142,7 +141,9 @@ def format_converter():
                     }
 
                     converted_files[new_filename] = json.dumps(conversion_info, indent=2).encode()
-                    progress_bar.progress((i + 1) / len(uploaded_files))
+                    progress.advance(message=uploaded_file.name)
+
+                progress.finish()
 
                 if converted_files:
                     st.success(f"Converted {len(converted_files)} file(s) to {target_format}")
@@ -267,8 +268,6 @@ def audio_video_trimmer():
 
             if st.button("Trim Media"):
                 with st.spinner("Trimming media..."):
-                    show_progress_bar("Processing trim operation", 4)
-
                     # Simulate trimming process
                     trim_info = {
                         "original_file": file.name,
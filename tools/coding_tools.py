@@ -11,6 +11,7 @@ import base64
 import urllib.parse
 from datetime import datetime
 from utils.common import create_tool_header, show_progress_bar, add_to_recent
+from utils.metrics import label_invocation
 from utils.file_handler import FileHandler
 from utils.ai_client import ai_client
 
@@ -57,6 +58,7 @@ def display_tools():
     st.markdown("---")
 
     add_to_recent(f"Coding Tools - {selected_tool}")
+    label_invocation(f"Coding Tools - {selected_tool}")
 
     # Display selected tool
     if selected_tool == "Python Formatter":
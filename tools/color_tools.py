@@ -5,7 +5,10 @@ from PIL import Image, ImageDraw
 import matplotlib.pyplot as plt
 import numpy as np
 from utils.common import create_tool_header, show_progress_bar, add_to_recent
+from utils.metrics import instrument, label_invocation
 from utils.file_handler import FileHandler
+from utils.result_cache import cached_result
+from utils.color_quantization import QUANTIZATION_METHODS, quantize_colors
 
 
 def display_tools():
@@ -38,6 +41,7 @@ def display_tools():
     st.markdown("---")
 
     add_to_recent(f"Color Tools - {selected_tool}")
+    label_invocation(f"Color Tools - {selected_tool}")
 
     # Display selected tool
     if selected_tool == "RGB to HEX":
@@ -215,39 +219,34 @@ def dominant_color_extractor():
     uploaded_file = FileHandler.upload_files(['jpg', 'jpeg', 'png'], accept_multiple=False)
 
     if uploaded_file:
-        image = FileHandler.process_image_file(uploaded_file[0])
-        if image:
-            st.image(image, caption="Uploaded Image", use_column_width=True)
+        preview = FileHandler.process_image_preview(uploaded_file[0])
+        if preview:
+            st.image(preview.data, caption="Uploaded Image", use_column_width=True)
 
             num_colors = st.slider("Number of colors to extract:", 2, 10, 5)
+            method = QUANTIZATION_METHODS[st.selectbox("Method:", list(QUANTIZATION_METHODS))]
 
             if st.button("Extract Colors"):
-                colors = extract_dominant_colors(image, num_colors)
+                colors = extract_dominant_colors(uploaded_file[0], num_colors, method)
+
+                if not colors:
+                    st.warning("The image has no opaque pixels to extract colors from.")
+                    return
 
                 st.markdown("### Dominant Colors:")
                 cols = st.columns(len(colors))
                 for i, color in enumerate(colors):
-                    hex_color = f"#{color[0]:02x}{color[1]:02x}{color[2]:02x}"
                     with cols[i]:
-                        st.color_picker(f"Color {i + 1}", hex_color, disabled=True)
-                        st.code(hex_color)
-
-
-def extract_dominant_colors(image, num_colors):
-    """Extract dominant colors using k-means clustering"""
-    from sklearn.cluster import KMeans
-
-    # Convert image to numpy array
-    img_array = np.array(image)
-    img_data = img_array.reshape((-1, 3))
+                        st.color_picker(f"Color {i + 1}", color['hex'], disabled=True)
+                        st.code(color['hex'])
+                        st.caption(f"{color['proportion']:.1%} of pixels")
 
-    # Apply k-means clustering
-    kmeans = KMeans(n_clusters=num_colors, random_state=42)
-    kmeans.fit(img_data)
 
-    # Get the colors
-    colors = kmeans.cluster_centers_.astype(int)
-    return colors
+@instrument()
+@cached_result()
+def extract_dominant_colors(image, num_colors, method="kmeans"):
+    """Extract dominant colors (with their share of pixels) from an image or uploaded file"""
+    return quantize_colors(image, num_colors, method)
 
 
 def random_color_generator():
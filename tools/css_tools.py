@@ -1,9 +1,10 @@
 import streamlit as st
-import re
 import json
 import colorsys
 from utils.common import create_tool_header, show_progress_bar, add_to_recent
+from utils.metrics import label_invocation
 from utils.file_handler import FileHandler
+from utils.css_processing import minify_css, format_css, validate_css
 
 
 def display_tools():
@@ -48,6 +49,7 @@ def display_tools():
     st.markdown("---")
 
     add_to_recent(f"CSS Tools - {selected_tool}")
+    label_invocation(f"CSS Tools - {selected_tool}")
 
     # Display selected tool
     if selected_tool == "Gradient Generator":
@@ -742,78 +744,6 @@ def keyframe_generator():
 
 
 # Helper functions
-def minify_css(css_content, options):
-    """Minify CSS content based on options"""
-    result = css_content
-
-    if options['remove_comments']:
-        # Remove CSS comments
-        result = re.sub(r'/\*.*?\*/', '', result, flags=re.DOTALL)
-
-    if options['remove_whitespace']:
-        # Remove unnecessary whitespace
-        result = re.sub(r'\s+', ' ', result)
-        result = re.sub(r';\s*}', '}', result)
-        result = re.sub(r'{\s*', '{', result)
-        result = re.sub(r'}\s*', '}', result)
-        result = re.sub(r':\s*', ':', result)
-        result = re.sub(r';\s*', ';', result)
-        result = result.strip()
-
-    if options['shorten_colors']:
-        # Shorten hex colors
-        result = re.sub(r'#([0-9a-fA-F])\1([0-9a-fA-F])\2([0-9a-fA-F])\3', r'#\1\2\3', result)
-
-    if options['remove_semicolons']:
-        # Remove last semicolon before closing brace
-        result = re.sub(r';(\s*})', r'\1', result)
-
-    return result
-
-
-def format_css(css_content, options):
-    """Format CSS content based on options"""
-    indent_char = '\t' if options['indent_type'] == 'Tabs' else ' ' * options['indent_size']
-
-    # Basic formatting
-    result = css_content
-
-    # Remove existing formatting
-    result = re.sub(r'\s+', ' ', result)
-    result = result.strip()
-
-    # Add proper spacing and indentation
-    formatted_lines = []
-    indent_level = 0
-
-    i = 0
-    while i < len(result):
-        char = result[i]
-
-        if char == '{':
-            formatted_lines.append(char)
-            if options['brace_style'] == 'New Line':
-                formatted_lines.append('\n')
-            formatted_lines.append('\n')
-            indent_level += 1
-        elif char == '}':
-            if formatted_lines and formatted_lines[-1] != '\n':
-                formatted_lines.append('\n')
-            indent_level -= 1
-            formatted_lines.append(indent_char * indent_level + char + '\n')
-        elif char == ';':
-            formatted_lines.append(char + '\n')
-        else:
-            # Add indentation at start of line
-            if formatted_lines and formatted_lines[-1] == '\n':
-                formatted_lines.append(indent_char * indent_level)
-            formatted_lines.append(char)
-
-        i += 1
-
-    return ''.join(formatted_lines)
-
-
 def hex_to_rgb(hex_color):
     """Convert hex color to RGB tuple"""
     hex_color = hex_color.lstrip('#')
@@ -902,68 +832,6 @@ def generate_color_palette(base_color, palette_type):
     return list(set(palette))[:6]  # Return unique colors, max 6
 
 
-def validate_css(css_content):
-    """Basic CSS validation"""
-    errors = []
-    warnings = []
-    stats = {'rules': 0, 'properties': 0, 'selectors': 0}
-
-    lines = css_content.split('\n')
-
-    # Basic syntax checking
-    brace_count = 0
-    in_rule = False
-
-    for line_num, line in enumerate(lines, 1):
-        line = line.strip()
-
-        if not line or line.startswith('/*'):
-            continue
-
-        # Count braces
-        open_braces = line.count('{')
-        close_braces = line.count('}')
-        brace_count += open_braces - close_braces
-
-        if open_braces > 0:
-            stats['rules'] += open_braces
-            in_rule = True
-
-        if close_braces > 0:
-            in_rule = False
-
-        # Check for properties
-        if in_rule and ':' in line and not line.endswith('{'):
-            stats['properties'] += 1
-
-            # Check for missing semicolon
-            if not line.rstrip().endswith(';') and not line.rstrip().endswith('{') and not line.rstrip().endswith('}'):
-                warnings.append({
-                    'line': line_num,
-                    'message': 'Missing semicolon'
-                })
-
-        # Check for invalid characters
-        if re.search(r'[^\w\s\-_.:;{}()#,>+~\[\]="\'@%/\*]', line):
-            errors.append({
-                'line': line_num,
-                'message': 'Invalid characters detected'
-            })
-
-    # Check for unmatched braces
-    if brace_count != 0:
-        errors.append({
-            'line': len(lines),
-            'message': f'Unmatched braces (difference: {brace_count})'
-        })
-
-    return {
-        'errors': errors,
-        'warnings': warnings,
-        'stats': stats
-    }
-
-
 # Additional placeholder functions for remaining tools
 def grid_generator():
     """CSS Grid generator"""
@@ -7,6 +7,7 @@ from io import StringIO, BytesIO
 import matplotlib.pyplot as plt
 import seaborn as sns
 from utils.common import create_tool_header, show_progress_bar, add_to_recent
+from utils.metrics import label_invocation
 from utils.file_handler import FileHandler
 
 
@@ -52,6 +53,7 @@ def display_tools():
     st.markdown("---")
 
     add_to_recent(f"Data Tools - {selected_tool}")
+    label_invocation(f"Data Tools - {selected_tool}")
 
     # Display selected tool
     if selected_tool == "CSV Converter":
@@ -6,7 +6,6 @@ import csv
 import xml.etree.ElementTree as ET
 import io
 import os
-import hashlib
 import shutil
 from datetime import datetime
 import mimetypes
@@ -14,7 +13,10 @@ import base64
 from pathlib import Path
 import pandas as pd
 from utils.common import create_tool_header, show_progress_bar, add_to_recent
+from utils.metrics import instrument, label_invocation
 from utils.file_handler import FileHandler
+from utils.result_view import show_result_view
+from utils.session_memory import store_artifact, get_artifact, artifact_version
 
 
 def display_tools():
@@ -59,6 +61,7 @@ def display_tools():
     st.markdown("---")
 
     add_to_recent(f"File Tools - {selected_tool}")
+    label_invocation(f"File Tools - {selected_tool}")
 
     # Display selected tool
     if selected_tool == "Document Converter":
@@ -370,41 +373,43 @@ def duplicate_finder():
         if st.button("Find Duplicates"):
             with st.spinner("Analyzing files for duplicates..."):
                 duplicates = find_duplicates(uploaded_files, comparison_method, ignore_extensions, case_sensitive)
+                # Keep only names and sizes; the uploads themselves stay with the uploader widget
+                store_artifact("duplicate_finder_result", {
+                    'method': comparison_method,
+                    'groups': {key: [{'name': f['name'], 'size': f['size']} for f in files]
+                               for key, files in duplicates.items()}
+                })
 
-                if duplicates:
-                    st.subheader("Duplicate Files Found")
-
-                    total_duplicates = sum(len(group) - 1 for group in duplicates.values())
-                    st.warning(f"Found {total_duplicates} duplicate files in {len(duplicates)} groups")
-
-                    for i, (key, files) in enumerate(duplicates.items(), 1):
-                        with st.expander(f"Duplicate Group {i} ({len(files)} files)"):
-                            for j, file_info in enumerate(files):
-                                col1, col2, col3 = st.columns([3, 1, 1])
-                                with col1:
-                                    st.write(f"📄 {file_info['name']}")
-                                with col2:
-                                    st.write(f"{file_info['size']:,} bytes")
-                                with col3:
-                                    if j > 0:  # Mark as duplicate (keep first as original)
-                                        st.write("🔄 Duplicate")
-                                    else:
-                                        st.write("📌 Original")
-
-                            # Show duplicate info
-                            if comparison_method == "File Content (MD5)":
-                                st.code(f"MD5: {key}")
-
-                    # Generate duplicate report
-                    if st.button("Generate Duplicate Report"):
-                        report = generate_duplicate_report(duplicates, comparison_method)
-                        FileHandler.create_download_link(
-                            report.encode(),
-                            "duplicate_files_report.txt",
-                            "text/plain"
-                        )
-                else:
-                    st.success("🎉 No duplicate files found!")
+        result = get_artifact("duplicate_finder_result")
+        if result is not None:
+            duplicates = result['groups']
+            if duplicates:
+                st.subheader("Duplicate Files Found")
+
+                total_duplicates = sum(len(group) - 1 for group in duplicates.values())
+                st.warning(f"Found {total_duplicates:,} duplicate files in {len(duplicates):,} groups")
+
+                # One row per file; the first file of each group is kept as the original
+                rows = [
+                    {'Group': i, 'File': file_info['name'], 'Size (bytes)': file_info['size'],
+                     'Status': "🔄 Duplicate" if j > 0 else "📌 Original", 'Key': str(key)}
+                    for i, (key, files) in enumerate(duplicates.items(), 1)
+                    for j, file_info in enumerate(files)
+                ]
+                show_result_view(rows, "duplicate_finder", item_label="files",
+                                 download_name="duplicate_files.csv",
+                                 version=artifact_version("duplicate_finder_result"))
+
+                # Generate duplicate report
+                if st.button("Generate Duplicate Report"):
+                    report = generate_duplicate_report(duplicates, result['method'])
+                    FileHandler.create_download_link(
+                        report.encode(),
+                        "duplicate_files_report.txt",
+                        "text/plain"
+                    )
+            else:
+                st.success("🎉 No duplicate files found!")
 
 
 def file_encryption():
@@ -662,14 +667,14 @@ def generate_rename_script(files, method, variables):
     return script
 
 
+@instrument()
 def find_duplicates(files, method, ignore_ext, case_sensitive):
     """Find duplicate files based on specified method"""
     file_groups = {}
 
     for file in files:
         if method == "File Content (MD5)":
-            key = hashlib.md5(file.read()).hexdigest()
-            file.seek(0)  # Reset file pointer
+            key = FileHandler.hash_file(file, 'md5')
         elif method == "File Size":
             key = file.size
         elif method == "File Name":
@@ -680,8 +685,7 @@ def find_duplicates(files, method, ignore_ext, case_sensitive):
                 name = name.lower()
             key = name
         elif method == "Content + Size":
-            content_hash = hashlib.md5(file.read()).hexdigest()
-            file.seek(0)
+            content_hash = FileHandler.hash_file(file, 'md5')
             key = f"{content_hash}_{file.size}"
 
         if key not in file_groups:
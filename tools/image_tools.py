@@ -1,15 +1,27 @@
 import streamlit as st
 import numpy as np
-from PIL import Image, ImageDraw, ImageFont, ImageEnhance, ImageFilter, ImageOps
+from PIL import Image, ImageDraw, ImageFont, ImageEnhance, ImageFilter
 import cv2
 import io
 import zipfile
-from sklearn.cluster import KMeans
+import mimetypes
 import matplotlib.pyplot as plt
-from utils.common import create_tool_header, show_progress_bar, add_to_recent
-from utils.file_handler import FileHandler
+from utils.common import create_tool_header, show_progress_bar, add_to_recent, watch_job
+from utils.metrics import label_invocation
+from utils.file_handler import FileHandler, ZipArchiveBuilder
 from utils.ai_client import ai_client
-
+from utils.batch import run_batch, to_batch_file
+from utils.jobs import job_manager, job_key, DONE
+from utils.result_cache import cached_result
+from utils.image_processing import (RESAMPLING_FILTERS, resize_image_file, compress_image_file,
+                                    compress_to_target_size, TARGET_MAX_ENCODES)
+from utils.image_pipeline import BatchPipeline, draft_for_size, shrink
+from utils.preview import fit_for_display
+from utils.color_quantization import QUANTIZATION_METHODS, load_sample, quantize_colors
+from utils.result_view import show_result_view, results_to_bytes, prepared_download_button
+from utils.session_memory import store_artifact, get_artifact, drop_artifact, artifact_version
+from utils.image_metadata import (read_image_metadata, sample_color_summary, metadata_summary_row,
+                                  metadata_tag_rows, metadata_to_json)
 
 def display_tools():
     """Display all image processing tools"""
@@ -53,6 +65,7 @@ def display_tools():
     st.markdown("---")
 
     add_to_recent(f"Image Tools - {selected_tool}")
+    label_invocation(f"Image Tools - {selected_tool}")
 
     # Display selected tool
     if selected_tool == "Format Converter":
@@ -105,7 +118,7 @@ def format_converter():
             quality = None
 
         if st.button("Convert Images"):
-            converted_files = {}
+            converted_files = ZipArchiveBuilder()
             progress_bar = st.progress(0)
 
             for i, uploaded_file in enumerate(uploaded_files):
@@ -129,7 +142,7 @@ def format_converter():
                         # Generate filename
                         base_name = uploaded_file.name.rsplit('.', 1)[0]
                         new_filename = f"{base_name}.{target_format.lower()}"
-                        converted_files[new_filename] = output.getvalue()
+                        converted_files.add_bytes(new_filename, output.getbuffer())
 
                         progress_bar.progress((i + 1) / len(uploaded_files))
 
@@ -137,15 +150,11 @@ def format_converter():
                     st.error(f"Error converting {uploaded_file.name}: {str(e)}")
 
             if converted_files:
-                if len(converted_files) == 1:
-                    filename, data = next(iter(converted_files.items()))
-                    FileHandler.create_download_link(data, filename, f"image/{target_format.lower()}")
-                else:
-                    # Create ZIP archive for multiple files
-                    zip_data = FileHandler.create_zip_archive(converted_files)
-                    FileHandler.create_download_link(zip_data, "converted_images.zip", "application/zip")
+                converted_count = len(converted_files)
+                FileHandler.create_archive_download(converted_files, "converted_images.zip",
+                                                    f"image/{target_format.lower()}")
 
-                st.success(f"Converted {len(converted_files)} image(s) to {target_format}")
+                st.success(f"Converted {converted_count} image(s) to {target_format}")
 
 
 def image_resizer():
@@ -158,6 +167,8 @@ def image_resizer():
     if uploaded_files:
         resize_method = st.selectbox("Resize Method",
                                      ["Exact Dimensions", "Scale by Percentage", "Fit to Width", "Fit to Height"])
+        width = height = None
+        scale = 100
 
         if resize_method == "Exact Dimensions":
             col1, col2 = st.columns(2)
@@ -173,68 +184,28 @@ def image_resizer():
             height = st.number_input("Target Height (pixels)", min_value=1, value=600)
 
         maintain_aspect = st.checkbox("Maintain Aspect Ratio", True)
-        resampling = st.selectbox("Resampling Algorithm", ["LANCZOS", "BILINEAR", "BICUBIC", "NEAREST"])
+        resampling = st.selectbox("Resampling Algorithm", list(RESAMPLING_FILTERS))
 
         if st.button("Resize Images"):
-            resized_files = {}
-            progress_bar = st.progress(0)
+            resized_files = ZipArchiveBuilder()
 
-            resampling_map = {
-                "LANCZOS": Image.Resampling.LANCZOS,
-                "BILINEAR": Image.Resampling.BILINEAR,
-                "BICUBIC": Image.Resampling.BICUBIC,
-                "NEAREST": Image.Resampling.NEAREST
-            }
-
-            for i, uploaded_file in enumerate(uploaded_files):
-                try:
-                    image = FileHandler.process_image_file(uploaded_file)
-                    if image:
-                        original_width, original_height = image.size
-
-                        if resize_method == "Exact Dimensions":
-                            if maintain_aspect:
-                                image.thumbnail((width, height), resampling_map[resampling])
-                                new_image = image
-                            else:
-                                new_image = image.resize((width, height), resampling_map[resampling])
-                        elif resize_method == "Scale by Percentage":
-                            new_width = int(original_width * scale / 100)
-                            new_height = int(original_height * scale / 100)
-                            new_image = image.resize((new_width, new_height), resampling_map[resampling])
-                        elif resize_method == "Fit to Width":
-                            aspect_ratio = original_height / original_width
-                            new_height = int(width * aspect_ratio)
-                            new_image = image.resize((width, new_height), resampling_map[resampling])
-                        elif resize_method == "Fit to Height":
-                            aspect_ratio = original_width / original_height
-                            new_width = int(height * aspect_ratio)
-                            new_image = image.resize((new_width, height), resampling_map[resampling])
-
-                        # Save resized image
-                        output = io.BytesIO()
-                        format_name = image.format if image.format else "PNG"
-                        new_image.save(output, format=format_name)
+            results = FileHandler.batch_process_files(uploaded_files, resize_image_file, mode="process",
+                                                      resize_method=resize_method, width=width, height=height,
+                                                      scale=scale, maintain_aspect=maintain_aspect,
+                                                      resampling=resampling)
 
-                        base_name = uploaded_file.name.rsplit('.', 1)[0]
-                        extension = uploaded_file.name.rsplit('.', 1)[1]
-                        new_filename = f"{base_name}_resized.{extension}"
-                        resized_files[new_filename] = output.getvalue()
-
-                        progress_bar.progress((i + 1) / len(uploaded_files))
-
-                except Exception as e:
-                    st.error(f"Error resizing {uploaded_file.name}: {str(e)}")
+            for result in results:
+                if result['success']:
+                    new_filename, data = result['result']
+                    resized_files.add_bytes(new_filename, data)
+                else:
+                    st.error(f"Error resizing {result['file'].name}: {result['error']}")
 
             if resized_files:
-                if len(resized_files) == 1:
-                    filename, data = next(iter(resized_files.items()))
-                    FileHandler.create_download_link(data, filename, "image/png")
-                else:
-                    zip_data = FileHandler.create_zip_archive(resized_files)
-                    FileHandler.create_download_link(zip_data, "resized_images.zip", "application/zip")
+                resized_count = len(resized_files)
+                FileHandler.create_archive_download(resized_files, "resized_images.zip", "image/png")
 
-                st.success(f"Resized {len(resized_files)} image(s)")
+                st.success(f"Resized {resized_count} image(s)")
 
 
 def image_cropper():
@@ -245,13 +216,13 @@ def image_cropper():
                                              accept_multiple=False)
 
     if uploaded_file:
-        image = FileHandler.process_image_file(uploaded_file[0])
+        preview = FileHandler.process_image_preview(uploaded_file[0])
 
-        if image:
+        if preview:
             st.subheader("Original Image")
-            st.image(image, caption="Original Image", use_column_width=True)
+            st.image(preview.data, caption="Original Image", use_column_width=True)
 
-            width, height = image.size
+            width, height = preview.full_size
             st.write(f"Image dimensions: {width} × {height} pixels")
 
             # Crop parameters
@@ -263,18 +234,20 @@ def image_cropper():
                 right = st.slider("Right", left + 1, width, width)
                 bottom = st.slider("Bottom", top + 1, height, height)
 
-            # Preview crop area
-            preview_image = image.copy()
+            # Preview crop area on the proxy; the full image is only decoded to export
+            preview_image = preview.image.copy()
             draw = ImageDraw.Draw(preview_image)
-            draw.rectangle([left, top, right, bottom], outline="red", width=3)
+            draw.rectangle([preview.to_preview(left), preview.to_preview(top),
+                            preview.to_preview(right), preview.to_preview(bottom)], outline="red", width=3)
             st.image(preview_image, caption="Crop Preview (red rectangle)", use_column_width=True)
 
             if st.button("Crop Image"):
                 try:
+                    image = Image.open(uploaded_file[0])
                     cropped_image = image.crop((left, top, right, bottom))
 
                     st.subheader("Cropped Image")
-                    st.image(cropped_image, caption="Cropped Image", use_column_width=True)
+                    st.image(fit_for_display(cropped_image), caption="Cropped Image", use_column_width=True)
 
                     # Save cropped image
                     output = io.BytesIO()
@@ -300,28 +273,28 @@ def palette_extractor():
                                              accept_multiple=False)
 
     if uploaded_file:
-        image = FileHandler.process_image_file(uploaded_file[0])
+        preview = FileHandler.process_image_preview(uploaded_file[0])
 
-        if image:
-            st.image(image, caption="Source Image", use_column_width=True)
+        if preview:
+            st.image(preview.data, caption="Source Image", use_column_width=True)
 
             num_colors = st.slider("Number of colors to extract", 2, 20, 8)
+            method = QUANTIZATION_METHODS[st.selectbox("Method", list(QUANTIZATION_METHODS))]
 
             if st.button("Extract Palette"):
+                image_bytes = uploaded_file[0].getvalue()
+                job = job_manager.submit(extract_palette_colors, image_bytes, num_colors, method,
+                                         name="Palette extraction",
+                                         key=job_key("palette_extractor", image_bytes, num_colors, method))
+                st.session_state.palette_extractor_job = job.id
+
+            job = watch_job(st.session_state.get('palette_extractor_job'))
+            if job and job.status == DONE:
                 try:
-                    # Convert image to RGB and resize for faster processing
-                    rgb_image = image.convert('RGB')
-                    rgb_image.thumbnail((200, 200))
-
-                    # Convert to numpy array
-                    img_array = np.array(rgb_image)
-                    img_array = img_array.reshape(-1, 3)
-
-                    # Use KMeans to find dominant colors
-                    kmeans = KMeans(n_clusters=num_colors, random_state=42, n_init=10)
-                    kmeans.fit(img_array)
-
-                    colors = kmeans.cluster_centers_.astype(int)
+                    rgb_image, palette = job.result
+                    colors = [color['rgb'] for color in palette]
+                    if not colors:
+                        raise ValueError("the image has no opaque pixels")
 
                     # Create palette visualization
                     fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(12, 4))
@@ -356,7 +329,7 @@ def palette_extractor():
                         hex_color = f"#{color[0]:02x}{color[1]:02x}{color[2]:02x}"
                         rgb_color = f"rgb({color[0]}, {color[1]}, {color[2]})"
 
-                        col1, col2, col3, col4 = st.columns(4)
+                        col1, col2, col3, col4, col5 = st.columns(5)
                         with col1:
                             st.markdown(
                                 f'<div style="width:50px;height:30px;background-color:{hex_color};border:1px solid #000;"></div>',
@@ -367,13 +340,16 @@ def palette_extractor():
                             st.code(rgb_color)
                         with col4:
                             st.code(f"HSV: {cv2.cvtColor(np.uint8([[color]]), cv2.COLOR_RGB2HSV)[0][0]}")
+                        with col5:
+                            st.code(f"{palette[i]['proportion']:.1%} of pixels")
 
                     # Create downloadable palette data
                     palette_data = []
                     for i, color in enumerate(colors):
                         hex_color = f"#{color[0]:02x}{color[1]:02x}{color[2]:02x}"
                         rgb_color = f"rgb({color[0]}, {color[1]}, {color[2]})"
-                        palette_data.append(f"Color {i + 1}: {hex_color} | {rgb_color}")
+                        palette_data.append(f"Color {i + 1}: {hex_color} | {rgb_color} | "
+                                            f"{palette[i]['proportion']:.1%}")
 
                     palette_text = '\n'.join(palette_data)
                     FileHandler.create_download_link(palette_text.encode(), "color_palette.txt", "text/plain")
@@ -382,6 +358,17 @@ def palette_extractor():
                     st.error(f"Error extracting palette: {str(e)}")
 
 
+@cached_result()
+def extract_palette_colors(job, image_bytes, num_colors, method="kmeans"):
+    """Background job: quantize the image's colors and return (downsample, palette)"""
+    job.update(0.1, "Decoding image")
+    sample = load_sample(image_bytes)
+    job.check_cancelled()
+
+    job.update(0.3, "Clustering colors")
+    return sample, quantize_colors(sample, num_colors, method)
+
+
 def image_compressor():
     """Compress images with quality control"""
     create_tool_header("Image Compressor", "Reduce image file sizes", "🗜️")
@@ -391,7 +378,12 @@ def image_compressor():
 
     if uploaded_files:
         compression_method = st.selectbox("Compression Method",
-                                          ["Quality Reduction", "Resize + Quality", "Format Optimization"])
+                                          ["Quality Reduction", "Resize + Quality", "Format Optimization",
+                                           "Target File Size"])
+        quality = 75
+        scale_factor = 0.8
+        target_size_kb = None
+        allow_resize = allow_subsampling = None
 
         if compression_method in ["Quality Reduction", "Resize + Quality"]:
             quality = st.slider("Quality", 1, 100, 75)
@@ -399,81 +391,103 @@ def image_compressor():
         if compression_method == "Resize + Quality":
             scale_factor = st.slider("Scale Factor", 0.1, 1.0, 0.8)
 
-        target_format = st.selectbox("Output Format", ["Keep Original", "JPEG", "PNG", "WEBP"])
+        if compression_method == "Target File Size":
+            target_size_kb = st.number_input("Target Size per Image (KB)", min_value=1, value=150, step=10)
+            col1, col2 = st.columns(2)
+            with col1:
+                allow_resize = st.checkbox("Downscale if needed", value=True,
+                                           help="Shrink images that miss the target even at low quality")
+            with col2:
+                allow_subsampling = st.checkbox("Allow chroma subsampling (JPEG)", value=True,
+                                                help="4:2:0 color resolution; off keeps full 4:4:4 color")
+            target_format = st.selectbox("Output Format", ["JPEG", "WEBP"])
+            st.caption(f"Each image is encoded at most {TARGET_MAX_ENCODES} times in memory to find the "
+                       "highest quality that fits.")
+        else:
+            target_format = st.selectbox("Output Format", ["Keep Original", "JPEG", "PNG", "WEBP"])
+
+        # Ties a stored result to the uploads and settings that produced it
+        fingerprint = (tuple((uploaded_file.name, uploaded_file.size) for uploaded_file in uploaded_files),
+                       compression_method, quality, scale_factor, target_format, target_size_kb,
+                       allow_resize, allow_subsampling)
 
         if st.button("Compress Images"):
-            compressed_files = {}
-            progress_bar = st.progress(0)
+            compressed_files = ZipArchiveBuilder()
             total_original_size = 0
             total_compressed_size = 0
+            reports = []
 
-            for i, uploaded_file in enumerate(uploaded_files):
-                try:
-                    image = FileHandler.process_image_file(uploaded_file)
-                    if image:
-                        total_original_size += uploaded_file.size
-
-                        # Apply compression method
-                        if compression_method == "Resize + Quality":
-                            new_width = int(image.width * scale_factor)
-                            new_height = int(image.height * scale_factor)
-                            image = image.resize((new_width, new_height), Image.Resampling.LANCZOS)
-
-                        # Determine output format
-                        if target_format == "Keep Original":
-                            output_format = image.format if image.format else "PNG"
-                        else:
-                            output_format = target_format
-
-                        # Handle format-specific requirements
-                        if output_format == "JPEG" and image.mode in ("RGBA", "P"):
-                            rgb_image = Image.new("RGB", image.size, (255, 255, 255))
-                            rgb_image.paste(image, mask=image.split()[-1] if image.mode == "RGBA" else None)
-                            image = rgb_image
-
-                        # Save compressed image
-                        output = io.BytesIO()
-                        save_kwargs = {"format": output_format}
-
-                        if compression_method in ["Quality Reduction", "Resize + Quality"] and output_format == "JPEG":
-                            save_kwargs["quality"] = quality
-                            save_kwargs["optimize"] = True
-                        elif output_format == "PNG":
-                            save_kwargs["optimize"] = True
-                        elif output_format == "WEBP":
-                            save_kwargs["quality"] = quality if compression_method in ["Quality Reduction",
-                                                                                       "Resize + Quality"] else 80
-                            save_kwargs["optimize"] = True
-
-                        image.save(output, **save_kwargs)
-                        compressed_data = output.getvalue()
-                        total_compressed_size += len(compressed_data)
-
-                        # Generate filename
-                        base_name = uploaded_file.name.rsplit('.', 1)[0]
-                        extension = output_format.lower() if target_format != "Keep Original" else \
-                        uploaded_file.name.rsplit('.', 1)[1]
-                        new_filename = f"{base_name}_compressed.{extension}"
-                        compressed_files[new_filename] = compressed_data
-
-                        progress_bar.progress((i + 1) / len(uploaded_files))
-
-                except Exception as e:
-                    st.error(f"Error compressing {uploaded_file.name}: {str(e)}")
+            if compression_method == "Target File Size":
+                results = FileHandler.batch_process_files(uploaded_files, compress_to_target_size, mode="process",
+                                                          target_bytes=int(target_size_kb * 1024),
+                                                          target_format=target_format, allow_resize=allow_resize,
+                                                          allow_subsampling=allow_subsampling)
+            else:
+                results = FileHandler.batch_process_files(uploaded_files, compress_image_file, mode="process",
+                                                          compression_method=compression_method, quality=quality,
+                                                          scale_factor=scale_factor, target_format=target_format)
+
+            errors = []
+            for result in results:
+                if result['success']:
+                    new_filename, compressed_data = result['result'][:2]
+                    total_original_size += result['file'].size
+                    total_compressed_size += len(compressed_data)
+                    compressed_files.add_bytes(new_filename, compressed_data)
+                    if len(result['result']) > 2:
+                        reports.append(result['result'][2])
+                else:
+                    errors.append(f"Error compressing {result['file'].name}: {result['error']}")
 
+            # Kept across reruns so paging through the report doesn't lose the results
+            download = None
             if compressed_files:
+                if len(compressed_files) == 1:
+                    name = compressed_files.names[0]
+                    download = (compressed_files.read_member(name), name,
+                                mimetypes.guess_type(name)[0] or "application/octet-stream")
+                else:
+                    download = (compressed_files.getvalue(), "compressed_images.zip", "application/zip")
+            compressed_files.discard()
+            rows = [{'File': report['file'], 'Original (KB)': round(report['original_bytes'] / 1024, 1),
+                     'Result (KB)': round(report['bytes'] / 1024, 1), 'Fits': "✅" if report['fits'] else "❌",
+                     'Quality': report['quality'], 'Scale': report['scale'],
+                     'Size': f"{report['width']}×{report['height']}", 'Subsampling': report['subsampling'],
+                     'SSIM': report['ssim'], 'Encodes': report['encodes']} for report in reports]
+            store_artifact("image_compressor_result", {
+                'errors': errors, 'rows': rows, 'download': download,
+                'missed': [report['file'] for report in reports if not report['fits']],
+                'target_size_kb': target_size_kb,
+                'original_size': total_original_size, 'compressed_size': total_compressed_size,
+                'fingerprint': fingerprint
+            })
+
+        result = get_artifact("image_compressor_result")
+        if result and result['fingerprint'] != fingerprint:
+            # The uploads or settings changed since this result was made
+            drop_artifact("image_compressor_result")
+            result = None
+        if result:
+            for error in result['errors']:
+                st.error(error)
+
+            if result['rows']:
+                if result['missed']:
+                    st.warning(f"{len(result['missed'])} image(s) could not reach {result['target_size_kb']:,} KB; "
+                               f"the smallest encode was kept: {', '.join(result['missed'])}")
+                show_result_view(result['rows'], key="target_size_report", item_label="images",
+                                 download_name="compression_report.csv", filterable=False,
+                                 version=artifact_version("image_compressor_result"))
+
+            if result['download']:
                 # Show compression statistics
-                compression_ratio = (total_original_size - total_compressed_size) / total_original_size * 100
+                original_size, compressed_size = result['original_size'], result['compressed_size']
+                compression_ratio = (original_size - compressed_size) / original_size * 100
                 st.success(f"Compression complete! Reduced size by {compression_ratio:.1f}%")
-                st.write(f"Original total size: {total_original_size:,} bytes")
-                st.write(f"Compressed total size: {total_compressed_size:,} bytes")
+                st.write(f"Original total size: {original_size:,} bytes")
+                st.write(f"Compressed total size: {compressed_size:,} bytes")
 
-                if len(compressed_files) == 1:
-                    filename, data = next(iter(compressed_files.items()))
-                    FileHandler.create_download_link(data, filename, "image/jpeg")
-                else:
-                    zip_data = FileHandler.create_zip_archive(compressed_files)
-                    FileHandler.create_download_link(zip_data, "compressed_images.zip", "application/zip")
+                FileHandler.create_download_link(*result['download'])
 
 
 def watermark_tool():
@@ -491,77 +505,34 @@ def watermark_tool():
             font_size = st.slider("Font Size", 10, 200, 36)
             opacity = st.slider("Opacity", 10, 100, 50)
             color = st.color_picker("Text Color", "#FFFFFF")
+            settings = {'text': watermark_text, 'font_size': font_size, 'color': color, 'opacity': opacity}
         else:
             watermark_image = FileHandler.upload_files(['png'], accept_multiple=False)
+            settings = None
             if watermark_image:
+                watermark = FileHandler.process_image_file(watermark_image[0])
                 opacity = st.slider("Opacity", 10, 100, 50)
                 scale = st.slider("Scale", 10, 100, 20)
+                settings = {'watermark': watermark, 'scale': scale, 'opacity': opacity}
 
         position = st.selectbox("Position", ["Bottom Right", "Bottom Left", "Top Right", "Top Left", "Center"])
         margin = st.slider("Margin", 0, 100, 20)
 
-        if st.button("Add Watermark"):
-            watermarked_files = {}
+        # Live placement preview on the first image's proxy
+        preview = FileHandler.process_image_preview(uploaded_files[0])
+        if preview and settings:
+            st.image(apply_watermark(preview.image, watermark_type, settings, position, margin, preview.scale),
+                     caption=f"Preview: {uploaded_files[0].name}", use_column_width=True)
+
+        if st.button("Add Watermark") and settings:
+            watermarked_files = ZipArchiveBuilder()
             progress_bar = st.progress(0)
 
             for i, uploaded_file in enumerate(uploaded_files):
                 try:
                     image = FileHandler.process_image_file(uploaded_file)
                     if image:
-                        # Convert to RGBA for transparency support
-                        if image.mode != 'RGBA':
-                            image = image.convert('RGBA')
-
-                        # Create watermark overlay
-                        overlay = Image.new('RGBA', image.size, (0, 0, 0, 0))
-                        draw = ImageDraw.Draw(overlay)
-
-                        if watermark_type == "Text":
-                            # Calculate text size and position
-                            try:
-                                font = ImageFont.truetype("arial.ttf", font_size)
-                            except:
-                                font = ImageFont.load_default()
-
-                            bbox = draw.textbbox((0, 0), watermark_text, font=font)
-                            text_width = bbox[2] - bbox[0]
-                            text_height = bbox[3] - bbox[1]
-
-                            # Calculate position
-                            x, y = calculate_position(position, image.size, (text_width, text_height), margin)
-
-                            # Convert color and add opacity
-                            hex_color = color.lstrip('#')
-                            rgb_color = tuple(int(hex_color[i:i + 2], 16) for i in (0, 2, 4))
-                            rgba_color = rgb_color + (int(255 * opacity / 100),)
-
-                            draw.text((x, y), watermark_text, font=font, fill=rgba_color)
-
-                        else:  # Image watermark
-                            if watermark_image:
-                                wm_img = FileHandler.process_image_file(watermark_image[0])
-                                if wm_img:
-                                    # Scale watermark
-                                    wm_width = int(wm_img.width * scale / 100)
-                                    wm_height = int(wm_img.height * scale / 100)
-                                    wm_img = wm_img.resize((wm_width, wm_height), Image.Resampling.LANCZOS)
-
-                                    # Ensure RGBA mode
-                                    if wm_img.mode != 'RGBA':
-                                        wm_img = wm_img.convert('RGBA')
-
-                                    # Apply opacity
-                                    alpha = wm_img.split()[-1]
-                                    alpha = alpha.point(lambda p: int(p * opacity / 100))
-                                    wm_img.putalpha(alpha)
-
-                                    # Calculate position
-                                    x, y = calculate_position(position, image.size, wm_img.size, margin)
-
-                                    overlay.paste(wm_img, (x, y), wm_img)
-
-                        # Composite the watermark
-                        watermarked = Image.alpha_composite(image, overlay)
+                        watermarked = apply_watermark(image, watermark_type, settings, position, margin)
 
                         # Convert back to original mode if needed
                         if uploaded_file.name.lower().endswith(('.jpg', '.jpeg')):
@@ -575,7 +546,7 @@ def watermark_tool():
                         base_name = uploaded_file.name.rsplit('.', 1)[0]
                         extension = uploaded_file.name.rsplit('.', 1)[1]
                         new_filename = f"{base_name}_watermarked.{extension}"
-                        watermarked_files[new_filename] = output.getvalue()
+                        watermarked_files.add_bytes(new_filename, output.getbuffer())
 
                         progress_bar.progress((i + 1) / len(uploaded_files))
 
@@ -583,14 +554,69 @@ def watermark_tool():
                     st.error(f"Error adding watermark to {uploaded_file.name}: {str(e)}")
 
             if watermarked_files:
-                if len(watermarked_files) == 1:
-                    filename, data = next(iter(watermarked_files.items()))
-                    FileHandler.create_download_link(data, filename, "image/png")
-                else:
-                    zip_data = FileHandler.create_zip_archive(watermarked_files)
-                    FileHandler.create_download_link(zip_data, "watermarked_images.zip", "application/zip")
+                watermarked_count = len(watermarked_files)
+                FileHandler.create_archive_download(watermarked_files, "watermarked_images.zip", "image/png")
+
+                st.success(f"Added watermark to {watermarked_count} image(s)")
+
+
+def apply_watermark(image, watermark_type, settings, position, margin, scale=1.0):
+    """Composite a text or image watermark; scale shrinks sizes to match a preview proxy"""
+    # Convert to RGBA for transparency support
+    if image.mode != 'RGBA':
+        image = image.convert('RGBA')
+
+    # Create watermark overlay
+    overlay = Image.new('RGBA', image.size, (0, 0, 0, 0))
+    draw = ImageDraw.Draw(overlay)
+    margin = int(margin * scale)
+    opacity = settings['opacity']
+
+    if watermark_type == "Text":
+        # Calculate text size and position
+        try:
+            font = ImageFont.truetype("arial.ttf", max(1, int(settings['font_size'] * scale)))
+        except:
+            font = ImageFont.load_default()
+
+        bbox = draw.textbbox((0, 0), settings['text'], font=font)
+        text_width = bbox[2] - bbox[0]
+        text_height = bbox[3] - bbox[1]
+
+        # Calculate position
+        x, y = calculate_position(position, image.size, (text_width, text_height), margin)
+
+        # Convert color and add opacity
+        hex_color = settings['color'].lstrip('#')
+        rgb_color = tuple(int(hex_color[i:i + 2], 16) for i in (0, 2, 4))
+        rgba_color = rgb_color + (int(255 * opacity / 100),)
+
+        draw.text((x, y), settings['text'], font=font, fill=rgba_color)
+
+    else:  # Image watermark
+        wm_img = settings['watermark']
+        if wm_img:
+            # Scale watermark
+            wm_width = max(1, int(wm_img.width * settings['scale'] / 100 * scale))
+            wm_height = max(1, int(wm_img.height * settings['scale'] / 100 * scale))
+            wm_img = wm_img.resize((wm_width, wm_height), Image.Resampling.LANCZOS)
 
-                st.success(f"Added watermark to {len(watermarked_files)} image(s)")
+            # Ensure RGBA mode
+            if wm_img.mode != 'RGBA':
+                wm_img = wm_img.convert('RGBA')
+
+            # Apply opacity
+            alpha = wm_img.split()[-1]
+            alpha = alpha.point(lambda p: int(p * opacity / 100))
+            wm_img.putalpha(alpha)
+
+            # Calculate position
+            x, y = calculate_position(position, image.size, wm_img.size, margin)
+
+            overlay.paste(wm_img, (x, y), wm_img)
+
+    # Composite the watermark
+    return Image.alpha_composite(image, overlay)
 
 
 def calculate_position(position, image_size, element_size, margin):
@@ -654,76 +680,66 @@ def batch_converter():
         if "Apply Filter" in operations:
             settings['filter_type'] = st.selectbox("Filter Type", ["Blur", "Sharpen", "Enhance", "Grayscale"])
 
-        if st.button("Process All Images"):
-            processed_files = {}
-            progress_bar = st.progress(0)
-
-            for i, uploaded_file in enumerate(uploaded_files):
+        if operations:
+            with st.expander("🧭 Processing Plan (dry run)"):
+                # Only image headers are read, so this stays cheap for large batches
+                pipeline = BatchPipeline(operations, settings)
                 try:
-                    image = FileHandler.process_image_file(uploaded_file)
-                    if image:
-                        processed_image = image.copy()
-
-                        # Apply operations in sequence
-                        for operation in operations:
-                            if operation == "Resize":
-                                if settings['maintain_aspect']:
-                                    processed_image.thumbnail((settings['resize_width'], settings['resize_height']),
-                                                              Image.Resampling.LANCZOS)
-                                else:
-                                    processed_image = processed_image.resize(
-                                        (settings['resize_width'], settings['resize_height']), Image.Resampling.LANCZOS)
-
-                            elif operation == "Add Border":
-                                hex_color = settings['border_color'].lstrip('#')
-                                border_color = tuple(int(hex_color[i:i + 2], 16) for i in (0, 2, 4))
-                                processed_image = ImageOps.expand(processed_image, border=settings['border_width'],
-                                                                  fill=border_color)
-
-                            elif operation == "Apply Filter":
-                                filter_type = settings['filter_type']
-                                if filter_type == "Blur":
-                                    processed_image = processed_image.filter(ImageFilter.BLUR)
-                                elif filter_type == "Sharpen":
-                                    processed_image = processed_image.filter(ImageFilter.SHARPEN)
-                                elif filter_type == "Enhance":
-                                    enhancer = ImageEnhance.Sharpness(processed_image)
-                                    processed_image = enhancer.enhance(1.5)
-                                elif filter_type == "Grayscale":
-                                    processed_image = processed_image.convert('L').convert('RGB')
-
-                        # Handle format conversion
-                        output_format = settings.get('target_format', image.format if image.format else "PNG")
-
-                        if output_format == "JPEG" and processed_image.mode in ("RGBA", "P"):
-                            rgb_image = Image.new("RGB", processed_image.size, (255, 255, 255))
-                            rgb_image.paste(processed_image, mask=processed_image.split()[
-                                -1] if processed_image.mode == "RGBA" else None)
-                            processed_image = rgb_image
-
-                        # Save processed image
-                        output = io.BytesIO()
-                        save_kwargs = {"format": output_format}
-
-                        if "Quality Adjustment" in operations and output_format in ["JPEG", "WEBP"]:
-                            save_kwargs["quality"] = settings['quality']
-
-                        processed_image.save(output, **save_kwargs)
-
-                        base_name = uploaded_file.name.rsplit('.', 1)[0]
-                        extension = output_format.lower()
-                        new_filename = f"{base_name}_processed.{extension}"
-                        processed_files[new_filename] = output.getvalue()
+                    plans = [pipeline.plan_file(uploaded_file) for uploaded_file in uploaded_files]
+                    st.caption(f"Stages for {uploaded_files[0].name}:")
+                    st.dataframe(plans[0], hide_index=True, width="stretch")
+                    total_ms = sum(stage['Est. ms'] for plan in plans for stage in plan)
+                    st.caption(f"Estimated {total_ms / 1000:.1f}s of single-core work for "
+                               f"{len(uploaded_files)} image(s), before parallelism")
+                except Exception as e:
+                    st.warning(f"Could not plan the batch: {str(e)}")
 
-                        progress_bar.progress((i + 1) / len(uploaded_files))
+        if st.button("Process All Images"):
+            batch_files = [to_batch_file(uploaded_file) for uploaded_file in uploaded_files]
+            key = job_key("batch_converter", [(f.name, f.getvalue()) for f in batch_files], operations, settings)
+            job = job_manager.submit(run_batch_conversion, batch_files, operations, settings,
+                                     name="Batch conversion", key=key)
+            st.session_state.batch_converter_job = job.id
+
+        job = watch_job(st.session_state.get('batch_converter_job'))
+        if job and job.status == DONE:
+            for file_name, error in job.result['errors']:
+                st.error(f"Error processing {file_name}: {error}")
+
+            if job.result['count']:
+                FileHandler.create_download_link(job.result['archive'], "batch_processed_images.zip",
+                                                 "application/zip")
+                st.success(f"Processed {job.result['count']} image(s) in {job.elapsed:.1f}s")
+
+
+def run_batch_conversion(job, batch_files, operations, settings):
+    """Background job: convert every file in a process pool and return the zipped results"""
+    def on_progress(completed, total, result):
+        job.update(completed / total, f"Processed {result['item'].name} ({completed}/{total})")
+        job.check_cancelled()
+
+    results = run_batch(batch_files, process_batch_image, mode="process", on_progress=on_progress,
+                        pipeline=BatchPipeline(operations, settings))
+
+    errors = []
+    processed_files = ZipArchiveBuilder()
+    try:
+        for result in results:
+            if result['success']:
+                new_filename, data = result['result']
+                processed_files.add_bytes(new_filename, data)
+            else:
+                errors.append((result['item'].name, result['error']))
+        count = len(processed_files)
+        archive = processed_files.getvalue() if count else b""
+    finally:
+        processed_files.discard()
+    return {'archive': archive, 'count': count, 'errors': errors}
 
-                except Exception as e:
-                    st.error(f"Error processing {uploaded_file.name}: {str(e)}")
 
-            if processed_files:
-                zip_data = FileHandler.create_zip_archive(processed_files)
-                FileHandler.create_download_link(zip_data, "batch_processed_images.zip", "application/zip")
-                st.success(f"Processed {len(processed_files)} image(s)")
+def process_batch_image(uploaded_file, pipeline):
+    """Run the batch pipeline on one uploaded image and return (filename, image bytes)"""
+    return pipeline.process(uploaded_file)
 
 
 def brightness_contrast():
@@ -734,31 +750,27 @@ def brightness_contrast():
                                              accept_multiple=False)
 
     if uploaded_file:
-        image = FileHandler.process_image_file(uploaded_file[0])
+        preview = FileHandler.process_image_preview(uploaded_file[0])
 
-        if image:
+        if preview:
             col1, col2 = st.columns(2)
 
             with col1:
                 st.subheader("Original Image")
-                st.image(image, use_column_width=True)
+                st.image(preview.data, use_column_width=True)
 
             # Adjustment controls
             brightness = st.slider("Brightness", 0.1, 3.0, 1.0, 0.1)
             contrast = st.slider("Contrast", 0.1, 3.0, 1.0, 0.1)
 
-            # Apply adjustments in real-time
-            enhancer_brightness = ImageEnhance.Brightness(image)
-            temp_image = enhancer_brightness.enhance(brightness)
-
-            enhancer_contrast = ImageEnhance.Contrast(temp_image)
-            adjusted_image = enhancer_contrast.enhance(contrast)
-
+            # Slider changes only re-render the proxy
             with col2:
                 st.subheader("Adjusted Image")
-                st.image(adjusted_image, use_column_width=True)
+                st.image(adjust_brightness_contrast(preview.image, brightness, contrast), use_column_width=True)
 
             if st.button("Download Adjusted Image"):
+                image = Image.open(uploaded_file[0])
+                adjusted_image = adjust_brightness_contrast(image, brightness, contrast)
                 output = io.BytesIO()
                 format_name = image.format if image.format else "PNG"
                 adjusted_image.save(output, format=format_name)
@@ -770,6 +782,12 @@ def brightness_contrast():
                 FileHandler.create_download_link(output.getvalue(), filename, "image/png")
 
 
+def adjust_brightness_contrast(image, brightness, contrast):
+    """Apply brightness then contrast enhancement"""
+    temp_image = ImageEnhance.Brightness(image).enhance(brightness)
+    return ImageEnhance.Contrast(temp_image).enhance(contrast)
+
+
 def blur_effects():
     """Apply blur effects to images"""
     create_tool_header("Blur Effects", "Apply various blur effects", "〰️")
@@ -778,9 +796,9 @@ def blur_effects():
                                              accept_multiple=False)
 
     if uploaded_file:
-        image = FileHandler.process_image_file(uploaded_file[0])
+        preview = FileHandler.process_image_preview(uploaded_file[0])
 
-        if image:
+        if preview:
             blur_type = st.selectbox("Blur Type", ["Gaussian Blur", "Motion Blur", "Radial Blur", "Simple Blur"])
 
             if blur_type == "Gaussian Blur":
@@ -794,26 +812,15 @@ def blur_effects():
 
             with col1:
                 st.subheader("Original Image")
-                st.image(image, use_column_width=True)
+                st.image(preview.data, use_column_width=True)
 
             with col2:
                 st.subheader("Blurred Image")
-
-                if blur_type == "Gaussian Blur":
-                    blurred_image = image.filter(ImageFilter.GaussianBlur(radius=radius))
-                elif blur_type == "Simple Blur":
-                    blurred_image = image
-                    for _ in range(int(radius)):
-                        blurred_image = blurred_image.filter(ImageFilter.BLUR)
-                elif blur_type == "Motion Blur":
-                    # Simple motion blur simulation
-                    blurred_image = image.filter(ImageFilter.GaussianBlur(radius=radius / 2))
-                else:  # Radial blur
-                    blurred_image = image.filter(ImageFilter.GaussianBlur(radius=radius))
-
-                st.image(blurred_image, use_column_width=True)
+                st.image(apply_blur(preview.image, blur_type, radius, preview.scale), use_column_width=True)
 
             if st.button("Download Blurred Image"):
+                image = Image.open(uploaded_file[0])
+                blurred_image = apply_blur(image, blur_type, radius)
                 output = io.BytesIO()
                 format_name = image.format if image.format else "PNG"
                 blurred_image.save(output, format=format_name)
@@ -825,6 +832,20 @@ def blur_effects():
                 FileHandler.create_download_link(output.getvalue(), filename, "image/png")
 
 
+def apply_blur(image, blur_type, radius, scale=1.0):
+    """Blur an image; scale shrinks the radius so a preview proxy looks like the full-size result"""
+    if blur_type == "Simple Blur":
+        blurred_image = image
+        for _ in range(max(1, round(int(radius) * scale))):
+            blurred_image = blurred_image.filter(ImageFilter.BLUR)
+        return blurred_image
+    if blur_type == "Motion Blur":
+        # Simple motion blur simulation
+        return image.filter(ImageFilter.GaussianBlur(radius=radius / 2 * scale))
+    # Gaussian and radial blur
+    return image.filter(ImageFilter.GaussianBlur(radius=radius * scale))
+
+
 def metadata_extractor():
     """Extract image metadata and EXIF data"""
     create_tool_header("Metadata Extractor", "Extract image metadata and EXIF data", "📋")
@@ -833,90 +854,90 @@ def metadata_extractor():
                                               accept_multiple=True)
 
     if uploaded_files:
-        for uploaded_file in uploaded_files:
-            st.subheader(f"Metadata for: {uploaded_file.name}")
+        include_colors = st.checkbox("Include sampled color summary", False,
+                                     help="Decodes a small downsample of each image; everything else is read "
+                                          "from the file headers")
 
+        # Headers only, so this stays fast for hundreds of files
+        records = []
+        for uploaded_file in uploaded_files:
             try:
-                image = FileHandler.process_image_file(uploaded_file)
-                if image:
-                    # Basic image info
-                    col1, col2, col3 = st.columns(3)
-                    with col1:
-                        st.metric("Width", f"{image.width} px")
-                    with col2:
-                        st.metric("Height", f"{image.height} px")
-                    with col3:
-                        st.metric("Mode", image.mode)
-
-                    col4, col5, col6 = st.columns(3)
-                    with col4:
-                        st.metric("Format", image.format or "Unknown")
-                    with col5:
-                        st.metric("File Size", f"{uploaded_file.size:,} bytes")
-                    with col6:
-                        aspect_ratio = round(image.width / image.height, 2)
-                        st.metric("Aspect Ratio", f"{aspect_ratio}:1")
-
-                    # EXIF data (for JPEG images)
-                    if hasattr(image, '_getexif') and image._getexif():
-                        exif = image._getexif()
-                        if exif:
-                            st.subheader("EXIF Data")
-                            exif_data = {}
-
-                            # Common EXIF tags
-                            exif_tags = {
-                                256: 'ImageWidth',
-                                257: 'ImageLength',
-                                272: 'Make',
-                                273: 'StripOffsets',
-                                274: 'Orientation',
-                                282: 'XResolution',
-                                283: 'YResolution',
-                                306: 'DateTime',
-                                315: 'Artist'
-                            }
-
-                            for tag_id, value in exif.items():
-                                tag_name = exif_tags.get(tag_id, f'Tag_{tag_id}')
-                                exif_data[tag_name] = str(value)
-
-                            if exif_data:
-                                for key, value in exif_data.items():
-                                    st.write(f"**{key}**: {value}")
-                            else:
-                                st.info("No readable EXIF data found")
-                        else:
-                            st.info("No EXIF data available")
-                    else:
-                        st.info("EXIF data not available for this format")
-
-                    # Color analysis
-                    st.subheader("Color Analysis")
-                    if image.mode == 'RGB':
-                        # Calculate average color
-                        img_array = np.array(image)
-                        avg_color = np.mean(img_array, axis=(0, 1)).astype(int)
-                        hex_color = f"#{avg_color[0]:02x}{avg_color[1]:02x}{avg_color[2]:02x}"
+                metadata = read_image_metadata(uploaded_file)
+                if include_colors:
+                    metadata['colors'] = sample_color_summary(uploaded_file)
+                records.append(metadata)
+            except Exception as e:
+                st.error(f"Error extracting metadata from {uploaded_file.name}: {str(e)}")
 
-                        col1, col2 = st.columns(2)
-                        with col1:
-                            st.write(f"**Average Color**: {hex_color}")
-                            st.markdown(
-                                f'<div style="width:100px;height:50px;background-color:{hex_color};border:1px solid #000;"></div>',
-                                unsafe_allow_html=True)
+        if not records:
+            return
 
-                        with col2:
-                            # Calculate histogram
-                            histogram = cv2.calcHist([cv2.cvtColor(img_array, cv2.COLOR_RGB2BGR)], [0, 1, 2], None,
-                                                     [256, 256, 256], [0, 256, 0, 256, 0, 256])
-                            st.write(f"**Total Pixels**: {image.width * image.height:,}")
-                            st.write(f"**Color Depth**: {image.mode}")
+        st.subheader("Overview")
+        show_result_view([metadata_summary_row(metadata) for metadata in records], "metadata_overview",
+                         item_label="files", filterable=len(records) > 1)
 
-            except Exception as e:
-                st.error(f"Error extracting metadata from {uploaded_file.name}: {str(e)}")
+        # Records are re-read on every rerun, so the export is keyed by the files and options instead
+        export_version = (include_colors, tuple((metadata['file'], metadata['file_size']) for metadata in records))
+        col1, col2 = st.columns(2)
+        with col1:
+            prepared_download_button(
+                "📥 Export CSV", lambda: results_to_bytes([row for metadata in records
+                                                          for row in metadata_tag_rows(metadata)]),
+                file_name="image_metadata.csv", mime="text/csv", key="metadata_csv", token=export_version)
+        with col2:
+            prepared_download_button("📥 Export JSON", lambda: metadata_to_json(records),
+                                     file_name="image_metadata.json", mime="application/json",
+                                     key="metadata_json", token=export_version)
+
+        st.markdown("---")
+        selected = 0
+        if len(records) > 1:
+            selected = st.selectbox("Show details for", range(len(records)),
+                                    format_func=lambda index: records[index]['file'])
+        metadata = records[selected]
+        st.subheader(f"Metadata for: {metadata['file']}")
+
+        # Basic image info
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("Width", f"{metadata['width']} px")
+        with col2:
+            st.metric("Height", f"{metadata['height']} px")
+        with col3:
+            st.metric("Mode", metadata['mode'])
+
+        col4, col5, col6 = st.columns(3)
+        with col4:
+            st.metric("Format", metadata['format'] or "Unknown")
+        with col5:
+            st.metric("File Size", f"{metadata['file_size']:,} bytes")
+        with col6:
+            aspect_ratio = round(metadata['width'] / metadata['height'], 2)
+            st.metric("Aspect Ratio", f"{aspect_ratio}:1")
+
+        colors = metadata.get('colors')
+        if colors and colors['average_color']:
+            st.subheader("Color Analysis")
+            swatches = [(f"Average {colors['average_color']}", colors['average_color'])] + [
+                (f"{color['hex']} · {color['proportion']:.0%}", color['hex']) for color in colors['dominant_colors']]
+            for col, (label, hex_color) in zip(st.columns(len(swatches)), swatches):
+                with col:
+                    st.markdown(
+                        f'<div style="width:100px;height:50px;background-color:{hex_color};border:1px solid #000;"></div>',
+                        unsafe_allow_html=True)
+                    st.caption(label)
+            st.write(f"**Total Pixels**: {metadata['width'] * metadata['height']:,}")
+
+        tag_rows = [row for row in metadata_tag_rows(metadata) if row['Section'] not in ('File', 'XMP')]
+        st.subheader("EXIF, ICC and Color Data")
+        if tag_rows:
+            show_result_view(tag_rows, "metadata_tags", item_label="fields", columns=['Section', 'Tag', 'Value'])
+        else:
+            st.info("No EXIF data available")
 
-            st.markdown("---")
+        if metadata['xmp']:
+            with st.expander("XMP Packet"):
+                st.code(metadata['xmp'], language="xml")
 
 
 def background_removal():
@@ -927,9 +948,10 @@ def background_removal():
 
     if uploaded_file:
         image = FileHandler.process_image_file(uploaded_file[0])
+        preview = FileHandler.process_image_preview(uploaded_file[0]) if image else None
 
-        if image:
-            st.image(image, caption="Original Image", use_column_width=True)
+        if image and preview:
+            st.image(preview.data, caption="Original Image", use_column_width=True)
 
             if st.button("Remove Background"):
                 with st.spinner("Processing image with AI..."):
@@ -982,7 +1004,7 @@ def background_removal():
                         result_image = Image.fromarray(result_array, 'RGBA')
 
                         st.subheader("Result (Simplified Background Removal)")
-                        st.image(result_image, caption="Background Removed", use_column_width=True)
+                        st.image(fit_for_display(result_image), caption="Background Removed", use_column_width=True)
                         st.warning(
                             "This is a simplified background removal. For professional results, use dedicated AI services like Remove.bg or similar APIs.")
 
@@ -1007,9 +1029,10 @@ def text_overlay():
 
     if uploaded_file:
         image = FileHandler.process_image_file(uploaded_file[0])
+        preview = FileHandler.process_image_preview(uploaded_file[0]) if image else None
 
-        if image:
-            st.image(image, caption="Original Image", use_column_width=True)
+        if image and preview:
+            st.image(preview.data, caption="Original Image", use_column_width=True)
 
             # Text settings
             text_content = st.text_area("Text to add:", "Your Text Here")
@@ -1115,7 +1138,7 @@ def text_overlay():
                     result_image = Image.alpha_composite(result_image, overlay)
 
                     st.subheader("Result")
-                    st.image(result_image, caption="Image with Text Overlay", use_column_width=True)
+                    st.image(fit_for_display(result_image), caption="Image with Text Overlay", use_column_width=True)
 
                     # Save result
                     output = io.BytesIO()
@@ -1138,9 +1161,10 @@ def image_enhancement():
 
     if uploaded_file:
         image = FileHandler.process_image_file(uploaded_file[0])
+        preview = FileHandler.process_image_preview(uploaded_file[0]) if image else None
 
-        if image:
-            st.image(image, caption="Original Image", use_column_width=True)
+        if image and preview:
+            st.image(preview.data, caption="Original Image", use_column_width=True)
 
             enhancement_type = st.selectbox("Enhancement Type", [
                 "Auto Enhance", "Noise Reduction", "Sharpening", "Color Correction", "Upscaling"
@@ -1204,7 +1228,7 @@ def image_enhancement():
                         enhanced_image = enhanced_image.resize(new_size, Image.Resampling.LANCZOS)
 
                     st.subheader("Enhanced Image")
-                    st.image(enhanced_image, caption=f"Enhanced ({enhancement_type})", use_column_width=True)
+                    st.image(fit_for_display(enhanced_image), caption=f"Enhanced ({enhancement_type})", use_column_width=True)
 
                     # Save enhanced image
                     output = io.BytesIO()
@@ -1280,10 +1304,11 @@ def collage_maker():
                     img_width = total_width // len(images)
 
                     for i, img in enumerate(images):
-                        # Resize image
+                        # Resize image, decoding JPEGs at reduced scale (Grid/Mosaic get this from thumbnail())
                         aspect_ratio = img.height / img.width
                         new_height = int(img_width * aspect_ratio)
-                        img = img.resize((img_width, new_height), Image.Resampling.LANCZOS)
+                        draft_for_size(img, (img_width, new_height))
+                        img = shrink(img, (img_width, new_height))
 
                         # Calculate position
                         x = spacing + i * (img_width + spacing)
@@ -1389,6 +1414,9 @@ def icon_generator():
             elif generation_method == "From Image" and uploaded_file:
                 source_image = FileHandler.process_image_file(uploaded_file[0])
                 if source_image:
+                    # Only the largest icon's worth of pixels is needed from the square crop
+                    draft_for_size(source_image, (max(sizes), max(sizes)))
+
                     # Make square
                     min_dim = min(source_image.width, source_image.height)
                     left = (source_image.width - min_dim) // 2
@@ -1397,7 +1425,7 @@ def icon_generator():
 
                     # Generate different sizes
                     for size in sizes:
-                        sized_icon = square_image.resize((size, size), Image.Resampling.LANCZOS)
+                        sized_icon = shrink(square_image, (size, size))
 
                         output = io.BytesIO()
                         sized_icon.save(output, format='PNG')
@@ -1420,7 +1448,7 @@ def icon_generator():
                         square_image = ai_image.crop((left, top, left + min_dim, top + min_dim))
 
                         for size in sizes:
-                            sized_icon = square_image.resize((size, size), Image.Resampling.LANCZOS)
+                            sized_icon = shrink(square_image, (size, size))
 
                             output = io.BytesIO()
                             sized_icon.save(output, format='PNG')
@@ -5,7 +5,10 @@ import matplotlib.pyplot as plt
 from scipy import stats
 import pandas as pd
 from utils.common import create_tool_header, show_progress_bar, add_to_recent
+from utils.metrics import label_invocation
 from utils.file_handler import FileHandler
+from utils.result_view import show_result_view
+from utils.session_memory import store_artifact, get_artifact, artifact_version
 
 
 def display_tools():
@@ -52,6 +55,7 @@ def display_tools():
     st.markdown("---")
 
     add_to_recent(f"Science/Math Tools - {selected_tool}")
+    label_invocation(f"Science/Math Tools - {selected_tool}")
 
     # Display selected tool
     if selected_tool == "Calculator":
@@ -899,14 +903,14 @@ def prime_numbers():
         n = st.number_input("Generate primes up to:", min_value=2, value=100, step=1)
 
         if st.button("Generate Primes"):
-            primes = generate_primes(int(n))
-            st.success(f"Found {len(primes)} prime numbers up to {int(n)}")
-
-            # Display primes in columns
-            cols = st.columns(5)
-            for i, prime in enumerate(primes):
-                with cols[i % 5]:
-                    st.write(prime)
+            store_artifact("prime_numbers_result", {'n': int(n), 'primes': generate_primes(int(n))})
+
+        result = get_artifact("prime_numbers_result")
+        if result:
+            st.success(f"Found {len(result['primes']):,} prime numbers up to {result['n']:,}")
+            show_result_view(result['primes'], "prime_numbers", item_label="primes", columns=["Prime"],
+                             download_name=f"primes_up_to_{result['n']}.txt",
+                             version=artifact_version("prime_numbers_result"))
 
     elif option == "Find prime factors":
         number = st.number_input("Enter number to factor:", min_value=2, value=60, step=1)
@@ -15,8 +15,15 @@ import urllib.parse
 import base64
 from datetime import datetime, timedelta
 from cryptography.fernet import Fernet
-from utils.common import create_tool_header, show_progress_bar, add_to_recent
+from utils.common import create_tool_header, show_progress_bar, add_to_recent, watch_job
+from utils.metrics import label_invocation
 from utils.file_handler import FileHandler
+from utils.jobs import job_manager, job_key, DONE
+from utils.progress import ProgressTracker
+from utils.result_cache import cached_result
+from utils.log_analysis import scan_log_lines, build_log_threats, generate_log_analysis_report
+from utils.result_view import show_result_view
+from utils.session_memory import store_artifact, get_artifact, artifact_version
 
 
 def display_tools():
@@ -84,6 +91,7 @@ def display_tools():
     st.markdown("---")
 
     add_to_recent(f"Security Tools - {selected_tool}")
+    label_invocation(f"Security Tools - {selected_tool}")
 
     # Display educational disclaimer
     st.warning(
@@ -359,8 +367,6 @@ def network_scanner():
         network_range = st.text_input("Network Range (e.g., 192.168.1.0/24)", "192.168.1.0/24")
 
         if st.button("Simulate Host Discovery"):
-            show_progress_bar("Scanning network range", 3)
-
             # Simulate discovered hosts
             simulated_hosts = generate_simulated_hosts()
 
@@ -385,8 +391,6 @@ def network_scanner():
         port_range = st.text_input("Port Range", "1-1000")
 
         if st.button("Simulate Port Scan"):
-            show_progress_bar("Scanning ports", 4)
-
             # Simulate port scan results
             open_ports = generate_simulated_ports()
 
@@ -414,15 +418,17 @@ def ssl_tls_validator():
 
     if hostname and st.button("Validate SSL/TLS"):
         try:
-            show_progress_bar("Checking SSL/TLS certificate", 2)
+            progress = show_progress_bar("Checking SSL/TLS certificate", total=2, unit="steps")
 
             # Create SSL context
             context = ssl.create_default_context()
 
             with socket.create_connection((hostname, port), timeout=10) as sock:
+                progress.advance(message="Connected")
                 with context.wrap_socket(sock, server_hostname=hostname) as ssock:
                     cert = ssock.getpeercert()
                     cipher = ssock.cipher()
+                    progress.finish("Handshake complete")
 
                     st.success("✅ SSL/TLS connection successful!")
 
@@ -684,26 +690,31 @@ def log_analysis():
             st.subheader(f"Analyzing: {log_file.name}")
 
             try:
-                log_content = FileHandler.process_text_file(log_file)
+                # Scan in the background so widget interactions don't restart the analysis
+                upload_id = getattr(log_file, 'file_id', None) or FileHandler.hash_file(log_file, 'sha256')
+                job = job_manager.submit(analyze_log_file, log_file, name=f"Analyzing {log_file.name}",
+                                         key=job_key("log_analysis", upload_id, log_file.size))
+                job = watch_job(job.id)
+                if job is None or job.status != DONE:
+                    continue
+                log_stats = job.result
 
                 # Basic log statistics
-                lines = log_content.split('\n')
-                total_lines = len(lines)
+                total_lines = log_stats['total_lines']
+                unique_ips = len(log_stats['ips'])
+                error_count = log_stats['error_events']
 
                 col1, col2, col3 = st.columns(3)
                 with col1:
                     st.metric("Total Log Entries", total_lines)
                 with col2:
-                    unique_ips = len(set(extract_ips_from_logs(log_content)))
                     st.metric("Unique IP Addresses", unique_ips)
                 with col3:
-                    error_count = sum(
-                        1 for line in lines if any(keyword in line.lower() for keyword in ['error', 'fail', 'denied']))
                     st.metric("Error/Failure Events", error_count)
 
                 # Threat detection
                 st.subheader("Threat Detection Results")
-                threats = detect_log_threats(log_content)
+                threats = build_log_threats(log_stats)
 
                 if threats:
                     for threat in threats:
@@ -718,6 +729,12 @@ def log_analysis():
                 else:
                     st.success("No obvious threats detected in the logs.")
 
+                # Source addresses can run to tens of thousands in large logs
+                with st.expander(f"Unique IP Addresses ({unique_ips:,})"):
+                    show_result_view(sorted(log_stats['ips']), f"log_ips_{upload_id}", item_label="IP addresses",
+                                     columns=["IP Address"], download_name=f"ips_{log_file.name}.txt",
+                                     version=upload_id)
+
                 # Generate analysis report
                 if st.button(f"Generate Report for {log_file.name}"):
                     report = generate_log_analysis_report(log_file.name, total_lines, unique_ips, error_count, threats)
@@ -730,17 +747,37 @@ def log_analysis():
         # Demo log analysis
         st.subheader("Demo Log Analysis")
         if st.button("Analyze Sample Security Logs"):
-            show_progress_bar("Analyzing sample logs", 3)
-
             # Generate sample analysis results
-            sample_results = generate_sample_log_analysis()
+            store_artifact("log_analysis_sample", generate_sample_log_analysis())
 
+        sample_results = get_artifact("log_analysis_sample")
+        if sample_results:
             st.subheader("Sample Analysis Results")
-            for result in sample_results:
-                st.write(f"**{result['timestamp']}** - {result['event']}: {result['description']}")
+            show_result_view(sample_results, "log_analysis_sample", item_label="events",
+                             download_name="sample_log_analysis.csv",
+                             version=artifact_version("log_analysis_sample"))
 
 
 # Helper functions
+@cached_result(ignore=("job", "report_every"))
+def analyze_log_file(job, log_file, report_every: int = 20000):
+    """Background job: stream a log file through scan_log_lines, reporting progress by bytes read"""
+    progress = ProgressTracker(max(1, log_file.size), "Scanning", "bytes", render_any_thread=True,
+                               render=lambda tracker: job.update(tracker.fraction, tracker.describe()))
+
+    def tracked_lines():
+        for line_number, line in enumerate(FileHandler.iter_lines(log_file), 1):
+            if line_number % report_every == 0:
+                # The upload's own offset counts bytes, matching the total; decoded
+                # characters fall short of it for multi-byte text
+                progress.update(log_file.tell())
+                job.check_cancelled()
+            yield line
+        progress.update(progress.total)
+
+    return scan_log_lines(tracked_lines())
+
+
 def generate_secure_passwords(length, count, upper, lower, numbers, symbols,
                               exclude_ambiguous, exclude_similar, must_include_all):
     """Generate secure passwords with specified criteria"""
@@ -1177,78 +1214,6 @@ def generate_training_metrics():
     }
 
 
-def extract_ips_from_logs(log_content):
-    """Extract IP addresses from log content"""
-    import re
-    ip_pattern = r'\b(?:[0-9]{1,3}\.){3}[0-9]{1,3}\b'
-    return re.findall(ip_pattern, log_content)
-
-
-def detect_log_threats(log_content):
-    """Detect potential threats in log content"""
-    threats = []
-    lines = log_content.split('\n')
-
-    # Count failed login attempts
-    failed_logins = sum(1 for line in lines if
-                        any(term in line.lower() for term in ['failed login', 'authentication failed', 'login failed']))
-
-    if failed_logins > 10:
-        threats.append({
-            "type": "Brute Force Attack",
-            "severity": "High",
-            "description": "Multiple failed login attempts detected",
-            "count": failed_logins
-        })
-
-    # Check for SQL injection attempts
-    sql_injection = sum(
-        1 for line in lines if any(term in line.lower() for term in ['union select', 'drop table', '1=1', 'or 1=1']))
-
-    if sql_injection > 0:
-        threats.append({
-            "type": "SQL Injection Attempt",
-            "severity": "Critical",
-            "description": "Potential SQL injection attacks detected",
-            "count": sql_injection
-        })
-
-    # Check for unusual traffic patterns
-    error_count = sum(1 for line in lines if any(term in line for term in ['404', '500', '403']))
-
-    if error_count > len(lines) * 0.1:  # More than 10% errors
-        threats.append({
-            "type": "Unusual Traffic Pattern",
-            "severity": "Medium",
-            "description": "High error rate indicates potential scanning or attacks",
-            "count": error_count
-        })
-
-    return threats
-
-
-def generate_log_analysis_report(filename, total_lines, unique_ips, error_count, threats):
-    """Generate log analysis report"""
-    report = "LOG ANALYSIS REPORT\n"
-    report += "=" * 50 + "\n\n"
-    report += f"File: {filename}\n"
-    report += f"Analysis Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n"
-
-    report += "STATISTICS:\n"
-    report += f"Total Log Entries: {total_lines}\n"
-    report += f"Unique IP Addresses: {unique_ips}\n"
-    report += f"Error/Failure Events: {error_count}\n\n"
-
-    report += "THREAT DETECTION:\n"
-    if threats:
-        for threat in threats:
-            report += f"- {threat['type']} ({threat['severity']}): {threat['description']} (Count: {threat['count']})\n"
-    else:
-        report += "No obvious threats detected.\n"
-
-    return report
-
-
 def generate_sample_log_analysis():
     """Generate sample log analysis results"""
     return [
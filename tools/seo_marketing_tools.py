@@ -4,6 +4,7 @@ import requests
 from urllib.parse import urlparse, urljoin
 import json
 from utils.common import create_tool_header, show_progress_bar, add_to_recent
+from utils.metrics import label_invocation
 from utils.file_handler import FileHandler
 
 
@@ -52,6 +53,7 @@ def display_tools():
     st.markdown("---")
 
     add_to_recent(f"SEO/Marketing Tools - {selected_tool}")
+    label_invocation(f"SEO/Marketing Tools - {selected_tool}")
 
     # Display selected tool
     if selected_tool == "Page SEO Analyzer":
@@ -6,6 +6,7 @@ from datetime import datetime, timedelta
 import calendar
 import random
 from utils.common import create_tool_header, show_progress_bar, add_to_recent
+from utils.metrics import label_invocation
 from utils.file_handler import FileHandler
 from utils.ai_client import ai_client
 
@@ -53,6 +54,7 @@ def display_tools():
     st.markdown("---")
 
     add_to_recent(f"Social Media Tools - {selected_tool}")
+    label_invocation(f"Social Media Tools - {selected_tool}")
 
     # Display selected tool
     if selected_tool == "Multi-Platform Scheduler":
@@ -11,8 +11,11 @@ from collections import Counter
 import qrcode
 from io import BytesIO
 from utils.common import create_tool_header, show_progress_bar, add_to_recent
+from utils.metrics import label_invocation
 from utils.file_handler import FileHandler
 from utils.ai_client import ai_client
+from utils.result_view import show_result_view
+from utils.session_memory import store_artifact, get_artifact, artifact_version
 
 
 def display_tools():
@@ -59,6 +62,7 @@ def display_tools():
 
     # Add to recent tools
     add_to_recent(f"Text Tools - {selected_tool}")
+    label_invocation(f"Text Tools - {selected_tool}")
 
     # Display selected tool
     if selected_tool == "Case Converter":
@@ -469,16 +473,15 @@ def email_extractor():
 
     if text and st.button("Extract Emails"):
         email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        emails = re.findall(email_pattern, text)
+        store_artifact("email_extractor_result", re.findall(email_pattern, text))
 
+    emails = get_artifact("email_extractor_result")
+    if emails is not None:
         if emails:
-            st.success(f"Found {len(emails)} email(s):")
-            for email in emails:
-                st.write(f"• {email}")
-
-            # Create downloadable list
-            email_list = '\n'.join(emails)
-            FileHandler.create_download_link(email_list.encode(), "extracted_emails.txt", "text/plain")
+            st.success(f"Found {len(emails):,} email(s):")
+            show_result_view(emails, "email_extractor", item_label="emails", columns=["Email"],
+                             download_name="extracted_emails.txt",
+                             version=artifact_version("email_extractor_result"))
         else:
             st.info("No email addresses found.")
 
@@ -498,16 +501,15 @@ def url_extractor():
 
     if text and st.button("Extract URLs"):
         url_pattern = r'http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+'
-        urls = re.findall(url_pattern, text)
+        store_artifact("url_extractor_result", re.findall(url_pattern, text))
 
+    urls = get_artifact("url_extractor_result")
+    if urls is not None:
         if urls:
-            st.success(f"Found {len(urls)} URL(s):")
-            for url in urls:
-                st.write(f"• {url}")
-
-            # Create downloadable list
-            url_list = '\n'.join(urls)
-            FileHandler.create_download_link(url_list.encode(), "extracted_urls.txt", "text/plain")
+            st.success(f"Found {len(urls):,} URL(s):")
+            show_result_view(urls, "url_extractor", item_label="URLs", columns=["URL"],
+                             download_name="extracted_urls.txt",
+                             version=artifact_version("url_extractor_result"))
         else:
             st.info("No URLs found.")
 
@@ -5,6 +5,7 @@ import requests
 import html
 from urllib.parse import urlparse, urljoin
 from utils.common import create_tool_header, show_progress_bar, add_to_recent
+from utils.metrics import label_invocation
 from utils.file_handler import FileHandler
 
 
@@ -50,6 +51,7 @@ def display_tools():
     st.markdown("---")
 
     add_to_recent(f"Web Dev Tools - {selected_tool}")
+    label_invocation(f"Web Dev Tools - {selected_tool}")
 
     # Display selected tool
     if selected_tool == "HTML Validator":
@@ -0,0 +1,44 @@
+import json
+import hashlib
+from typing import Optional, Dict, Any
+
+from utils.tiered_cache import TieredCache
+
+
+def make_cache_key(provider: str, model: str, prompt: Any = None, image_data: Optional[bytes] = None,
+                   config: Optional[Dict[str, Any]] = None, backend: str = "remote") -> str:
+    """Build a content-addressed key from everything that determines a response"""
+    hasher = hashlib.sha256()
+    hasher.update(json.dumps({
+        'backend': backend,
+        'provider': provider,
+        'model': model,
+        'prompt': prompt,
+        'config': config or {}
+    }, sort_keys=True, default=str).encode('utf-8'))
+    if image_data:
+        hasher.update(b'\x00image\x00')
+        hasher.update(image_data)
+    return hasher.hexdigest()
+
+
+class ResponseCache(TieredCache):
+    """Two-tier (memory LRU + disk) cache for AI provider responses, stored on disk as JSON"""
+
+    FILE_EXTENSION = ".json"
+    SERIALIZE_ERRORS = (TypeError, ValueError)
+    DESERIALIZE_ERRORS = (ValueError,)
+
+    def __init__(self, cache_dir: Optional[str] = None, ttl_seconds: float = 24 * 3600,
+                 max_memory_bytes: int = 32 * 1024 * 1024, max_disk_bytes: int = 256 * 1024 * 1024):
+        super().__init__(cache_dir, ttl_seconds, max_memory_bytes, max_disk_bytes)
+
+    def _serialize(self, record: Dict[str, Any]) -> bytes:
+        return json.dumps(record).encode('utf-8')
+
+    def _deserialize(self, data: bytes) -> Dict[str, Any]:
+        return json.loads(data.decode('utf-8'))
+
+    def _should_store(self, value: Any) -> bool:
+        # Empty responses (None, "", {}) are returned but never cached
+        return bool(value)
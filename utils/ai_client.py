@@ -1,9 +1,33 @@
 import os
 import json
+import time
+import queue
 import streamlit as st
-from typing import Optional, Dict, Any, List
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Optional, Dict, Any, List, Callable, Iterator
 import requests
 import base64
+import itertools
+from requests.adapters import HTTPAdapter
+from tenacity import Retrying, stop_after_attempt, wait_random_exponential, retry_if_exception
+from utils.ai_cache import ResponseCache, make_cache_key
+from utils.rate_limit import ProviderLimiter, is_retryable_error
+from utils.local_provider import LocalBackend, LocalProviderConfig, LocalGeminiClient, LocalOpenAIClient
+
+# Upper bound on provider requests in flight from fan-out calls in this process
+MAX_CONCURRENT_REQUESTS = int(os.getenv("AI_MAX_CONCURRENCY", 8))
+
+# Per-provider request budgets; retryable failures back off with jittered exponential waits
+PROVIDER_REQUESTS_PER_MINUTE = {
+    "gemini": float(os.getenv("AI_GEMINI_RPM", 60)),
+    "openai": float(os.getenv("AI_OPENAI_RPM", 60))
+}
+PROVIDER_MAX_CONCURRENT = int(os.getenv("AI_PROVIDER_CONCURRENCY", 4))
+MAX_RETRIES = int(os.getenv("AI_MAX_RETRIES", 4))
+
+AI_CACHE_DIR = os.getenv("AI_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "toolkit_ai"))
+# Simulated responses get a directory of their own so they can never be served to a real-provider run
+AI_LOCAL_CACHE_DIR = os.getenv("AI_LOCAL_CACHE_DIR", f"{AI_CACHE_DIR}_local")
 
 # Import AI libraries
 try:
@@ -13,6 +37,7 @@ try:
     GEMINI_AVAILABLE = True
 except ImportError:
     GEMINI_AVAILABLE = False
+    from utils.local_provider import genai_types as types
 
 try:
     from openai import OpenAI
@@ -25,13 +50,37 @@ except ImportError:
 class AIClient:
     """Unified AI client for multiple providers"""
 
-    def __init__(self):
+    def __init__(self, backend: Optional[str] = None, local_config: Optional[LocalProviderConfig] = None):
         self.gemini_client = None
         self.openai_client = None
+        # "remote" talks to the real providers; "local" serves simulated responses for benchmarks
+        self.backend = backend or os.getenv("AI_PROVIDER_BACKEND", "remote")
+        self.local_backend = None
+        self._local_config = local_config
+        self.cache = ResponseCache(
+            cache_dir=AI_LOCAL_CACHE_DIR if self.backend == "local" else AI_CACHE_DIR,
+            ttl_seconds=float(os.getenv("AI_CACHE_TTL", 24 * 3600))
+        )
+        self._executor = ThreadPoolExecutor(max_workers=MAX_CONCURRENT_REQUESTS,
+                                            thread_name_prefix="ai-client")
+        self.limiters = {
+            provider: ProviderLimiter(rpm, PROVIDER_MAX_CONCURRENT)
+            for provider, rpm in PROVIDER_REQUESTS_PER_MINUTE.items()
+        }
+        self.http_session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=MAX_CONCURRENT_REQUESTS)
+        self.http_session.mount("https://", adapter)
+        self.http_session.mount("http://", adapter)
         self._init_clients()
 
     def _init_clients(self):
         """Initialize AI clients with API keys"""
+        if self.backend == "local":
+            self.local_backend = LocalBackend(self._local_config or LocalProviderConfig.from_env())
+            self.gemini_client = LocalGeminiClient(self.local_backend)
+            self.openai_client = LocalOpenAIClient(self.local_backend)
+            return
+
         # Initialize Gemini
         gemini_key = os.getenv("GEMINI_API_KEY")
         if gemini_key and GEMINI_AVAILABLE:
@@ -48,67 +97,283 @@ class AIClient:
             except Exception as e:
                 st.error(f"Failed to initialize OpenAI: {str(e)}")
 
-    def generate_text(self, prompt: str, model: str = "gemini", max_tokens: int = 1000) -> str:
-        """Generate text using specified AI model"""
+    def _cached(self, provider: str, model_name: str, compute, prompt: Any = None,
+                image_data: Optional[bytes] = None, config: Optional[Dict[str, Any]] = None):
+        """Serve a provider call from the response cache, calling the provider on a miss"""
+        key = make_cache_key(provider, model_name, prompt, image_data, config, backend=self.backend)
+        return self.cache.get_or_compute(key, compute)
+
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Get response cache hit/miss counters"""
+        return self.cache.get_stats()
+
+    def _call_provider(self, provider: str, func: Callable, *args, **kwargs):
+        """Call a provider API under its rate limiter, retrying throttled and transient failures"""
+        limiter = self.limiters[provider]
+
+        def attempt():
+            with limiter.slot():
+                return func(*args, **kwargs)
+
+        retrying = Retrying(
+            stop=stop_after_attempt(MAX_RETRIES + 1),
+            wait=wait_random_exponential(multiplier=0.5, max=20),
+            retry=retry_if_exception(is_retryable_error),
+            before_sleep=lambda _state: limiter.record_retry(),
+            reraise=True
+        )
+        try:
+            return retrying(attempt)
+        except Exception:
+            limiter.record_failure()
+            raise
+
+    def _open_stream(self, provider: str, func: Callable, *args, **kwargs):
+        """Start a streaming call and fetch its first chunk under the limiter and retry policy
+
+        Once the first chunk has arrived the stream is consumed without retries, so
+        chunks already shown to the user are never repeated.
+        """
+        def start():
+            chunks = iter(func(*args, **kwargs))
+            return next(chunks, None), chunks
+
+        first, rest = self._call_provider(provider, start)
+        return rest if first is None else itertools.chain([first], rest)
+
+    def get_rate_limit_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Get per-provider request, retry and queue wait metrics"""
+        return {provider: limiter.get_stats() for provider, limiter in self.limiters.items()}
+
+    def run_concurrently(self, calls: Dict[str, Callable[[], Any]], timeout: float = 60.0,
+                         timeouts: Optional[Dict[str, float]] = None) -> Dict[str, Dict[str, Any]]:
+        """Run independent provider calls at once and collect whatever finishes in time
+
+        Each call gets its own deadline (timeouts[name], falling back to timeout),
+        measured from the moment all calls were submitted. The result for every
+        name has a status of "ok", "error" or "timeout", plus the elapsed seconds.
+        Calls that miss their deadline keep running in the background so their
+        responses still land in the cache.
+        """
+        timeouts = timeouts or {}
+        started = time.perf_counter()
+        finished_at = {}
+        futures = {}
+        for name, call in calls.items():
+            future = self._executor.submit(call)
+            future.add_done_callback(lambda _f, n=name: finished_at.setdefault(n, time.perf_counter()))
+            futures[name] = future
+        deadlines = {name: started + timeouts.get(name, timeout) for name in calls}
+
+        results = {}
+        for name in sorted(futures, key=lambda n: deadlines[n]):
+            future = futures[name]
+            remaining = max(0.0, deadlines[name] - time.perf_counter())
+            try:
+                result = future.result(timeout=remaining)
+                results[name] = {'status': 'ok', 'result': result}
+            except FutureTimeoutError:
+                future.cancel()
+                results[name] = {'status': 'timeout', 'result': None,
+                                 'error': f"No response within {timeouts.get(name, timeout):.0f}s"}
+            except Exception as e:
+                results[name] = {'status': 'error', 'result': None, 'error': str(e)}
+            results[name]['elapsed'] = finished_at.get(name, time.perf_counter()) - started
+
+        return {name: results[name] for name in calls}
+
+    def generate_text_all(self, prompt: str, models: List[str], timeout: float = 60.0,
+                          max_tokens: int = 1000) -> Dict[str, Dict[str, Any]]:
+        """Send one prompt to several models concurrently (see run_concurrently)"""
+        def make_call(model):
+            def call():
+                text = self._generate_text(prompt, model, max_tokens)
+                if text is None:
+                    raise RuntimeError("AI model not available. Please check API keys.")
+                return text
+            return call
+
+        return self.run_concurrently({model: make_call(model) for model in models}, timeout=timeout)
+
+    def generate_text_stream(self, prompt: str, model: str = "gemini", max_tokens: int = 1000,
+                             refresh: bool = False) -> Iterator[str]:
+        """Generate text as a stream of chunks; the completed text is added to the cache
+
+        refresh skips the cached answer and asks the model again, replacing it.
+        """
         try:
             if model == "gemini" and self.gemini_client:
-                response = self.gemini_client.models.generate_content(
+                key = make_cache_key("gemini", "gemini-2.5-flash", prompt, backend=self.backend)
+                cached = None if refresh else self.cache.get(key)
+                if cached is not None:
+                    yield cached
+                    return
+
+                chunks = []
+                for chunk in self._open_stream(
+                    "gemini", self.gemini_client.models.generate_content_stream,
                     model="gemini-2.5-flash",
                     contents=prompt
-                )
-                return response.text or "No response generated"
+                ):
+                    if chunk.text:
+                        chunks.append(chunk.text)
+                        yield chunk.text
 
             elif model == "openai" and self.openai_client:
-                # the newest OpenAI model is "gpt-5" which was released August 7, 2025.
-                # do not change this unless explicitly requested by the user
-                response = self.openai_client.chat.completions.create(
+                key = make_cache_key("openai", "gpt-5", prompt, config={'max_tokens': max_tokens},
+                                     backend=self.backend)
+                cached = None if refresh else self.cache.get(key)
+                if cached is not None:
+                    yield cached
+                    return
+
+                chunks = []
+                stream = self._open_stream(
+                    "openai", self.openai_client.chat.completions.create,
                     model="gpt-5",
                     messages=[{"role": "user", "content": prompt}],
-                    max_tokens=max_tokens
+                    max_tokens=max_tokens,
+                    stream=True
                 )
-                return response.choices[0].message.content
+                for chunk in stream:
+                    delta = chunk.choices[0].delta.content if chunk.choices else None
+                    if delta:
+                        chunks.append(delta)
+                        yield delta
+
+            else:
+                yield "AI model not available. Please check API keys."
+                return
 
+            text = "".join(chunks)
+            if text:
+                self.cache.set(key, text)
             else:
+                yield "No response generated"
+
+        except Exception as e:
+            yield f"Error generating text: {str(e)}"
+
+    def stream_text_all(self, prompt: str, models: List[str], timeout: float = 60.0,
+                        max_tokens: int = 1000) -> Iterator[Dict[str, Any]]:
+        """Stream one prompt from several models at once, interleaving their chunks
+
+        Yields events of the form {'model', 'type', 'text'} where type is "chunk",
+        "done" or "timeout". Models still streaming at the deadline get a single
+        "timeout" event and are no longer reported.
+        """
+        events = queue.Queue()
+
+        def pump(model):
+            for chunk in self.generate_text_stream(prompt, model, max_tokens):
+                events.put({'model': model, 'type': 'chunk', 'text': chunk})
+            events.put({'model': model, 'type': 'done', 'text': None})
+
+        for model in models:
+            self._executor.submit(pump, model)
+
+        deadline = time.perf_counter() + timeout
+        pending = set(models)
+        while pending:
+            remaining = deadline - time.perf_counter()
+            try:
+                event = events.get(timeout=max(0.0, remaining))
+            except queue.Empty:
+                for model in models:
+                    if model in pending:
+                        yield {'model': model, 'type': 'timeout', 'text': f"No response within {timeout:.0f}s"}
+                return
+
+            if event['model'] not in pending:
+                continue
+            if event['type'] == 'done':
+                pending.discard(event['model'])
+            yield event
+
+    def generate_text(self, prompt: str, model: str = "gemini", max_tokens: int = 1000) -> str:
+        """Generate text using specified AI model"""
+        try:
+            text = self._generate_text(prompt, model, max_tokens)
+            if text is None:
                 return "AI model not available. Please check API keys."
+            return text
 
         except Exception as e:
             return f"Error generating text: {str(e)}"
 
+    def _generate_text(self, prompt: str, model: str, max_tokens: int) -> Optional[str]:
+        """Call the provider for generate_text; returns None if the model is unavailable"""
+        if model == "gemini" and self.gemini_client:
+            def compute():
+                response = self._call_provider(
+                    "gemini", self.gemini_client.models.generate_content,
+                    model="gemini-2.5-flash",
+                    contents=prompt
+                )
+                return response.text
+
+            return self._cached("gemini", "gemini-2.5-flash", compute, prompt) or "No response generated"
+
+        elif model == "openai" and self.openai_client:
+            # the newest OpenAI model is "gpt-5" which was released August 7, 2025.
+            # do not change this unless explicitly requested by the user
+            def compute():
+                response = self._call_provider(
+                    "openai", self.openai_client.chat.completions.create,
+                    model="gpt-5",
+                    messages=[{"role": "user", "content": prompt}],
+                    max_tokens=max_tokens
+                )
+                return response.choices[0].message.content
+
+            return self._cached("openai", "gpt-5", compute, prompt, config={'max_tokens': max_tokens})
+
+        return None
+
     def analyze_image(self, image_data: bytes, prompt: str = "Analyze this image") -> str:
         """Analyze image using AI"""
         try:
             if self.gemini_client:
-                response = self.gemini_client.models.generate_content(
-                    model="gemini-2.5-pro",
-                    contents=[
-                        types.Part.from_bytes(
-                            data=image_data,
-                            mime_type="image/jpeg",
-                        ),
-                        prompt
-                    ],
-                )
-                return response.text if response.text else "No analysis available"
+                def compute():
+                    response = self._call_provider(
+                        "gemini", self.gemini_client.models.generate_content,
+                        model="gemini-2.5-pro",
+                        contents=[
+                            types.Part.from_bytes(
+                                data=image_data,
+                                mime_type="image/jpeg",
+                            ),
+                            prompt
+                        ],
+                    )
+                    return response.text
+
+                return (self._cached("gemini", "gemini-2.5-pro", compute, prompt, image_data)
+                        or "No analysis available")
 
             elif self.openai_client:
-                base64_image = base64.b64encode(image_data).decode('utf-8')
-                response = self.openai_client.chat.completions.create(
-                    model="gpt-5",
-                    messages=[
-                        {
-                            "role": "user",
-                            "content": [
-                                {"type": "text", "text": prompt},
-                                {
-                                    "type": "image_url",
-                                    "image_url": {"url": f"data:image/jpeg;base64,{base64_image}"}
-                                }
-                            ],
-                        }
-                    ],
-                    max_tokens=500,
-                )
-                return response.choices[0].message.content
+                def compute():
+                    base64_image = base64.b64encode(image_data).decode('utf-8')
+                    response = self._call_provider(
+                        "openai", self.openai_client.chat.completions.create,
+                        model="gpt-5",
+                        messages=[
+                            {
+                                "role": "user",
+                                "content": [
+                                    {"type": "text", "text": prompt},
+                                    {
+                                        "type": "image_url",
+                                        "image_url": {"url": f"data:image/jpeg;base64,{base64_image}"}
+                                    }
+                                ],
+                            }
+                        ],
+                        max_tokens=500,
+                    )
+                    return response.choices[0].message.content
+
+                return self._cached("openai", "gpt-5", compute, prompt, image_data, {'max_tokens': 500})
 
             else:
                 return "Image analysis not available. Please check API keys."
@@ -120,7 +385,8 @@ class AIClient:
         """Generate image using AI"""
         try:
             if model == "gemini" and self.gemini_client:
-                response = self.gemini_client.models.generate_content(
+                response = self._call_provider(
+                    "gemini", self.gemini_client.models.generate_content,
                     model="gemini-2.0-flash-preview-image-generation",
                     contents=prompt,
                     config=types.GenerateContentConfig(
@@ -134,7 +400,8 @@ class AIClient:
                             return part.inline_data.data
 
             elif model == "openai" and self.openai_client:
-                response = self.openai_client.images.generate(
+                response = self._call_provider(
+                    "openai", self.openai_client.images.generate,
                     model="dall-e-3",
                     prompt=prompt,
                     n=1,
@@ -143,7 +410,7 @@ class AIClient:
 
                 # Download image from URL
                 image_url = response.data[0].url
-                img_response = requests.get(image_url)
+                img_response = self._call_provider("openai", self._download, image_url)
                 if img_response.status_code == 200:
                     return img_response.content
 
@@ -153,6 +420,13 @@ class AIClient:
             st.error(f"Error generating image: {str(e)}")
             return None
 
+    def _download(self, url: str) -> requests.Response:
+        """Fetch a URL over the pooled session, raising on retryable HTTP errors"""
+        response = self.http_session.get(url, timeout=60)
+        if response.status_code >= 500 or response.status_code == 429:
+            response.raise_for_status()
+        return response
+
     def analyze_sentiment(self, text: str) -> Dict[str, Any]:
         """Analyze sentiment of text"""
         try:
@@ -169,30 +443,43 @@ class AIClient:
                 Respond in JSON format.
                 """
 
-                response = self.gemini_client.models.generate_content(
-                    model="gemini-2.5-pro",
-                    contents=prompt,
-                    config=types.GenerateContentConfig(
-                        response_mime_type="application/json",
-                    ),
-                )
+                def compute():
+                    response = self._call_provider(
+                        "gemini", self.gemini_client.models.generate_content,
+                        model="gemini-2.5-pro",
+                        contents=prompt,
+                        config=types.GenerateContentConfig(
+                            response_mime_type="application/json",
+                        ),
+                    )
+                    return json.loads(response.text) if response.text else None
 
-                if response.text:
-                    return json.loads(response.text)
+                result = self._cached("gemini", "gemini-2.5-pro", compute, prompt,
+                                      config={'response_mime_type': "application/json"})
+                if result:
+                    return result
 
             elif self.openai_client:
-                response = self.openai_client.chat.completions.create(
-                    model="gpt-5",
-                    messages=[
-                        {
-                            "role": "system",
-                            "content": "Analyze sentiment and respond with JSON containing sentiment, confidence, indicators, and explanation."
-                        },
-                        {"role": "user", "content": text}
-                    ],
-                    response_format={"type": "json_object"}
-                )
-                return json.loads(response.choices[0].message.content)
+                system_prompt = ("Analyze sentiment and respond with JSON containing sentiment, confidence, "
+                                 "indicators, and explanation.")
+
+                def compute():
+                    response = self._call_provider(
+                        "openai", self.openai_client.chat.completions.create,
+                        model="gpt-5",
+                        messages=[
+                            {
+                                "role": "system",
+                                "content": system_prompt
+                            },
+                            {"role": "user", "content": text}
+                        ],
+                        response_format={"type": "json_object"}
+                    )
+                    return json.loads(response.choices[0].message.content)
+
+                return self._cached("openai", "gpt-5", compute, [system_prompt, text],
+                                    config={'response_format': "json_object"})
 
             return {"error": "No AI model available"}
 
@@ -0,0 +1,159 @@
+import io
+import os
+import time
+import threading
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from typing import List, Any, Callable, Dict, Optional
+
+# Upper bounds on workers for any single batch: processes default to the host's core count,
+# threads to the ThreadPoolExecutor default since they mostly wait on I/O
+MAX_BATCH_WORKERS = int(os.getenv("BATCH_MAX_WORKERS", os.cpu_count() or 2))
+MAX_BATCH_THREADS = int(os.getenv("BATCH_MAX_THREADS", min(32, (os.cpu_count() or 1) + 4)))
+
+BATCH_MODES = ["serial", "thread", "process"]
+
+_process_pools: Dict[int, ProcessPoolExecutor] = {}
+_pool_lock = threading.Lock()
+
+
+class BatchFile(io.BytesIO):
+    """Picklable in-memory stand-in for an uploaded file, used to ship uploads to worker processes"""
+
+    def __init__(self, name: str, data: bytes, type: str = "application/octet-stream"):
+        super().__init__(data)
+        self.name = name
+        self.size = len(data)
+        self.type = type
+
+    def __reduce__(self):
+        return BatchFile, (self.name, self.getvalue(), self.type)
+
+
+def to_batch_file(uploaded_file) -> BatchFile:
+    """Copy an upload into a BatchFile so it can cross a process boundary"""
+    if isinstance(uploaded_file, BatchFile):
+        return uploaded_file
+    uploaded_file.seek(0)
+    data = uploaded_file.read()
+    uploaded_file.seek(0)
+    return BatchFile(uploaded_file.name, data, getattr(uploaded_file, 'type', None) or "application/octet-stream")
+
+
+def get_process_pool(max_workers: int) -> ProcessPoolExecutor:
+    """Return a long-lived process pool so worker start-up is paid once per process"""
+    with _pool_lock:
+        pool = _process_pools.get(max_workers)
+        if pool is None:
+            methods = multiprocessing.get_all_start_methods()
+            context = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+            pool = ProcessPoolExecutor(max_workers=max_workers, mp_context=context)
+            _process_pools[max_workers] = pool
+        return pool
+
+
+def discard_process_pool(max_workers: int):
+    """Shut down a pool whose workers died so the next caller gets a fresh one"""
+    with _pool_lock:
+        pool = _process_pools.pop(max_workers, None)
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _timed_call(func: Callable, item: Any, kwargs: Dict[str, Any]):
+    """Run one work item, capturing its result or error and its wall time"""
+    started = time.perf_counter()
+    try:
+        result = func(item, **kwargs)
+        return True, result, time.perf_counter() - started
+    except Exception as e:
+        return False, str(e), time.perf_counter() - started
+
+
+def run_batch(items: List[Any], func: Callable, mode: str = "thread", max_workers: Optional[int] = None,
+              on_progress: Optional[Callable[[int, int, Dict[str, Any]], None]] = None,
+              **kwargs) -> List[Dict[str, Any]]:
+    """Apply func(item, **kwargs) to every item and return results in input order
+
+    mode "thread" suits I/O-bound work and "process" suits CPU-bound work such as
+    Pillow/OpenCV encoding; func must then be a module-level function and items and
+    results must be picklable (uploads are converted to BatchFile automatically).
+    on_progress(completed, total, result) is called in the caller's thread as each
+    item finishes, in completion order.
+    """
+    if mode not in BATCH_MODES:
+        raise ValueError(f"Unknown batch mode: {mode}")
+
+    total = len(items)
+    limit = MAX_BATCH_THREADS if mode == "thread" else MAX_BATCH_WORKERS
+    workers = max(1, min(max_workers or limit, limit, total or 1))
+    results: List[Optional[Dict[str, Any]]] = [None] * total
+
+    def record(index, outcome):
+        success, value, seconds = outcome
+        result = {'index': index, 'item': items[index], 'success': success, 'seconds': seconds}
+        if success:
+            result['result'] = value
+        else:
+            result['error'] = value
+        results[index] = result
+        return result
+
+    if mode == "serial" or workers == 1 or total <= 1:
+        for index, item in enumerate(items):
+            result = record(index, _timed_call(func, item, kwargs))
+            if on_progress:
+                on_progress(index + 1, total, result)
+        return results
+
+    if mode == "process":
+        executor = get_process_pool(workers)
+        payloads = [to_batch_file(item) if hasattr(item, 'read') and hasattr(item, 'name') else item
+                    for item in items]
+        futures = {executor.submit(_timed_call, func, payload, kwargs): index
+                   for index, payload in enumerate(payloads)}
+        owned_executor = None
+    else:
+        owned_executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="batch")
+        futures = {owned_executor.submit(_timed_call, func, item, kwargs): index
+                   for index, item in enumerate(items)}
+
+    try:
+        for completed, future in enumerate(as_completed(futures), 1):
+            index = futures[future]
+            try:
+                outcome = future.result()
+            except BrokenProcessPool as e:
+                # A worker died; drop the pool so the next batch starts a fresh one
+                discard_process_pool(workers)
+                outcome = (False, str(e), 0.0)
+            except Exception as e:
+                # The worker itself failed (e.g. an unpicklable result)
+                outcome = (False, str(e), 0.0)
+            result = record(index, outcome)
+            if on_progress:
+                on_progress(completed, total, result)
+    except BaseException:
+        # e.g. the caller cancelled from on_progress: don't leave queued items running
+        for future in futures:
+            future.cancel()
+        raise
+    finally:
+        if owned_executor is not None:
+            owned_executor.shutdown(wait=False)
+
+    return results
+
+
+def summarize_batch(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Aggregate per-item timings for display"""
+    seconds = [result['seconds'] for result in results]
+    succeeded = sum(1 for result in results if result['success'])
+    return {
+        'items': len(results),
+        'succeeded': succeeded,
+        'failed': len(results) - succeeded,
+        'total_item_seconds': sum(seconds),
+        'slowest_seconds': max(seconds) if seconds else 0.0
+    }
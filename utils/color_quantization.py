@@ -0,0 +1,224 @@
+import io
+import math
+from typing import Dict, List, Any, Tuple
+
+import numpy as np
+from PIL import Image
+
+from utils.image_pipeline import draft_for_size
+
+# Selectbox labels for the quantization methods, mapped to the method names quantize_colors() takes
+QUANTIZATION_METHODS = {
+    "Fast k-means (histogram)": "kmeans",
+    "Median cut": "median_cut",
+    "MiniBatch k-means": "minibatch"
+}
+
+DEFAULT_SEED = 42
+
+# Palettes are computed from a downsample no larger than this on its longest edge
+SAMPLE_MAX_EDGE = 256
+
+# Pixels more transparent than this are ignored, so backgrounds of cut-outs don't dominate
+ALPHA_THRESHOLD = 128
+
+# Bits kept per channel when binning pixels; 5 bits gives at most 32768 weighted colors
+HISTOGRAM_BITS = 5
+
+KMEANS_MAX_ITER = 50
+KMEANS_TOLERANCE = 0.5
+
+
+def load_sample(source: Any, max_edge: int = SAMPLE_MAX_EDGE) -> Image.Image:
+    """Downsampled RGB or RGBA version of an image given as a PIL image, bytes or file-like
+
+    JPEGs opened here decode straight at reduced scale; a PIL image passed in is never modified.
+    """
+    if isinstance(source, (bytes, bytearray)):
+        source = io.BytesIO(source)
+    if isinstance(source, Image.Image):
+        image = source
+    else:
+        image = Image.open(source)
+        draft_for_size(image, (max_edge, max_edge))
+
+    if image.mode not in ("RGB", "RGBA", "L", "LA"):
+        transparent = image.mode == "PA" or "transparency" in image.info
+        image = image.convert("RGBA" if transparent else "RGB")
+    if max(image.size) > max_edge:
+        image = image.resize(_fit(image.size, max_edge), Image.Resampling.BOX, reducing_gap=2.0)
+    if image.mode in ("L", "LA"):
+        image = image.convert("RGBA" if image.mode == "LA" else "RGB")
+    return image
+
+
+def _fit(size: Tuple[int, int], max_edge: int) -> Tuple[int, int]:
+    ratio = max_edge / max(size)
+    return max(1, round(size[0] * ratio)), max(1, round(size[1] * ratio))
+
+
+def sample_pixels(source: Any, max_edge: int = SAMPLE_MAX_EDGE,
+                  alpha_threshold: int = ALPHA_THRESHOLD) -> np.ndarray:
+    """Opaque pixels of a downsampled image as an (N, 3) uint8 array
+
+    Accepts anything load_sample() does, or an (H, W, 3|4) / (H, W) array, which is
+    subsampled by striding.
+    """
+    if isinstance(source, np.ndarray):
+        pixels = source
+        step = max(1, math.ceil(max(pixels.shape[:2]) / max_edge))
+        pixels = pixels[::step, ::step]
+        if pixels.ndim == 2:
+            pixels = np.repeat(pixels[..., None], 3, axis=2)
+    else:
+        pixels = np.asarray(load_sample(source, max_edge))
+
+    pixels = pixels.reshape(-1, pixels.shape[-1])
+    if pixels.shape[1] == 4:
+        pixels = pixels[pixels[:, 3] >= alpha_threshold]
+    return np.ascontiguousarray(pixels[:, :3], dtype=np.uint8)
+
+
+def color_histogram(pixels: np.ndarray, bits: int = HISTOGRAM_BITS) -> Tuple[np.ndarray, np.ndarray]:
+    """Bin pixels into 2**(3*bits) cells; returns each occupied cell's mean color and pixel count"""
+    shift = 8 - bits
+    channels = pixels.astype(np.int64)
+    index = ((channels[:, 0] >> shift) << (2 * bits)) | ((channels[:, 1] >> shift) << bits) | (channels[:, 2] >> shift)
+    size = 1 << (3 * bits)
+    counts = np.bincount(index, minlength=size)
+    occupied = np.nonzero(counts)[0]
+    sums = np.stack([np.bincount(index, weights=channels[:, c], minlength=size)[occupied] for c in range(3)], axis=1)
+    weights = counts[occupied].astype(np.float64)
+    return sums / weights[:, None], weights
+
+
+def _squared_distances(colors: np.ndarray, centers: np.ndarray) -> np.ndarray:
+    return ((colors[:, None, :] - centers[None, :, :]) ** 2).sum(axis=2)
+
+
+def weighted_kmeans(colors: np.ndarray, weights: np.ndarray, k: int, seed: int = DEFAULT_SEED,
+                    max_iter: int = KMEANS_MAX_ITER) -> Tuple[np.ndarray, np.ndarray]:
+    """k-means over weighted colors with k-means++ seeding; returns (centers, label per color)"""
+    rng = np.random.default_rng(seed)
+    k = min(k, len(colors))
+    probabilities = weights / weights.sum()
+
+    centers = np.empty((k, 3))
+    centers[0] = colors[rng.choice(len(colors), p=probabilities)]
+    closest = ((colors - centers[0]) ** 2).sum(axis=1)
+    for i in range(1, k):
+        score = closest * weights
+        total = score.sum()
+        pick = rng.choice(len(colors), p=score / total) if total > 0 else rng.choice(len(colors), p=probabilities)
+        centers[i] = colors[pick]
+        closest = np.minimum(closest, ((colors - centers[i]) ** 2).sum(axis=1))
+
+    for _ in range(max_iter):
+        distances = _squared_distances(colors, centers)
+        labels = distances.argmin(axis=1)
+        cluster_weights = np.bincount(labels, weights=weights, minlength=k)
+        sums = np.stack([np.bincount(labels, weights=weights * colors[:, c], minlength=k) for c in range(3)], axis=1)
+
+        updated = centers.copy()
+        filled = cluster_weights > 0
+        updated[filled] = sums[filled] / cluster_weights[filled, None]
+        # An empty cluster restarts on the color that is currently worst served
+        for empty in np.nonzero(~filled)[0]:
+            worst = (distances[np.arange(len(colors)), labels] * weights).argmax()
+            updated[empty] = colors[worst]
+            distances[worst] = 0
+
+        shift = np.abs(updated - centers).max()
+        centers = updated
+        if shift < KMEANS_TOLERANCE:
+            break
+
+    return centers, _squared_distances(colors, centers).argmin(axis=1)
+
+
+def median_cut(colors: np.ndarray, weights: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Split the box with the largest weighted error at its weighted median until there are k boxes"""
+    boxes = [np.arange(len(colors))]
+
+    def error(box):
+        if len(box) < 2:
+            return -1.0
+        box_weights = weights[box]
+        mean = np.average(colors[box], axis=0, weights=box_weights)
+        return float((box_weights[:, None] * (colors[box] - mean) ** 2).sum())
+
+    errors = [error(boxes[0])]
+    while len(boxes) < k:
+        target = int(np.argmax(errors))
+        if errors[target] <= 0:
+            break
+        box = boxes[target]
+        box_colors = colors[box]
+        box_weights = weights[box]
+        mean = np.average(box_colors, axis=0, weights=box_weights)
+        channel = int(np.argmax(np.average((box_colors - mean) ** 2, axis=0, weights=box_weights)))
+
+        order = box[np.argsort(box_colors[:, channel], kind='stable')]
+        cumulative = np.cumsum(weights[order])
+        split = int(np.searchsorted(cumulative, cumulative[-1] / 2))
+        split = min(max(split, 1), len(order) - 1)
+        halves = [order[:split], order[split:]]
+
+        boxes[target:target + 1] = halves
+        errors[target:target + 1] = [error(half) for half in halves]
+
+    labels = np.empty(len(colors), dtype=np.int64)
+    centers = np.empty((len(boxes), 3))
+    for i, box in enumerate(boxes):
+        labels[box] = i
+        centers[i] = np.average(colors[box], axis=0, weights=weights[box])
+    return centers, labels
+
+
+def minibatch_kmeans(pixels: np.ndarray, k: int, seed: int = DEFAULT_SEED) -> Tuple[np.ndarray, np.ndarray]:
+    """sklearn MiniBatchKMeans on the raw sampled pixels; returns (centers, label per pixel)"""
+    from sklearn.cluster import MiniBatchKMeans
+
+    unique = len(np.unique(pixels, axis=0))
+    model = MiniBatchKMeans(n_clusters=min(k, unique), random_state=seed, n_init=3,
+                            batch_size=min(4096, len(pixels)))
+    labels = model.fit_predict(pixels.astype(np.float64))
+    return model.cluster_centers_, labels
+
+
+def quantize_colors(source: Any, num_colors: int, method: str = "kmeans", seed: int = DEFAULT_SEED,
+                    max_edge: int = SAMPLE_MAX_EDGE) -> List[Dict[str, Any]]:
+    """Reduce an image to at most num_colors representative colors
+
+    method is "kmeans" (weighted k-means over a color histogram), "median_cut" or
+    "minibatch" (sklearn MiniBatchKMeans over the sampled pixels). Results are
+    deterministic for a given seed and sorted by the share of opaque pixels each
+    color stands for. Returns a list of {'rgb', 'hex', 'proportion'} dicts, empty
+    when the image has no opaque pixels.
+    """
+    if method not in QUANTIZATION_METHODS.values():
+        raise ValueError(f"Unknown quantization method: {method}")
+
+    pixels = sample_pixels(source, max_edge)
+    if not len(pixels):
+        return []
+
+    if method == "minibatch":
+        centers, labels = minibatch_kmeans(pixels, num_colors, seed)
+        shares = np.bincount(labels, minlength=len(centers)).astype(np.float64)
+    else:
+        colors, weights = color_histogram(pixels)
+        if method == "median_cut":
+            centers, labels = median_cut(colors, weights, num_colors)
+        else:
+            centers, labels = weighted_kmeans(colors, weights, num_colors, seed)
+        shares = np.bincount(labels, weights=weights, minlength=len(centers))
+
+    palette = []
+    for center, share in zip(centers, shares / shares.sum()):
+        if share <= 0:
+            continue
+        rgb = tuple(int(channel) for channel in np.clip(np.rint(center), 0, 255))
+        palette.append({'rgb': rgb, 'hex': "#{:02x}{:02x}{:02x}".format(*rgb), 'proportion': float(share)})
+    palette.sort(key=lambda color: color['proportion'], reverse=True)
+    return palette
@@ -1,8 +1,11 @@
 import streamlit as st
 import time
 import uuid
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
 import json
+from utils.search_index import get_search_index
+from utils.jobs import job_manager, FAILED, CANCELLED
+from utils.progress import ProgressTracker
 
 
 def init_session_state():
@@ -75,35 +78,65 @@ def display_tool_grid(categories: Dict[str, Any]):
 def search_tools(query: str, categories: Dict[str, Any]) -> Dict[str, List[str]]:
     """Search for tools across categories"""
     results = {}
-    query = query.lower()
 
-    for category_name, category_info in categories.items():
-        # This would be expanded with actual tool lists from each module
-        matching_tools = []
-
-        # Basic category name matching
-        if query in category_name.lower() or query in category_info['description'].lower():
-            matching_tools.append(f"All {category_name}")
-
-        if matching_tools:
-            results[category_name] = matching_tools
+    # The index is built once per process from every module's tool_categories
+    for category_name, tool_name, _score in get_search_index(categories).search(query):
+        if tool_name is None:
+            tool_name = f"All {category_name}"
+        results.setdefault(category_name, []).append(tool_name)
 
     return results
 
 
-def show_progress_bar(text: str, duration: int = 3):
-    """Show a progress bar with given text and duration"""
+def show_progress_bar(text: str, total: Optional[float] = None, unit: str = "items") -> ProgressTracker:
+    """Show a progress bar driven by reported work units (advance/update), not by elapsed time"""
     progress_bar = st.progress(0)
     status_text = st.empty()
 
-    for i in range(duration * 10):
-        progress = (i + 1) / (duration * 10)
-        progress_bar.progress(progress)
-        status_text.text(f"{text}... {int(progress * 100)}%")
-        time.sleep(0.1)
+    def render(tracker: ProgressTracker):
+        fraction = tracker.fraction
+        if fraction is not None:
+            progress_bar.progress(fraction)
+        status_text.text(tracker.describe())
+
+    return ProgressTracker(total, text, unit, render)
+
+
+def watch_job(job_id: str, render_partial=None, refresh_seconds: float = 0.5):
+    """Show live progress for a background job; returns the job once it has finished
 
-    status_text.text(f"{text} completed!")
-    return True
+    The progress view refreshes on its own while the rest of the page stays interactive,
+    and triggers a full rerun when the job completes so its result can be rendered.
+    """
+    job = job_manager.get(job_id)
+    if job is None:
+        return None
+
+    if job.finished:
+        if job.status == FAILED:
+            st.error(f"{job.name} failed: {job.error}")
+        elif job.status == CANCELLED:
+            st.warning(f"{job.name} was cancelled.")
+        return job
+
+    @st.fragment(run_every=refresh_seconds)
+    def job_progress():
+        current = job_manager.get(job_id)
+        if current is None or current.finished:
+            st.rerun()
+
+        label = current.message or ("Queued..." if current.started_at is None else "Working...")
+        if current.progress is None:
+            st.caption(f"⏳ {current.name}: {label} ({current.elapsed:.1f}s)")
+        else:
+            st.progress(current.progress, text=f"{current.name}: {label} ({current.elapsed:.1f}s)")
+        if render_partial and current.partial is not None:
+            render_partial(current.partial)
+        if st.button("Cancel", key=f"cancel_job_{job_id}"):
+            job_manager.cancel(job_id)
+
+    job_progress()
+    return None
 
 
 def create_download_button(data: bytes, filename: str, mime_type: str = "application/octet-stream"):
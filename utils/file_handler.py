@@ -1,11 +1,106 @@
 import streamlit as st
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Iterator
 import io
+import time
+import codecs
+import hashlib
+import tempfile
 import zipfile
 import json
 import csv
 from PIL import Image
 import pandas as pd
+from utils.batch import run_batch
+from utils.common import show_progress_bar
+from utils.preview import Preview, get_preview
+
+# Read granularity for streaming helpers; large enough to amortize call overhead
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+
+# Characters str.splitlines() treats as line boundaries
+_LINE_BREAKS = '\n\r\v\f\x1c\x1d\x1e\x85\u2028\u2029'
+
+# Spooled uploads stay in memory up to this size, then move to a temp file on disk
+DEFAULT_SPOOL_MAX_MEMORY = 16 * 1024 * 1024
+
+# Formats that are already compressed; deflating them again costs CPU for no gain
+STORED_EXTENSIONS = {
+    'jpg', 'jpeg', 'png', 'webp', 'gif', 'zip', 'gz', 'tgz', 'bz2', 'xz', '7z', 'rar',
+    'mp3', 'mp4', 'm4a', 'aac', 'ogg', 'webm', 'mkv', 'avi', 'mov', 'pdf', 'docx', 'xlsx', 'pptx'
+}
+
+
+class ZipArchiveBuilder:
+    """ZIP archive written one member at a time into a spooled temporary file
+
+    Members are compressed as they are added, so callers never need to hold every
+    output file in memory. Already-compressed formats are stored rather than deflated.
+    """
+
+    def __init__(self, max_memory_bytes: int = DEFAULT_SPOOL_MAX_MEMORY, compresslevel: int = 6):
+        self._buffer = tempfile.SpooledTemporaryFile(max_size=max_memory_bytes)
+        self._zip = zipfile.ZipFile(self._buffer, 'w', zipfile.ZIP_DEFLATED, compresslevel=compresslevel)
+        self.names: List[str] = []
+
+    def __len__(self):
+        return len(self.names)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    @staticmethod
+    def compress_type_for(name: str) -> int:
+        extension = name.rsplit('.', 1)[-1].lower() if '.' in name else ''
+        return zipfile.ZIP_STORED if extension in STORED_EXTENSIONS else zipfile.ZIP_DEFLATED
+
+    def add_bytes(self, name: str, data) -> None:
+        """Add a member from bytes (or any buffer, e.g. BytesIO.getbuffer())"""
+        self._zip.writestr(name, data, compress_type=self.compress_type_for(name))
+        self.names.append(name)
+
+    def add_fileobj(self, name: str, fileobj, chunk_size: int = DEFAULT_CHUNK_SIZE) -> None:
+        """Add a member by streaming from a file-like object"""
+        info = zipfile.ZipInfo(name, date_time=time.localtime()[:6])
+        info.compress_type = self.compress_type_for(name)
+        with self._zip.open(info, 'w', force_zip64=True) as member:
+            for chunk in FileHandler.iter_chunks(fileobj, chunk_size):
+                member.write(chunk)
+        self.names.append(name)
+
+    def close(self) -> None:
+        """Write the central directory; the archive is read-only afterwards"""
+        if self._zip.fp is not None:
+            self._zip.close()
+
+    def read_member(self, name: str) -> bytes:
+        """Read one member back out of the finished archive"""
+        self.close()
+        self._buffer.seek(0)
+        with zipfile.ZipFile(self._buffer, 'r') as reader:
+            return reader.read(name)
+
+    def size(self) -> int:
+        """Current archive size in bytes"""
+        return self._buffer.tell() if self._zip.fp is not None else self._buffer.seek(0, io.SEEK_END)
+
+    def iter_chunks(self, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[bytes]:
+        """Stream the finished archive without materializing it"""
+        self.close()
+        return FileHandler.iter_chunks(self._buffer, chunk_size)
+
+    def getvalue(self) -> bytes:
+        """Return the finished archive as a single bytes object"""
+        self.close()
+        self._buffer.seek(0)
+        return self._buffer.read()
+
+    def discard(self) -> None:
+        """Release the backing buffer or temp file"""
+        self.close()
+        self._buffer.close()
 
 
 class FileHandler:
@@ -56,14 +151,97 @@ class FileHandler:
     def process_text_file(uploaded_file) -> str:
         """Process text file upload"""
         try:
-            content = uploaded_file.read()
-            if isinstance(content, bytes):
-                return content.decode('utf-8')
-            return content
+            # Decode chunk by chunk so the raw bytes are never copied in full
+            return ''.join(FileHandler.iter_text_chunks(uploaded_file, errors='strict'))
         except Exception as e:
             st.error(f"Error reading file: {str(e)}")
             return ""
 
+    @staticmethod
+    def iter_chunks(uploaded_file, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[bytes]:
+        """Yield the file's bytes in fixed-size chunks, rewinding before and after"""
+        if hasattr(uploaded_file, 'seek'):
+            uploaded_file.seek(0)
+        try:
+            while True:
+                chunk = uploaded_file.read(chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+        finally:
+            if hasattr(uploaded_file, 'seek'):
+                uploaded_file.seek(0)
+
+    @staticmethod
+    def iter_text_chunks(uploaded_file, encoding: str = 'utf-8', errors: str = 'replace',
+                         chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[str]:
+        """Yield decoded text chunks; multi-byte characters split across chunks are handled"""
+        decoder = codecs.getincrementaldecoder(encoding)(errors=errors)
+        for chunk in FileHandler.iter_chunks(uploaded_file, chunk_size):
+            text = decoder.decode(chunk)
+            if text:
+                yield text
+        tail = decoder.decode(b'', final=True)
+        if tail:
+            yield tail
+
+    @staticmethod
+    def iter_lines(uploaded_file, encoding: str = 'utf-8', errors: str = 'replace',
+                   keepends: bool = False, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[str]:
+        """Yield text lines one at a time, holding at most one chunk (plus the current line) in memory
+
+        Only each new chunk is split; the unfinished line is kept as a list of pieces and
+        joined once it ends, so a single very long line costs linear time.
+        """
+        pending: List[str] = []
+
+        def finish(line):
+            return line if keepends else line.rstrip('\r\n')
+
+        for text in FileHandler.iter_text_chunks(uploaded_file, encoding, errors, chunk_size):
+            if pending and pending[-1].endswith('\r'):
+                # The previous chunk ended in '\r'; its line is complete, taking this chunk's '\n' if any
+                if text.startswith('\n'):
+                    pending.append('\n')
+                    text = text[1:]
+                yield finish(''.join(pending))
+                pending = []
+                if not text:
+                    continue
+
+            lines = text.splitlines(keepends=True)
+            tail = lines.pop()
+            if lines:
+                if pending:
+                    lines[0] = ''.join(pending) + lines[0]
+                    pending = []
+                for line in lines:
+                    yield finish(line)
+            pending.append(tail)
+            # The tail may be an incomplete line, or a '\r' whose '\n' is in the next chunk
+            if tail[-1] in _LINE_BREAKS and tail[-1] != '\r':
+                yield finish(''.join(pending))
+                pending = []
+        if pending:
+            yield finish(''.join(pending))
+
+    @staticmethod
+    def spool_upload(uploaded_file, max_memory_bytes: int = DEFAULT_SPOOL_MAX_MEMORY):
+        """Copy an upload into a SpooledTemporaryFile that spills to disk past max_memory_bytes"""
+        spooled = tempfile.SpooledTemporaryFile(max_size=max_memory_bytes)
+        for chunk in FileHandler.iter_chunks(uploaded_file):
+            spooled.write(chunk)
+        spooled.seek(0)
+        return spooled
+
+    @staticmethod
+    def hash_file(uploaded_file, algorithm: str = 'md5') -> str:
+        """Hash a file incrementally without loading it into memory"""
+        hasher = hashlib.new(algorithm)
+        for chunk in FileHandler.iter_chunks(uploaded_file):
+            hasher.update(chunk)
+        return hasher.hexdigest()
+
     @staticmethod
     def process_image_file(uploaded_file) -> Optional[Image.Image]:
         """Process image file upload"""
@@ -73,6 +251,15 @@ class FileHandler:
             st.error(f"Error opening image: {str(e)}")
             return None
 
+    @staticmethod
+    def process_image_preview(uploaded_file) -> Optional[Preview]:
+        """Screen-sized proxy of an uploaded image, built once per upload content"""
+        try:
+            return get_preview(uploaded_file)
+        except Exception as e:
+            st.error(f"Error opening image: {str(e)}")
+            return None
+
     @staticmethod
     def process_csv_file(uploaded_file) -> Optional[pd.DataFrame]:
         """Process CSV file upload"""
@@ -86,10 +273,7 @@ class FileHandler:
     def process_json_file(uploaded_file) -> Optional[Dict[str, Any]]:
         """Process JSON file upload"""
         try:
-            content = uploaded_file.read()
-            if isinstance(content, bytes):
-                content = content.decode('utf-8')
-            return json.loads(content)
+            return json.loads(''.join(FileHandler.iter_text_chunks(uploaded_file, errors='strict')))
         except Exception as e:
             st.error(f"Error parsing JSON: {str(e)}")
             return None
@@ -97,32 +281,54 @@ class FileHandler:
     @staticmethod
     def create_zip_archive(files: Dict[str, bytes]) -> bytes:
         """Create ZIP archive from multiple files"""
-        zip_buffer = io.BytesIO()
-
-        with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
+        archive = ZipArchiveBuilder()
+        try:
             for filename, content in files.items():
-                zip_file.writestr(filename, content)
+                archive.add_bytes(filename, content)
+            return archive.getvalue()
+        finally:
+            archive.discard()
 
-        return zip_buffer.getvalue()
+    @staticmethod
+    def create_archive_download(archive: ZipArchiveBuilder, zip_filename: str,
+                                single_mime_type: str = "application/octet-stream"):
+        """Offer a built archive for download; a lone member is offered as itself"""
+        try:
+            if len(archive) == 1:
+                filename = archive.names[0]
+                return FileHandler.create_download_link(archive.read_member(filename), filename, single_mime_type)
+            return FileHandler.create_download_link(archive.getvalue(), zip_filename, "application/zip")
+        finally:
+            archive.discard()
 
     @staticmethod
-    def batch_process_files(files: List[Any], processor_func, **kwargs):
-        """Process multiple files with progress tracking"""
-        results = []
-        progress_bar = st.progress(0)
-        status_text = st.empty()
+    def batch_process_files(files: List[Any], processor_func, mode: str = "serial",
+                            max_workers: Optional[int] = None, **kwargs):
+        """Process multiple files with progress tracking
+
+        mode is "serial", "thread" (I/O-bound work) or "process" (CPU-bound work; processor_func
+        must be a module-level function returning picklable data). Results keep the input order
+        and each carries the seconds spent on that file.
+        """
+        progress = show_progress_bar("Processing", total=len(files), unit="files")
 
-        for i, file in enumerate(files):
-            status_text.text(f"Processing {file.name}...")
-            try:
-                result = processor_func(file, **kwargs)
-                results.append({'file': file, 'result': result, 'success': True})
-            except Exception as e:
-                results.append({'file': file, 'error': str(e), 'success': False})
+        def on_progress(completed, total, result):
+            progress.update(completed, f"{result['item'].name} ({result['seconds']:.2f}s)")
 
-            progress_bar.progress((i + 1) / len(files))
+        batch_results = run_batch(files, processor_func, mode=mode, max_workers=max_workers,
+                                  on_progress=on_progress, **kwargs)
+        progress.finish("Processing complete!")
+
+        results = []
+        for batch_result in batch_results:
+            result = {'file': batch_result['item'], 'success': batch_result['success'],
+                      'seconds': batch_result['seconds']}
+            if batch_result['success']:
+                result['result'] = batch_result['result']
+            else:
+                result['error'] = batch_result['error']
+            results.append(result)
 
-        status_text.text("Processing complete!")
         return results
 
     @staticmethod
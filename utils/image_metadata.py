@@ -0,0 +1,174 @@
+import io
+import json
+from typing import Dict, List, Any, Optional
+
+from PIL import Image, ExifTags
+
+from utils.color_quantization import load_sample, quantize_colors
+from utils.result_cache import cached_result
+
+try:
+    from PIL import ImageCms
+except ImportError:  # Pillow built without littlecms
+    ImageCms = None
+
+# Longest edge of the downsample used for the optional color summary
+COLOR_SUMMARY_EDGE = 64
+
+# Binary EXIF values (maker notes, thumbnails) are summarized rather than dumped
+MAX_VALUE_LENGTH = 200
+
+_EXIF_IFDS = {
+    ExifTags.IFD.Exif: ("Exif", ExifTags.TAGS),
+    ExifTags.IFD.GPSInfo: ("GPS", ExifTags.GPSTAGS),
+    ExifTags.IFD.Interop: ("Interop", ExifTags.TAGS)
+}
+
+
+def _format_value(value: Any) -> str:
+    if isinstance(value, bytes):
+        if len(value) > MAX_VALUE_LENGTH or not value.isascii():
+            return f"<{len(value):,} bytes>"
+        value = value.decode('ascii', errors='replace').rstrip('\x00')
+    text = str(value)
+    return text if len(text) <= MAX_VALUE_LENGTH else text[:MAX_VALUE_LENGTH] + "…"
+
+
+def _read_exif(image: Image.Image) -> Dict[str, Dict[str, str]]:
+    """Every EXIF tag, grouped by IFD, read from the header segment only"""
+    exif = image.getexif()
+    sections = {}
+    main = {ExifTags.TAGS.get(tag, f"Tag_{tag}"): _format_value(value)
+            for tag, value in exif.items() if tag not in _EXIF_IFDS}
+    if main:
+        sections['Image'] = main
+    for ifd, (section, names) in _EXIF_IFDS.items():
+        try:
+            entries = exif.get_ifd(ifd)
+        except Exception:
+            continue
+        if entries:
+            sections[section] = {names.get(tag, f"Tag_{tag}"): _format_value(value) for tag, value in entries.items()}
+    return sections
+
+
+def _read_xmp(image: Image.Image) -> Optional[str]:
+    xmp = image.info.get('xmp') or image.info.get('XML:com.adobe.xmp')
+    if isinstance(xmp, bytes):
+        xmp = xmp.decode('utf-8', errors='replace')
+    return xmp.strip('\x00').strip() if xmp else None
+
+
+def _read_icc(image: Image.Image) -> Optional[Dict[str, Any]]:
+    profile = image.info.get('icc_profile')
+    if not profile:
+        return None
+    icc = {'size_bytes': len(profile)}
+    if ImageCms is not None:
+        try:
+            parsed = ImageCms.ImageCmsProfile(io.BytesIO(profile))
+            icc['description'] = ImageCms.getProfileDescription(parsed).strip()
+            icc['color_space'] = parsed.profile.xcolor_space.strip()
+        except Exception:
+            pass
+    return icc
+
+
+def read_image_metadata(source: Any, name: Optional[str] = None, size: Optional[int] = None) -> Dict[str, Any]:
+    """Dimensions, format details and full EXIF/XMP/ICC of an image, without decoding its pixels
+
+    source is bytes or a file-like object; only the header segments are parsed.
+    """
+    if isinstance(source, (bytes, bytearray)):
+        size = len(source) if size is None else size
+        source = io.BytesIO(source)
+    name = name or getattr(source, 'name', None)
+    size = size if size is not None else getattr(source, 'size', None)
+    if hasattr(source, 'seek'):
+        source.seek(0)
+
+    with Image.open(source) as image:
+        metadata = {
+            'file': name,
+            'file_size': size,
+            'format': image.format,
+            'mime_type': image.get_format_mimetype(),
+            'width': image.width,
+            'height': image.height,
+            'mode': image.mode,
+            'frames': getattr(image, 'n_frames', 1),
+            'dpi': [round(float(value), 2) for value in image.info['dpi']] if 'dpi' in image.info else None,
+            'exif': _read_exif(image),
+            'xmp': _read_xmp(image),
+            'icc_profile': _read_icc(image)
+        }
+
+    if hasattr(source, 'seek'):
+        source.seek(0)
+    return metadata
+
+
+@cached_result()
+def sample_color_summary(source: Any, num_colors: int = 3) -> Dict[str, Any]:
+    """Average and dominant colors from a small downsample (reduced-scale decode for JPEGs)"""
+    if hasattr(source, 'seek'):
+        source.seek(0)
+    sample = load_sample(source, COLOR_SUMMARY_EDGE)
+    palette = quantize_colors(sample, num_colors)
+    if hasattr(source, 'seek'):
+        source.seek(0)
+    if not palette:
+        return {'average_color': None, 'dominant_colors': []}
+
+    average = [round(sum(color['rgb'][c] * color['proportion'] for color in palette)) for c in range(3)]
+    return {
+        'average_color': "#{:02x}{:02x}{:02x}".format(*average),
+        'dominant_colors': [{'hex': color['hex'], 'proportion': round(color['proportion'], 4)} for color in palette]
+    }
+
+
+def metadata_summary_row(metadata: Dict[str, Any]) -> Dict[str, Any]:
+    """One table row per file for the overview"""
+    icc = metadata.get('icc_profile') or {}
+    colors = metadata.get('colors') or {}
+    return {
+        'File': metadata['file'],
+        'Format': metadata['format'],
+        'Width': metadata['width'],
+        'Height': metadata['height'],
+        'Mode': metadata['mode'],
+        'Frames': metadata['frames'],
+        'File Size': metadata['file_size'],
+        'EXIF Tags': sum(len(entries) for entries in metadata['exif'].values()),
+        'XMP': "yes" if metadata['xmp'] else "",
+        'ICC Profile': icc.get('description', f"{icc['size_bytes']:,} bytes" if icc else ""),
+        'Average Color': colors.get('average_color') or ""
+    }
+
+
+def metadata_tag_rows(metadata: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Every field as a (File, Section, Tag, Value) row, for the detail view and CSV export"""
+    rows = []
+
+    def add(section, tag, value):
+        if value is not None:
+            rows.append({'File': metadata['file'], 'Section': section, 'Tag': tag, 'Value': str(value)})
+
+    for key in ('format', 'mime_type', 'width', 'height', 'mode', 'frames', 'dpi', 'file_size'):
+        add('File', key, metadata.get(key))
+    for section, entries in metadata['exif'].items():
+        for tag, value in entries.items():
+            add(f"EXIF {section}", tag, value)
+    for key, value in (metadata.get('icc_profile') or {}).items():
+        add('ICC', key, value)
+    add('XMP', 'packet', metadata.get('xmp'))
+    colors = metadata.get('colors')
+    if colors:
+        add('Colors', 'average_color', colors['average_color'])
+        for i, color in enumerate(colors['dominant_colors'], 1):
+            add('Colors', f"dominant_{i}", f"{color['hex']} ({color['proportion']:.1%})")
+    return rows
+
+
+def metadata_to_json(records: List[Dict[str, Any]]) -> bytes:
+    return json.dumps(records, indent=2, ensure_ascii=False).encode('utf-8')
@@ -0,0 +1,312 @@
+import io
+from typing import Dict, List, Any, Optional, Tuple
+
+from PIL import Image, ImageEnhance, ImageFilter, ImageOps
+
+# Rough single-core cost of each stage in nanoseconds per pixel it touches, measured on
+# photographic content; used only to rank stages in the dry-run plan
+STAGE_COST_NS = {
+    'decode': 16,
+    'resize': 14,
+    'convert': 3,
+    'flatten': 10,
+    'Blur': 53,
+    'Sharpen': 33,
+    'Enhance': 33,
+    'Grayscale': 2,
+    'border': 1,
+    'encode_JPEG': 10,
+    'encode_PNG': 60,
+    'encode_WEBP': 120,
+    'encode_GIF': 200
+}
+
+# Modes that resize and the filters handle directly; anything else is converted before any pixel work
+_NATIVE_MODES = ("RGB", "RGBA", "L")
+
+# Reduced decoding and reduce() pre-shrinking stop at this multiple of the target size,
+# leaving the final resample enough detail to match a full-resolution one (as thumbnail() does)
+DRAFT_REDUCING_GAP = 2.0
+
+# Scales libjpeg can decode at directly, largest first
+_JPEG_DCT_SCALES = (8, 4, 2)
+
+
+def plan_decode_scale(size: Tuple[int, int], target_size: Tuple[int, int],
+                      reducing_gap: float = DRAFT_REDUCING_GAP) -> int:
+    """Largest JPEG decode scale (1, 2, 4 or 8) that still yields reducing_gap × target_size pixels"""
+    requested = (max(1, int(target_size[0] * reducing_gap)), max(1, int(target_size[1] * reducing_gap)))
+    fit = min(size[0] // requested[0], size[1] // requested[1])
+    return next((scale for scale in _JPEG_DCT_SCALES if fit >= scale), 1)
+
+
+def draft_for_size(image: Image.Image, target_size: Tuple[int, int],
+                   reducing_gap: float = DRAFT_REDUCING_GAP) -> int:
+    """Let an opened, not yet decoded JPEG decode straight at a reduced scale
+
+    Call before anything touches the pixels, with the size the image will be shrunk to
+    (or the smallest size its region of interest will be shrunk to). image.size shrinks
+    accordingly, so compute crop boxes and final sizes from it afterwards. Returns the
+    scale applied; other formats are left alone and decode at full size.
+    """
+    if image.format != "JPEG" or image.mode not in ("RGB", "L", "CMYK"):
+        return 1
+    scale = plan_decode_scale(image.size, target_size, reducing_gap)
+    if scale > 1:
+        image.draft(image.mode, (image.width // scale, image.height // scale))
+    return scale
+
+
+def shrink(image: Image.Image, size: Tuple[int, int], resample=Image.Resampling.LANCZOS) -> Image.Image:
+    """Resize, box-reducing first when the target is far smaller than the (already decoded) source"""
+    downscale = size[0] < image.width and size[1] < image.height
+    return image.resize(size, resample, reducing_gap=DRAFT_REDUCING_GAP if downscale else None)
+
+
+def _luminance(rgb: Tuple[int, int, int]) -> int:
+    """ITU-R 601-2 luma, the transform Pillow uses for convert('L')"""
+    r, g, b = rgb
+    return (r * 299 + g * 587 + b * 114) // 1000
+
+
+class BatchPipeline:
+    """Batch converter operations compiled once and applied to every image of a batch
+
+    The selected operations run in one pass per image, reordered only where the output
+    stays the same: the pixel mode is converted once to whatever the filter and output
+    format need, a downscale that no filter precedes runs first (on JPEGs it decodes
+    straight at reduced scale), and the border is added last in the working mode. A
+    filter keeps its place before or after the resize. A border picked before the
+    resize is folded into it: the image is resized so that it plus a proportionally
+    scaled border lands on the requested dimensions. Moving the border after the filter
+    or resize only differs from the user's order along the inner seam of the border.
+    Parameters such as the border fill are derived once here rather than per image, and
+    the instance is cheap to pickle into worker processes.
+    """
+
+    def __init__(self, operations: List[str], settings: Dict[str, Any]):
+        self.operations = list(operations)
+        self.target_format = settings.get('target_format') if "Format Conversion" in operations else None
+        self.quality = settings['quality'] if "Quality Adjustment" in operations else None
+
+        self.resize_box = None
+        self.maintain_aspect = True
+        if "Resize" in operations:
+            self.resize_box = (int(settings['resize_width']), int(settings['resize_height']))
+            self.maintain_aspect = settings['maintain_aspect']
+
+        self.filter_type = settings['filter_type'] if "Apply Filter" in operations else None
+        self.filter_before_resize = self._before(operations, "Apply Filter", "Resize")
+        self.border_before_resize = self._before(operations, "Add Border", "Resize")
+
+        self.border_width = 0
+        self.border_rgb = None
+        if "Add Border" in operations:
+            hex_color = settings['border_color'].lstrip('#')
+            self.border_width = int(settings['border_width'])
+            self.border_rgb = tuple(int(hex_color[i:i + 2], 16) for i in (0, 2, 4))
+
+        # Grayscale can stay single-channel through encoding unless a colored border
+        # is added after it, in which case the border keeps its color as before
+        self.grayscale_output = self.filter_type == "Grayscale" and not (
+            self.border_rgb is not None
+            and len(set(self.border_rgb)) > 1
+            and operations.index("Apply Filter") < operations.index("Add Border")
+        )
+
+    @staticmethod
+    def _before(operations: List[str], first: str, second: str) -> bool:
+        return first in operations and second in operations and operations.index(first) < operations.index(second)
+
+    def output_format(self, source_format: Optional[str]) -> str:
+        return self.target_format or source_format or "PNG"
+
+    def resized_size(self, size: Tuple[int, int]) -> Tuple[int, int]:
+        """Dimensions after the Resize step (thumbnail semantics when keeping the aspect ratio)"""
+        if self.resize_box is None:
+            return size
+        if not self.maintain_aspect:
+            return self.resize_box
+        width, height = size
+        box_width, box_height = self.resize_box
+        if width <= box_width and height <= box_height:
+            return size
+        ratio = min(box_width / width, box_height / height)
+        return max(1, round(width * ratio)), max(1, round(height * ratio))
+
+    def working_mode(self, mode: str, has_transparency: bool, output_format: str) -> str:
+        """The single pixel mode every stage after the conversion works in"""
+        if self.filter_type == "Grayscale":
+            return "L" if self.grayscale_output else "RGB"
+        if output_format == "JPEG":
+            return "L" if mode == "L" else "RGB"
+        if mode in _NATIVE_MODES:
+            return mode
+        return "RGBA" if has_transparency or mode in ("LA", "PA") else "RGB"
+
+    def layout(self, size: Tuple[int, int]) -> Tuple[Tuple[int, int], Tuple[int, int, int, int]]:
+        """Size the image is resized to, and the (left, top, right, bottom) border added after it
+
+        A border the user placed before the resize is scaled with the image, so the
+        bordered result has the dimensions the resize asked for.
+        """
+        width = self.border_width
+        if not (width and self.border_before_resize):
+            return self.resized_size(size), (width,) * 4
+        bordered = (size[0] + 2 * width, size[1] + 2 * width)
+        final = self.resized_size(bordered)
+        if final == bordered:
+            return size, (width,) * 4
+        border_x = round(width * final[0] / bordered[0])
+        border_y = round(width * final[1] / bordered[1])
+        content = (max(1, final[0] - 2 * border_x), max(1, final[1] - 2 * border_y))
+        return content, (border_x, border_y, border_x, border_y)
+
+    def border_fill(self, mode: str):
+        if mode == "L":
+            return _luminance(self.border_rgb)
+        if mode == "RGBA":
+            return self.border_rgb + (255,)
+        return self.border_rgb
+
+    def _stages(self, size: Tuple[int, int], mode: str, has_transparency: bool,
+                source_format: Optional[str]) -> List[Dict[str, Any]]:
+        """Ordered stages for one image, each with its pixel counts and an apply(image) callable"""
+        output_format = self.output_format(source_format)
+        target_size, border = self.layout(size)
+        downscale = target_size[0] * target_size[1] < size[0] * size[1]
+        has_pixel_work = self.resize_box is not None or self.filter_type or self.border_width
+        target_mode = self.working_mode(mode, has_transparency, output_format)
+        needs_convert = mode != target_mode and (has_pixel_work or output_format == "JPEG")
+
+        stages = []
+        current = size
+
+        def add(name, detail, cost_key, out_size, apply, pixels=None):
+            nonlocal current
+            stages.append({'stage': name, 'detail': detail, 'input_size': current, 'output_size': out_size,
+                           'pixels': pixels if pixels is not None else current[0] * current[1],
+                           'cost_key': cost_key, 'apply': apply})
+            current = out_size
+
+        # A grayscale filter that stays single-channel is the mode conversion itself
+        grayscale_in_convert = self.filter_type == "Grayscale" and target_mode == "L"
+        filter_stage = None
+        if self.filter_type and not grayscale_in_convert:
+            filter_stage = ("Filter", self.filter_type, self.filter_type, self._apply_filter)
+        filter_first = filter_stage is not None and self.filter_before_resize
+
+        # JPEG decoding can skip straight to 1/2, 1/4 or 1/8 scale when the image will be shrunk anyway,
+        # unless a filter has to see the full-resolution pixels first
+        decode_scale = 1
+        if downscale and not filter_first and source_format == "JPEG" and mode in _NATIVE_MODES:
+            decode_scale = plan_decode_scale(size, target_size)
+        decoded = (size[0] // decode_scale, size[1] // decode_scale)
+        add("Decode", f"{source_format or 'image'}" + (f" at 1/{decode_scale} scale" if decode_scale > 1 else ""),
+            'decode', decoded, None, pixels=decoded[0] * decoded[1])
+
+        flatten = output_format == "JPEG" and target_mode == "RGB" and (has_transparency or "A" in mode)
+
+        def convert(image):
+            if flatten:
+                rgba = image.convert("RGBA")
+                flat = Image.new("RGB", rgba.size, (255, 255, 255))
+                flat.paste(rgba, mask=rgba.getchannel("A"))
+                return flat
+            return image.convert(target_mode)
+
+        convert_detail = f"{mode} → {target_mode}" + (" on white" if flatten else "") + (
+            " (grayscale)" if grayscale_in_convert else "")
+        convert_stage = ("Convert mode", convert_detail, 'flatten' if flatten else 'convert', convert)
+        # Palette and high bit-depth images are converted before resampling; the rest after a downscale
+        convert_early = needs_convert and (mode not in _NATIVE_MODES or not downscale or filter_first)
+        if convert_early:
+            add(*convert_stage[:3], current, convert_stage[3])
+
+        if filter_first:
+            add(*filter_stage[:3], current, filter_stage[3])
+
+        if self.resize_box is not None and target_size != size:
+            add("Resize", f"{current[0]}×{current[1]} → {target_size[0]}×{target_size[1]}"
+                + (" (keep aspect)" if self.maintain_aspect else ""), 'resize', target_size,
+                lambda image: self._resize(image, target_size, draft=not filter_first))
+
+        if needs_convert and not convert_early:
+            add(*convert_stage[:3], current, convert_stage[3])
+        if filter_stage and not filter_first:
+            add(*filter_stage[:3], current, filter_stage[3])
+
+        if self.border_width:
+            left, top, right, bottom = border
+            bordered = (current[0] + left + right, current[1] + top + bottom)
+            widths = f"{left}px" if left == top else f"{left}×{top}px"
+            add("Border", f"{widths} {'#%02x%02x%02x' % self.border_rgb}", 'border', bordered,
+                lambda image: ImageOps.expand(image, border=border, fill=self.border_fill(image.mode)),
+                pixels=bordered[0] * bordered[1])
+
+        detail = output_format + (f" q{self.quality}" if self.quality and output_format in ("JPEG", "WEBP") else "")
+        add("Encode", detail, f"encode_{output_format}", current, None)
+        return stages
+
+    @staticmethod
+    def _resize(image: Image.Image, size: Tuple[int, int], draft: bool = True) -> Image.Image:
+        if draft:
+            draft_for_size(image, size)
+        return shrink(image, size)
+
+    def _apply_filter(self, image: Image.Image) -> Image.Image:
+        if self.filter_type == "Blur":
+            return image.filter(ImageFilter.BLUR)
+        if self.filter_type == "Sharpen":
+            return image.filter(ImageFilter.SHARPEN)
+        if self.filter_type == "Enhance":
+            return ImageEnhance.Sharpness(image).enhance(1.5)
+        if self.filter_type == "Grayscale":
+            gray = image.convert('L')
+            return gray if self.grayscale_output else gray.convert('RGB')
+        return image
+
+    def plan(self, size: Tuple[int, int], mode: str = "RGB", source_format: Optional[str] = None,
+             has_transparency: bool = False) -> List[Dict[str, Any]]:
+        """Dry run: the stages one image would go through, with pixel counts and estimated time"""
+        return [
+            {
+                'Stage': stage['stage'],
+                'Detail': stage['detail'],
+                'Output': f"{stage['output_size'][0]}×{stage['output_size'][1]}",
+                'Megapixels': round(stage['pixels'] / 1e6, 2),
+                'Est. ms': round(stage['pixels'] * STAGE_COST_NS.get(stage['cost_key'], 0) / 1e6, 1)
+            }
+            for stage in self._stages(size, mode, has_transparency, source_format)
+        ]
+
+    def plan_file(self, uploaded_file) -> List[Dict[str, Any]]:
+        """Dry-run plan for an upload, reading only its header"""
+        uploaded_file.seek(0)
+        with Image.open(uploaded_file) as image:
+            plan = self.plan(image.size, image.mode, image.format, "transparency" in image.info)
+        uploaded_file.seek(0)
+        return plan
+
+    def apply(self, image: Image.Image) -> Image.Image:
+        """Run every stage on an opened (possibly not yet decoded) image"""
+        stages = self._stages(image.size, image.mode, "transparency" in image.info, image.format)
+        for stage in stages:
+            if stage['apply'] is not None:
+                image = stage['apply'](image)
+        return image
+
+    def process(self, uploaded_file) -> Tuple[str, bytes]:
+        """Process one uploaded image and return (filename, image bytes)"""
+        image = Image.open(uploaded_file)
+        output_format = self.output_format(image.format)
+        processed_image = self.apply(image)
+
+        output = io.BytesIO()
+        save_kwargs = {"format": output_format}
+        if self.quality is not None and output_format in ["JPEG", "WEBP"]:
+            save_kwargs["quality"] = self.quality
+        processed_image.save(output, **save_kwargs)
+
+        base_name = uploaded_file.name.rsplit('.', 1)[0]
+        return f"{base_name}_processed.{output_format.lower()}", output.getvalue()
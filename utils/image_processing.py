@@ -0,0 +1,258 @@
+import io
+import math
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+from PIL import Image
+
+from utils.image_pipeline import draft_for_size, shrink
+
+RESAMPLING_FILTERS = {
+    "LANCZOS": Image.Resampling.LANCZOS,
+    "BILINEAR": Image.Resampling.BILINEAR,
+    "BICUBIC": Image.Resampling.BICUBIC,
+    "NEAREST": Image.Resampling.NEAREST
+}
+
+# Target-size search: quality bounds and the most encodes spent on one file
+TARGET_MIN_QUALITY = 30
+TARGET_MAX_QUALITY = 95
+TARGET_MAX_ENCODES = 10
+# Downscaling stops here; below it the result is returned even if it misses the target
+TARGET_MIN_SCALE = 0.1
+# libwebp effort level for every probe (0-6); 2 encodes ~2.5x faster than Pillow's default of 4
+TARGET_WEBP_METHOD = 2
+
+# Similarity is measured on grayscale copies no larger than this on their longest edge
+SSIM_MAX_EDGE = 512
+SSIM_BLOCK = 8
+
+
+def resize_image_file(uploaded_file, resize_method, width=None, height=None, scale=100, maintain_aspect=True,
+                      resampling="LANCZOS"):
+    """Resize one uploaded image and return (filename, image bytes)"""
+    image = Image.open(uploaded_file)
+    original_width, original_height = image.size
+    resample = RESAMPLING_FILTERS[resampling]
+
+    if resize_method == "Exact Dimensions" and maintain_aspect:
+        # thumbnail() plans its own reduced decode
+        image.thumbnail((width, height), resample)
+        new_image = image
+    else:
+        if resize_method == "Exact Dimensions":
+            new_size = (width, height)
+        elif resize_method == "Scale by Percentage":
+            new_size = (int(original_width * scale / 100), int(original_height * scale / 100))
+        elif resize_method == "Fit to Width":
+            aspect_ratio = original_height / original_width
+            new_size = (width, int(width * aspect_ratio))
+        else:
+            aspect_ratio = original_width / original_height
+            new_size = (int(height * aspect_ratio), height)
+
+        # The target is known from the header, so JPEGs can skip most of the full-size decode;
+        # nearest-neighbour keeps exact source pixels and is left alone
+        if resampling != "NEAREST":
+            draft_for_size(image, new_size)
+            new_image = shrink(image, new_size, resample)
+        else:
+            new_image = image.resize(new_size, resample)
+
+    # Save resized image
+    output = io.BytesIO()
+    format_name = image.format if image.format else "PNG"
+    new_image.save(output, format=format_name)
+
+    base_name = uploaded_file.name.rsplit('.', 1)[0]
+    extension = uploaded_file.name.rsplit('.', 1)[1]
+    return f"{base_name}_resized.{extension}", output.getvalue()
+
+
+def compress_image_file(uploaded_file, compression_method, quality=75, scale_factor=0.8,
+                        target_format="Keep Original", target_size_kb=150):
+    """Compress one uploaded image and return (filename, compressed bytes)"""
+    if compression_method == "Target File Size":
+        filename, data, _report = compress_to_target_size(uploaded_file, target_size_kb * 1024, target_format)
+        return filename, data
+
+    image = Image.open(uploaded_file)
+    source_format = image.format
+
+    # Apply compression method
+    if compression_method == "Resize + Quality":
+        new_size = (int(image.width * scale_factor), int(image.height * scale_factor))
+        draft_for_size(image, new_size)
+        image = shrink(image, new_size)
+
+    # Determine output format
+    if target_format == "Keep Original":
+        output_format = source_format if source_format else "PNG"
+    else:
+        output_format = target_format
+
+    # Handle format-specific requirements
+    if output_format == "JPEG" and image.mode in ("RGBA", "P"):
+        rgb_image = Image.new("RGB", image.size, (255, 255, 255))
+        rgb_image.paste(image, mask=image.split()[-1] if image.mode == "RGBA" else None)
+        image = rgb_image
+
+    # Save compressed image
+    output = io.BytesIO()
+    save_kwargs = {"format": output_format}
+
+    if compression_method in ["Quality Reduction", "Resize + Quality"] and output_format == "JPEG":
+        save_kwargs["quality"] = quality
+        save_kwargs["optimize"] = True
+    elif output_format == "PNG":
+        save_kwargs["optimize"] = True
+    elif output_format == "WEBP":
+        save_kwargs["quality"] = quality if compression_method in ["Quality Reduction", "Resize + Quality"] else 80
+        save_kwargs["optimize"] = True
+
+    image.save(output, **save_kwargs)
+
+    # Generate filename
+    base_name = uploaded_file.name.rsplit('.', 1)[0]
+    extension = output_format.lower() if target_format != "Keep Original" else uploaded_file.name.rsplit('.', 1)[1]
+    return f"{base_name}_compressed.{extension}", output.getvalue()
+
+
+def _flatten_for(image: Image.Image, output_format: str) -> Image.Image:
+    """Convert to a mode the encoder takes; JPEG has no alpha, so transparency goes onto white"""
+    has_alpha = image.mode in ("RGBA", "LA", "PA") or "transparency" in image.info
+    if output_format == "WEBP" and has_alpha:
+        return image.convert("RGBA")
+    if has_alpha:
+        rgba = image.convert("RGBA")
+        flat = Image.new("RGB", rgba.size, (255, 255, 255))
+        flat.paste(rgba, mask=rgba.getchannel("A"))
+        return flat
+    return image if image.mode in ("RGB", "L") else image.convert("RGB")
+
+
+def _encode(image: Image.Image, output_format: str, quality: int, subsampling: Optional[int]) -> bytes:
+    """Encode with exactly the settings of the final output, so a probe's size is the size delivered"""
+    output = io.BytesIO()
+    save_kwargs = {"format": output_format, "quality": quality}
+    if output_format == "JPEG":
+        save_kwargs["optimize"] = True
+        if subsampling is not None and image.mode != "L":
+            save_kwargs["subsampling"] = subsampling
+    else:
+        save_kwargs["method"] = TARGET_WEBP_METHOD
+    image.save(output, **save_kwargs)
+    return output.getvalue()
+
+
+def ssim_score(reference: Image.Image, candidate: Image.Image, max_edge: int = SSIM_MAX_EDGE) -> float:
+    """Structural similarity (0-1, 1 = identical) of two images on downsampled grayscale copies
+
+    Statistics are taken over non-overlapping 8x8 blocks rather than a sliding Gaussian
+    window, which is close enough to rank encodes and cheap on large photos.
+    """
+    size = reference.size
+    if max(size) > max_edge:
+        ratio = max_edge / max(size)
+        size = (max(1, round(size[0] * ratio)), max(1, round(size[1] * ratio)))
+    a, b = (np.asarray(shrink(image.convert("L"), size, Image.Resampling.BOX) if image.size != size
+                       else image.convert("L"), dtype=np.float64) for image in (reference, candidate))
+
+    rows, cols = a.shape[0] // SSIM_BLOCK * SSIM_BLOCK, a.shape[1] // SSIM_BLOCK * SSIM_BLOCK
+    if not rows or not cols:
+        rows, cols = a.shape
+        blocks = 1, 1, rows, cols
+    else:
+        blocks = rows // SSIM_BLOCK, SSIM_BLOCK, cols // SSIM_BLOCK, SSIM_BLOCK
+    a = a[:rows, :cols].reshape(blocks)
+    b = b[:rows, :cols].reshape(blocks)
+
+    mean_a, mean_b = a.mean(axis=(1, 3)), b.mean(axis=(1, 3))
+    var_a, var_b = a.var(axis=(1, 3)), b.var(axis=(1, 3))
+    covariance = ((a - mean_a[:, None, :, None]) * (b - mean_b[:, None, :, None])).mean(axis=(1, 3))
+    c1, c2 = (0.01 * 255) ** 2, (0.03 * 255) ** 2
+    ssim = ((2 * mean_a * mean_b + c1) * (2 * covariance + c2)) / \
+           ((mean_a ** 2 + mean_b ** 2 + c1) * (var_a + var_b + c2))
+    return float(ssim.mean())
+
+
+def compress_to_target_size(uploaded_file, target_bytes: int, target_format: str = "JPEG",
+                            allow_resize: bool = True, allow_subsampling: bool = True,
+                            max_encodes: int = TARGET_MAX_ENCODES) -> Tuple[str, bytes, Dict[str, Any]]:
+    """Encode one image as JPEG or WEBP at the highest quality that fits in target_bytes
+
+    Quality is binary-searched with in-memory encodes, JPEG using 4:2:0 chroma subsampling
+    when allowed (4:4:4 otherwise). If even the lowest quality is too large and allow_resize
+    is set, the image is downscaled by the square root of the overshoot and searched again.
+    At most max_encodes encodes are spent; when nothing fits, the smallest one is returned.
+    Returns (filename, bytes, report) with the achieved size, quality, scale and SSIM.
+    """
+    if target_format not in ("JPEG", "WEBP"):
+        source_format = Image.open(uploaded_file).format
+        uploaded_file.seek(0)
+        target_format = "WEBP" if source_format == "WEBP" else "JPEG"
+
+    image = Image.open(uploaded_file)
+    image.load()
+    original = _flatten_for(image, target_format)
+    subsampling = None if target_format != "JPEG" else (2 if allow_subsampling else 0)
+
+    encodes = 0
+    scale = 1.0
+    working = original
+    best = None       # highest-quality encode that fits: (quality, scale, data, image)
+    smallest = None   # fallback when nothing fits
+    budget = max(2, max_encodes)
+
+    while encodes < budget and best is None:
+        low, high = TARGET_MIN_QUALITY, TARGET_MAX_QUALITY
+        quality = high
+        while low <= high and encodes < budget:
+            data = _encode(working, target_format, quality, subsampling)
+            encodes += 1
+            if smallest is None or len(data) < len(smallest[2]):
+                smallest = (quality, scale, data, working)
+            if len(data) <= target_bytes:
+                if best is None or quality > best[0]:
+                    best = (quality, scale, data, working)
+                low = quality + 1
+            else:
+                high = quality - 1
+                # Nothing at this scale fits once the lowest quality overshoots
+                if quality == TARGET_MIN_QUALITY:
+                    break
+                if best is None and quality == TARGET_MAX_QUALITY:
+                    quality = TARGET_MIN_QUALITY
+                    continue
+            quality = (low + high) // 2
+
+        if best is not None or not allow_resize or quality != TARGET_MIN_QUALITY:
+            break
+        # Encoded size grows roughly with pixel count
+        overshoot = len(smallest[2]) / target_bytes
+        scale *= min(0.9, 0.95 / math.sqrt(overshoot))
+        if scale < TARGET_MIN_SCALE:
+            break
+        new_size = (max(1, round(original.width * scale)), max(1, round(original.height * scale)))
+        working = shrink(original, new_size)
+
+    quality, scale, data, result = best or smallest
+    decoded = Image.open(io.BytesIO(data))
+    report = {
+        'file': uploaded_file.name,
+        'original_bytes': getattr(uploaded_file, 'size', None),
+        'target_bytes': target_bytes,
+        'bytes': len(data),
+        'fits': len(data) <= target_bytes,
+        'format': target_format,
+        'quality': quality,
+        'subsampling': {None: "", 0: "4:4:4", 2: "4:2:0"}[subsampling],
+        'scale': round(scale, 3),
+        'width': result.width,
+        'height': result.height,
+        'encodes': encodes,
+        'ssim': round(ssim_score(original, decoded), 4)
+    }
+
+    base_name = uploaded_file.name.rsplit('.', 1)[0]
+    return f"{base_name}_compressed.{target_format.lower()}", data, report
@@ -0,0 +1,213 @@
+import os
+import json
+import time
+import uuid
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Any, Callable, Optional
+
+# Worker threads shared by every session; CPU-heavy jobs can fan out further via utils.batch
+JOB_MAX_WORKERS = int(os.getenv("JOB_MAX_WORKERS", 4))
+
+# Finished jobs (and their results) are kept this long so reruns can pick them up
+JOB_RESULT_TTL = float(os.getenv("JOB_RESULT_TTL", 30 * 60))
+
+# Upper bound on retained jobs; the oldest finished ones are dropped first
+JOB_MAX_RETAINED = int(os.getenv("JOB_MAX_RETAINED", 200))
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+FINISHED_STATES = {DONE, FAILED, CANCELLED}
+
+
+class JobCancelled(Exception):
+    """Raised inside a job function when cancellation has been requested"""
+
+
+def job_key(*parts: Any) -> str:
+    """Build a stable key from job inputs (bytes, strings or JSON-serializable values)"""
+    hasher = hashlib.sha256()
+    for part in parts:
+        if isinstance(part, (bytes, bytearray, memoryview)):
+            hasher.update(b'b')
+            hasher.update(part)
+        else:
+            hasher.update(b'j')
+            hasher.update(json.dumps(part, sort_keys=True, default=str).encode('utf-8'))
+        hasher.update(b'\x00')
+    return hasher.hexdigest()
+
+
+class Job:
+    """State of one background job; workers report progress through update()"""
+
+    def __init__(self, name: str, key: Optional[str] = None):
+        self.id = uuid.uuid4().hex
+        self.name = name
+        self.key = key
+        self.status = QUEUED
+        self.progress: Optional[float] = None
+        self.message = ""
+        self.partial: Any = None
+        self.result: Any = None
+        self.error: Optional[str] = None
+        self.submitted_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.future = None
+        self._cancel_event = threading.Event()
+
+    def update(self, progress: Optional[float] = None, message: Optional[str] = None, partial: Any = None):
+        """Report progress (0-1), a status message and/or a partial result"""
+        if progress is not None:
+            self.progress = max(0.0, min(1.0, progress))
+        if message is not None:
+            self.message = message
+        if partial is not None:
+            self.partial = partial
+
+    @property
+    def cancel_requested(self) -> bool:
+        return self._cancel_event.is_set()
+
+    def check_cancelled(self):
+        """Stop the job at a safe point if the user cancelled it"""
+        if self._cancel_event.is_set():
+            raise JobCancelled()
+
+    @property
+    def finished(self) -> bool:
+        return self.status in FINISHED_STATES
+
+    @property
+    def elapsed(self) -> float:
+        if self.started_at is None:
+            return 0.0
+        return (self.finished_at or time.time()) - self.started_at
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'id': self.id,
+            'name': self.name,
+            'status': self.status,
+            'progress': self.progress,
+            'message': self.message,
+            'error': self.error,
+            'queued_seconds': ((self.started_at or time.time()) - self.submitted_at),
+            'elapsed_seconds': self.elapsed
+        }
+
+
+class JobManager:
+    """Process-wide background job runner with a bounded pool and TTL-based result eviction"""
+
+    def __init__(self, max_workers: int = JOB_MAX_WORKERS, result_ttl: float = JOB_RESULT_TTL,
+                 max_retained: int = JOB_MAX_RETAINED):
+        self.result_ttl = result_ttl
+        self.max_retained = max_retained
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="job")
+        self._jobs: Dict[str, Job] = {}
+        self._keys: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, func: Callable, *args, name: str = "job", key: Optional[str] = None, **kwargs) -> Job:
+        """Run func(job, *args, **kwargs) in the background
+
+        When key is given and a queued, running or successfully finished job with the same
+        key still exists, that job is returned instead of starting the work again.
+        """
+        with self._lock:
+            self._evict()
+            if key is not None:
+                existing = self._jobs.get(self._keys.get(key))
+                if existing is not None and existing.status not in (FAILED, CANCELLED):
+                    return existing
+
+            job = Job(name, key)
+            self._jobs[job.id] = job
+            if key is not None:
+                self._keys[key] = job.id
+            job.future = self._executor.submit(self._run, job, func, args, kwargs)
+        return job
+
+    def _run(self, job: Job, func: Callable, args: tuple, kwargs: dict):
+        if job.cancel_requested:
+            self._finish(job, CANCELLED)
+            return
+        job.status = RUNNING
+        job.started_at = time.time()
+        try:
+            job.result = func(job, *args, **kwargs)
+        except JobCancelled:
+            self._finish(job, CANCELLED)
+        except Exception as e:
+            job.error = str(e)
+            self._finish(job, FAILED)
+        else:
+            job.progress = 1.0
+            self._finish(job, DONE)
+
+    @staticmethod
+    def _finish(job: Job, status: str):
+        job.finished_at = time.time()
+        job.status = status
+
+    def get(self, job_id: Optional[str]) -> Optional[Job]:
+        """Return a job by id, or None if it never existed or has expired"""
+        if not job_id:
+            return None
+        with self._lock:
+            self._evict()
+            return self._jobs.get(job_id)
+
+    def find(self, key: str) -> Optional[Job]:
+        """Return the most recent job submitted under key"""
+        with self._lock:
+            self._evict()
+            return self._jobs.get(self._keys.get(key))
+
+    def cancel(self, job_id: str) -> bool:
+        """Request cancellation; queued jobs never start and running jobs stop at their next check"""
+        job = self.get(job_id)
+        if job is None or job.finished:
+            return False
+        job._cancel_event.set()
+        if job.future is not None and job.future.cancel():
+            self._finish(job, CANCELLED)
+        return True
+
+    def _evict(self):
+        """Drop expired finished jobs, then the oldest finished ones beyond max_retained"""
+        now = time.time()
+        expired = [job_id for job_id, job in self._jobs.items()
+                   if job.finished and now - job.finished_at > self.result_ttl]
+        finished = sorted((job for job in self._jobs.values() if job.finished and job.id not in expired),
+                          key=lambda job: job.finished_at)
+        overflow = len(self._jobs) - len(expired) - self.max_retained
+        if overflow > 0:
+            expired += [job.id for job in finished[:overflow]]
+
+        for job_id in expired:
+            job = self._jobs.pop(job_id)
+            if job.key is not None and self._keys.get(job.key) == job_id:
+                del self._keys[job.key]
+
+    def list_jobs(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            self._evict()
+            return [job.to_dict() for job in self._jobs.values()]
+
+    def get_stats(self) -> Dict[str, int]:
+        """Count retained jobs by status"""
+        stats = {state: 0 for state in (QUEUED, RUNNING, DONE, FAILED, CANCELLED)}
+        for job in self.list_jobs():
+            stats[job['status']] += 1
+        return stats
+
+
+# Global job manager instance
+job_manager = JobManager()
@@ -0,0 +1,264 @@
+import os
+import io
+import json
+import time
+import random
+import hashlib
+import threading
+from types import SimpleNamespace
+from typing import Optional, Dict, Any, List
+
+LATENCY_DISTRIBUTIONS = ["fixed", "uniform", "normal", "lognormal"]
+
+DEFAULT_TEMPLATE = "[{model}] Simulated response to: {prompt_excerpt}\n\n{body}"
+
+_FILLER_WORDS = [
+    "the", "toolkit", "processes", "data", "quickly", "and", "returns", "clear", "results", "for",
+    "every", "request", "while", "keeping", "output", "stable", "across", "runs", "with", "useful",
+    "insights", "about", "content", "quality", "structure", "performance", "and", "clarity"
+]
+
+
+class LocalProviderError(Exception):
+    """Injected provider failure carrying an HTTP-style status code"""
+
+    def __init__(self, status_code: int, message: str = "Injected local provider error"):
+        super().__init__(f"{status_code}: {message}")
+        self.status_code = status_code
+
+
+class LocalProviderConfig:
+    """Latency, streaming and error-injection settings for the local stand-in provider"""
+
+    def __init__(self, latency_ms: float = 800.0, latency_jitter_ms: float = 200.0,
+                 latency_distribution: str = "normal", chunk_words: int = 3, chunk_interval_ms: float = 30.0,
+                 error_rate: float = 0.0, error_status_codes: Optional[List[int]] = None,
+                 response_words: int = 120, seed: int = 0, template: str = DEFAULT_TEMPLATE,
+                 canned_responses: Optional[Dict[str, str]] = None):
+        if latency_distribution not in LATENCY_DISTRIBUTIONS:
+            raise ValueError(f"Unknown latency distribution: {latency_distribution}")
+        self.latency_ms = latency_ms
+        self.latency_jitter_ms = latency_jitter_ms
+        self.latency_distribution = latency_distribution
+        self.chunk_words = max(1, chunk_words)
+        self.chunk_interval_ms = chunk_interval_ms
+        self.error_rate = error_rate
+        self.error_status_codes = error_status_codes or [429, 503]
+        self.response_words = response_words
+        self.seed = seed
+        self.template = template
+        self.canned_responses = canned_responses or {}
+
+    @classmethod
+    def from_env(cls) -> "LocalProviderConfig":
+        """Build a configuration from AI_LOCAL_* environment variables"""
+        canned = {}
+        responses_path = os.getenv("AI_LOCAL_RESPONSES")
+        if responses_path:
+            with open(responses_path, 'r', encoding='utf-8') as responses_file:
+                canned = json.load(responses_file)
+
+        error_codes = os.getenv("AI_LOCAL_ERROR_CODES", "429,503")
+        return cls(
+            latency_ms=float(os.getenv("AI_LOCAL_LATENCY_MS", 800)),
+            latency_jitter_ms=float(os.getenv("AI_LOCAL_LATENCY_JITTER_MS", 200)),
+            latency_distribution=os.getenv("AI_LOCAL_LATENCY_DIST", "normal"),
+            chunk_words=int(os.getenv("AI_LOCAL_CHUNK_WORDS", 3)),
+            chunk_interval_ms=float(os.getenv("AI_LOCAL_CHUNK_MS", 30)),
+            error_rate=float(os.getenv("AI_LOCAL_ERROR_RATE", 0.0)),
+            error_status_codes=[int(code) for code in error_codes.split(',') if code.strip()],
+            response_words=int(os.getenv("AI_LOCAL_RESPONSE_WORDS", 120)),
+            seed=int(os.getenv("AI_LOCAL_SEED", 0)),
+            canned_responses=canned
+        )
+
+
+class LocalBackend:
+    """Deterministic response generator shared by the Gemini- and OpenAI-shaped stand-ins"""
+
+    def __init__(self, config: LocalProviderConfig):
+        self.config = config
+        self._rng = random.Random(config.seed)
+        self._lock = threading.Lock()
+        self.stats = {'requests': 0, 'injected_errors': 0, 'simulated_latency_seconds': 0.0}
+
+    def _draw_latency(self) -> float:
+        config = self.config
+        with self._lock:
+            if config.latency_distribution == "fixed":
+                latency_ms = config.latency_ms
+            elif config.latency_distribution == "uniform":
+                latency_ms = self._rng.uniform(config.latency_ms - config.latency_jitter_ms,
+                                               config.latency_ms + config.latency_jitter_ms)
+            elif config.latency_distribution == "normal":
+                latency_ms = self._rng.gauss(config.latency_ms, config.latency_jitter_ms)
+            else:
+                # Long-tailed: median at latency_ms, jitter controls the spread
+                sigma = config.latency_jitter_ms / config.latency_ms if config.latency_ms else 0.0
+                latency_ms = config.latency_ms * self._rng.lognormvariate(0.0, sigma)
+        return max(0.0, latency_ms) / 1000.0
+
+    def _maybe_fail(self):
+        with self._lock:
+            failed = self._rng.random() < self.config.error_rate
+            status_code = self._rng.choice(self.config.error_status_codes) if failed else None
+            if failed:
+                self.stats['injected_errors'] += 1
+        if failed:
+            raise LocalProviderError(status_code)
+
+    def begin_request(self):
+        """Simulate time to first byte, then possibly inject a failure"""
+        latency = self._draw_latency()
+        with self._lock:
+            self.stats['requests'] += 1
+            self.stats['simulated_latency_seconds'] += latency
+        time.sleep(latency)
+        self._maybe_fail()
+
+    def respond(self, model: str, prompt: str) -> str:
+        """Return the canned response matching the prompt, or a deterministic templated one"""
+        for keyword, response in self.config.canned_responses.items():
+            if keyword.lower() in prompt.lower():
+                return response
+
+        digest = hashlib.sha256(f"{model}\x00{prompt}".encode('utf-8')).hexdigest()
+        words_rng = random.Random(int(digest[:16], 16))
+        words = [words_rng.choice(_FILLER_WORDS) for _ in range(self.config.response_words)]
+        body = " ".join(words).capitalize() + "."
+        excerpt = prompt.strip().replace("\n", " ")[:80]
+        return self.config.template.format(model=model, prompt=prompt, prompt_excerpt=excerpt,
+                                           digest=digest[:12], body=body)
+
+    def respond_json(self, prompt: str) -> str:
+        """Return a deterministic sentiment-style JSON document"""
+        digest = int(hashlib.sha256(prompt.encode('utf-8')).hexdigest()[:8], 16)
+        sentiment = ["positive", "negative", "neutral"][digest % 3]
+        return json.dumps({
+            "sentiment": sentiment,
+            "confidence": round(0.5 + (digest % 50) / 100, 2),
+            "indicators": [f"simulated {sentiment} indicator"],
+            "explanation": "Simulated analysis from the local provider."
+        })
+
+    def respond_image(self, prompt: str) -> bytes:
+        """Return a small PNG whose color is derived from the prompt"""
+        from PIL import Image
+
+        digest = hashlib.sha256(prompt.encode('utf-8')).digest()
+        image = Image.new("RGB", (256, 256), tuple(digest[:3]))
+        buffer = io.BytesIO()
+        image.save(buffer, format="PNG")
+        return buffer.getvalue()
+
+    def stream(self, text: str):
+        """Yield text in word chunks spaced by the configured chunk interval"""
+        words = text.split(" ")
+        step = self.config.chunk_words
+        for i in range(0, len(words), step):
+            if i:
+                time.sleep(self.config.chunk_interval_ms / 1000.0)
+            chunk = " ".join(words[i:i + step])
+            yield chunk if i + step >= len(words) else chunk + " "
+
+
+class _GenerateContentConfig(SimpleNamespace):
+    """Keyword-only stand-in for google.genai.types.GenerateContentConfig"""
+
+
+class _Part(SimpleNamespace):
+    """Stand-in for google.genai.types.Part"""
+
+    @classmethod
+    def from_bytes(cls, data: bytes, mime_type: str):
+        return cls(data=data, mime_type=mime_type)
+
+
+# Minimal replacement for google.genai.types so the local backend runs without the SDK
+genai_types = SimpleNamespace(GenerateContentConfig=_GenerateContentConfig, Part=_Part)
+
+
+def _prompt_text(contents) -> str:
+    """Flatten Gemini-style contents (string or list of parts) into prompt text"""
+    if isinstance(contents, str):
+        return contents
+    if isinstance(contents, list):
+        return "\n".join(part for part in contents if isinstance(part, str))
+    return str(contents)
+
+
+class _LocalGeminiModels:
+    def __init__(self, backend: LocalBackend):
+        self._backend = backend
+
+    def generate_content(self, model: str, contents, config=None):
+        self._backend.begin_request()
+        prompt = _prompt_text(contents)
+
+        modalities = getattr(config, 'response_modalities', None) or []
+        if 'IMAGE' in modalities:
+            part = SimpleNamespace(inline_data=SimpleNamespace(data=self._backend.respond_image(prompt)))
+            return SimpleNamespace(text=None, candidates=[SimpleNamespace(content=SimpleNamespace(parts=[part]))])
+
+        if getattr(config, 'response_mime_type', None) == "application/json":
+            return SimpleNamespace(text=self._backend.respond_json(prompt), candidates=[])
+
+        return SimpleNamespace(text=self._backend.respond(model, prompt), candidates=[])
+
+    def generate_content_stream(self, model: str, contents, config=None):
+        self._backend.begin_request()
+        text = self._backend.respond(model, _prompt_text(contents))
+        for chunk in self._backend.stream(text):
+            yield SimpleNamespace(text=chunk)
+
+
+class LocalGeminiClient:
+    """Stand-in for google.genai.Client exposing the models API the toolkit uses"""
+
+    def __init__(self, backend: LocalBackend):
+        self.models = _LocalGeminiModels(backend)
+
+
+class _LocalChatCompletions:
+    def __init__(self, backend: LocalBackend):
+        self._backend = backend
+
+    def create(self, model: str, messages: List[Dict[str, Any]], stream: bool = False,
+               response_format: Optional[Dict[str, Any]] = None, **kwargs):
+        self._backend.begin_request()
+        prompt_parts = []
+        for message in messages:
+            content = message.get('content')
+            if isinstance(content, list):
+                prompt_parts.extend(part.get('text', '') for part in content if part.get('type') == 'text')
+            elif content:
+                prompt_parts.append(content)
+        prompt = "\n".join(prompt_parts)
+
+        if response_format and response_format.get('type') == 'json_object':
+            text = self._backend.respond_json(prompt)
+        else:
+            text = self._backend.respond(model, prompt)
+
+        if stream:
+            return (
+                SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=chunk))])
+                for chunk in self._backend.stream(text)
+            )
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=text))])
+
+
+class _LocalImages:
+    def __init__(self, backend: LocalBackend):
+        self._backend = backend
+
+    def generate(self, model: str, prompt: str, **kwargs):
+        raise LocalProviderError(501, "Image URLs are not served by the local provider; use the gemini model")
+
+
+class LocalOpenAIClient:
+    """Stand-in for openai.OpenAI exposing chat completions and images"""
+
+    def __init__(self, backend: LocalBackend):
+        self.chat = SimpleNamespace(completions=_LocalChatCompletions(backend))
+        self.images = _LocalImages(backend)
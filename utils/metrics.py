@@ -0,0 +1,274 @@
+import os
+import sys
+import time
+import threading
+import functools
+import contextvars
+import tracemalloc
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, List, Any, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# "rss" records growth of the process high-water mark (cheap), "tracemalloc" records the
+# Python heap peak of each call (precise but slows allocation-heavy code), "off" disables it
+MEMORY_TRACKING = os.getenv("METRICS_MEMORY", "rss")
+
+# Samples kept per name for percentile estimates; counters and sums are never truncated
+MAX_SAMPLES = int(os.getenv("METRICS_MAX_SAMPLES", 2048))
+
+# When set, the Prometheus text exposition is rewritten here at most every METRICS_DUMP_INTERVAL seconds
+METRICS_DUMP_PATH = os.getenv("METRICS_DUMP_PATH")
+METRICS_DUMP_INTERVAL = float(os.getenv("METRICS_DUMP_INTERVAL", 15))
+
+QUANTILES = [0.5, 0.95, 0.99]
+
+_series: Dict[tuple, Dict[str, Any]] = {}
+_lock = threading.Lock()
+_last_dump = 0.0
+_tracemalloc_users = 0
+_current_invocation: contextvars.ContextVar = contextvars.ContextVar("metrics_invocation", default=None)
+
+
+def _rss_high_water_bytes() -> int:
+    if resource is None:
+        return 0
+    usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is kilobytes on Linux and bytes on macOS
+    return usage if sys.platform == "darwin" else usage * 1024
+
+
+def _start_memory_tracking():
+    global _tracemalloc_users
+    if MEMORY_TRACKING == "rss":
+        return _rss_high_water_bytes()
+    if MEMORY_TRACKING == "tracemalloc":
+        with _lock:
+            if _tracemalloc_users == 0 and not tracemalloc.is_tracing():
+                tracemalloc.start()
+            _tracemalloc_users += 1
+        tracemalloc.reset_peak()
+        return tracemalloc.get_traced_memory()[0]
+    return None
+
+
+def _stop_memory_tracking(baseline) -> Optional[int]:
+    global _tracemalloc_users
+    if baseline is None:
+        return None
+    if MEMORY_TRACKING == "rss":
+        return max(0, _rss_high_water_bytes() - baseline)
+
+    peak = tracemalloc.get_traced_memory()[1]
+    with _lock:
+        _tracemalloc_users -= 1
+        if _tracemalloc_users == 0:
+            tracemalloc.stop()
+    return max(0, peak - baseline)
+
+
+def record(name: str, kind: str, wall_seconds: float, cpu_seconds: float,
+           peak_memory_bytes: Optional[int] = None, error: bool = False):
+    """Add one invocation sample to the process-wide registry"""
+    key = (kind, name)
+    with _lock:
+        series = _series.get(key)
+        if series is None:
+            series = {
+                'count': 0,
+                'errors': 0,
+                'wall_sum': 0.0,
+                'cpu_sum': 0.0,
+                'peak_memory_max': 0,
+                'wall_samples': deque(maxlen=MAX_SAMPLES),
+                'memory_samples': deque(maxlen=MAX_SAMPLES),
+                'last_seen': 0.0
+            }
+            _series[key] = series
+
+        series['count'] += 1
+        series['errors'] += int(error)
+        series['wall_sum'] += wall_seconds
+        series['cpu_sum'] += cpu_seconds
+        series['wall_samples'].append(wall_seconds)
+        if peak_memory_bytes is not None:
+            series['memory_samples'].append(peak_memory_bytes)
+            series['peak_memory_max'] = max(series['peak_memory_max'], peak_memory_bytes)
+        series['last_seen'] = time.time()
+
+
+class Invocation:
+    """A running measurement; its name can be refined once the tool being run is known"""
+
+    def __init__(self, name: str, kind: str):
+        self.name = name
+        self.kind = kind
+
+
+@contextmanager
+def measure(name: str, kind: str = "helper"):
+    """Record wall time, CPU time and peak memory for the enclosed block
+
+    CPU time is that of the calling thread, so work handed to thread or process pools
+    shows up in wall time only. Control-flow exceptions such as Streamlit reruns are
+    recorded as normal completions.
+    """
+    invocation = Invocation(name, kind)
+    token = _current_invocation.set(invocation)
+    memory_baseline = _start_memory_tracking()
+    wall_start = time.perf_counter()
+    cpu_start = time.thread_time()
+    failed = False
+    try:
+        yield invocation
+    except Exception:
+        failed = True
+        raise
+    finally:
+        wall_seconds = time.perf_counter() - wall_start
+        cpu_seconds = time.thread_time() - cpu_start
+        peak_memory = _stop_memory_tracking(memory_baseline)
+        _current_invocation.reset(token)
+        record(invocation.name, invocation.kind, wall_seconds, cpu_seconds, peak_memory, failed)
+        maybe_dump_metrics()
+
+
+def label_invocation(name: str, kind: str = "tool"):
+    """Attribute the enclosing measurement (e.g. a category dispatch) to a specific tool"""
+    invocation = _current_invocation.get()
+    if invocation is not None:
+        invocation.name = name
+        invocation.kind = kind
+
+
+def instrument(name: Optional[str] = None, kind: str = "helper"):
+    """Decorator that measures every call of the wrapped function"""
+    def decorator(func):
+        metric_name = name or f"{func.__module__}.{func.__qualname__}"
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with measure(metric_name, kind):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def _quantile(sorted_values: List[float], q: float) -> float:
+    """Nearest-rank quantile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+
+def _snapshot() -> List[tuple]:
+    with _lock:
+        return [(kind, name, dict(series, wall_samples=sorted(series['wall_samples']),
+                                  memory_samples=sorted(series['memory_samples'])))
+                for (kind, name), series in _series.items()]
+
+
+def get_metrics_summary() -> List[Dict[str, Any]]:
+    """Per tool/helper table of call counts, latency percentiles, CPU and peak memory"""
+    rows = []
+    for kind, name, series in _snapshot():
+        walls = series['wall_samples']
+        rows.append({
+            'Name': name,
+            'Kind': kind,
+            'Calls': series['count'],
+            'Errors': series['errors'],
+            'p50 (ms)': round(_quantile(walls, 0.5) * 1000, 1),
+            'p95 (ms)': round(_quantile(walls, 0.95) * 1000, 1),
+            'p99 (ms)': round(_quantile(walls, 0.99) * 1000, 1),
+            'Mean CPU (ms)': round(series['cpu_sum'] / series['count'] * 1000, 1),
+            'Peak Memory p95 (MB)': round(_quantile(series['memory_samples'], 0.95) / (1024 * 1024), 2),
+            'Peak Memory Max (MB)': round(series['peak_memory_max'] / (1024 * 1024), 2)
+        })
+    rows.sort(key=lambda row: -row['p95 (ms)'])
+    return rows
+
+
+def _escape_label(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def render_prometheus() -> str:
+    """Render all series in the Prometheus text exposition format"""
+    snapshot = sorted(_snapshot(), key=lambda item: (item[0], item[1]))
+    lines = [
+        "# HELP toolkit_invocation_seconds Wall time of tool and helper invocations",
+        "# TYPE toolkit_invocation_seconds summary"
+    ]
+    for kind, name, series in snapshot:
+        labels = f'name="{_escape_label(name)}",kind="{kind}"'
+        for q in QUANTILES:
+            lines.append(f'toolkit_invocation_seconds{{{labels},quantile="{q}"}} '
+                         f'{_quantile(series["wall_samples"], q):.6f}')
+        lines.append(f'toolkit_invocation_seconds_sum{{{labels}}} {series["wall_sum"]:.6f}')
+        lines.append(f'toolkit_invocation_seconds_count{{{labels}}} {series["count"]}')
+
+    lines += [
+        "# HELP toolkit_invocation_cpu_seconds_total CPU time of the invoking thread",
+        "# TYPE toolkit_invocation_cpu_seconds_total counter"
+    ]
+    for kind, name, series in snapshot:
+        lines.append(f'toolkit_invocation_cpu_seconds_total{{name="{_escape_label(name)}",kind="{kind}"}} '
+                     f'{series["cpu_sum"]:.6f}')
+
+    lines += [
+        "# HELP toolkit_invocation_errors_total Invocations that raised an exception",
+        "# TYPE toolkit_invocation_errors_total counter"
+    ]
+    for kind, name, series in snapshot:
+        lines.append(f'toolkit_invocation_errors_total{{name="{_escape_label(name)}",kind="{kind}"}} '
+                     f'{series["errors"]}')
+
+    lines += [
+        f"# HELP toolkit_invocation_peak_memory_bytes Largest per-invocation memory peak ({MEMORY_TRACKING})",
+        "# TYPE toolkit_invocation_peak_memory_bytes gauge"
+    ]
+    for kind, name, series in snapshot:
+        lines.append(f'toolkit_invocation_peak_memory_bytes{{name="{_escape_label(name)}",kind="{kind}"}} '
+                     f'{series["peak_memory_max"]}')
+
+    return "\n".join(lines) + "\n"
+
+
+def write_metrics_file(path: str):
+    """Atomically write the Prometheus exposition to path (e.g. for a textfile collector)"""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, 'w', encoding='utf-8') as metrics_file:
+        metrics_file.write(render_prometheus())
+    os.replace(temp_path, path)
+
+
+def maybe_dump_metrics():
+    """Rewrite METRICS_DUMP_PATH if it is configured and the dump interval has passed"""
+    global _last_dump
+    if not METRICS_DUMP_PATH:
+        return
+    now = time.monotonic()
+    with _lock:
+        if now - _last_dump < METRICS_DUMP_INTERVAL:
+            return
+        _last_dump = now
+    try:
+        write_metrics_file(METRICS_DUMP_PATH)
+    except OSError:
+        pass
+
+
+def reset_metrics():
+    """Forget every recorded series"""
+    with _lock:
+        _series.clear()
@@ -0,0 +1,76 @@
+import io
+import os
+from typing import Tuple
+
+from PIL import Image
+
+from utils.result_cache import cached_result
+
+# Longest edge, in pixels, of the proxies shown while a tool is being adjusted
+PREVIEW_MAX_EDGE = int(os.getenv("PREVIEW_MAX_EDGE", 1280))
+
+PREVIEW_JPEG_QUALITY = 85
+
+
+class Preview:
+    """Screen-sized stand-in for an uploaded image
+
+    `image` is the downscaled proxy for interactive operations, `data` is its encoded
+    form for st.image (so reruns don't re-encode), and `scale` maps full-resolution
+    measurements onto the proxy. Previews are shared between sessions through the
+    result cache, so callers must copy `image` before drawing on it.
+    """
+
+    def __init__(self, image: Image.Image, data: bytes, full_size: Tuple[int, int], source_format: str):
+        self.image = image
+        self.data = data
+        self.full_size = full_size
+        self.format = source_format
+        self.scale = image.width / full_size[0] if full_size[0] else 1.0
+
+    @property
+    def width(self) -> int:
+        return self.full_size[0]
+
+    @property
+    def height(self) -> int:
+        return self.full_size[1]
+
+    def to_preview(self, value: float) -> int:
+        """Convert a full-resolution length or coordinate to proxy pixels"""
+        return int(round(value * self.scale))
+
+
+def _encode_for_display(image: Image.Image) -> bytes:
+    output = io.BytesIO()
+    if image.mode in ("RGB", "L"):
+        image.save(output, format="JPEG", quality=PREVIEW_JPEG_QUALITY)
+    else:
+        image.save(output, format="PNG", compress_level=1)
+    return output.getvalue()
+
+
+def fit_for_display(image: Image.Image, max_edge: int = PREVIEW_MAX_EDGE) -> Image.Image:
+    """Downscaled copy of a processed image for on-screen display; the original is left untouched"""
+    if max(image.size) <= max_edge:
+        return image
+    display = image.copy()
+    display.thumbnail((max_edge, max_edge), Image.Resampling.BILINEAR)
+    return display
+
+
+@cached_result()
+def get_preview(uploaded_file, max_edge: int = PREVIEW_MAX_EDGE) -> Preview:
+    """Build (once per distinct upload content) a preview proxy of an uploaded image"""
+    uploaded_file.seek(0)
+    image = Image.open(uploaded_file)
+    full_size = image.size
+    source_format = image.format
+    # JPEGs can decode straight to a reduced scale, skipping most of the full-size work
+    image.draft(image.mode, (max_edge, max_edge))
+    if image.mode not in ("RGB", "RGBA", "L", "LA"):
+        image = image.convert("RGBA" if "transparency" in image.info or image.mode == "PA" else "RGB")
+    proxy = image.copy()
+    proxy.thumbnail((max_edge, max_edge), Image.Resampling.LANCZOS)
+    uploaded_file.seek(0)
+    return Preview(proxy, _encode_for_display(proxy), full_size, source_format)
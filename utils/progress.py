@@ -0,0 +1,123 @@
+import time
+import threading
+from typing import Callable, Optional
+
+# UI refreshes per second; progress reported faster than this is coalesced
+DEFAULT_PROGRESS_FPS = 10.0
+
+
+class ProgressTracker:
+    """Thread-safe work-unit counter that renders at most `fps` times per second
+
+    Any thread may call advance()/update(). By default render() only runs on the thread
+    that created the tracker (Streamlit elements belong to the script thread); updates
+    from pool workers are picked up on that thread's next advance(), refresh() or
+    finish(). Pass render_any_thread=True for renderers that are safe to call anywhere.
+    """
+
+    def __init__(self, total: Optional[float] = None, label: str = "", unit: str = "items",
+                 render: Optional[Callable[["ProgressTracker"], None]] = None,
+                 fps: float = DEFAULT_PROGRESS_FPS, render_any_thread: bool = False):
+        self.total = total
+        self.label = label
+        self.unit = unit
+        self.completed = 0.0
+        self.message = ""
+        self.started_at = time.perf_counter()
+        self._render = render
+        self._interval = 1.0 / fps if fps > 0 else 0.0
+        self._owner = None if render_any_thread else threading.get_ident()
+        self._last_render = 0.0
+        self._finished = False
+        self._lock = threading.Lock()
+
+    @property
+    def fraction(self) -> Optional[float]:
+        if not self.total:
+            return None
+        return min(1.0, self.completed / self.total)
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started_at
+
+    @property
+    def rate(self) -> float:
+        """Units completed per second so far"""
+        elapsed = self.elapsed
+        return self.completed / elapsed if elapsed > 0 else 0.0
+
+    @property
+    def eta(self) -> Optional[float]:
+        """Estimated seconds remaining, once there is a rate to extrapolate from"""
+        rate = self.rate
+        if not self.total or rate <= 0:
+            return None
+        return max(0.0, (self.total - self.completed) / rate)
+
+    def advance(self, units: float = 1, message: Optional[str] = None):
+        """Record units of completed work"""
+        with self._lock:
+            self.completed += units
+            if message is not None:
+                self.message = message
+        self.refresh()
+
+    def update(self, completed: float, message: Optional[str] = None):
+        """Set the absolute amount of completed work"""
+        with self._lock:
+            self.completed = completed
+            if message is not None:
+                self.message = message
+        self.refresh()
+
+    def set_total(self, total: Optional[float]):
+        with self._lock:
+            self.total = total
+        self.refresh()
+
+    def refresh(self, force: bool = False):
+        """Render if a frame is due and this thread is allowed to render"""
+        if self._render is None or self._finished:
+            return
+        if self._owner is not None and threading.get_ident() != self._owner:
+            return
+        now = time.perf_counter()
+        with self._lock:
+            if not force and now - self._last_render < self._interval:
+                return
+            self._last_render = now
+        self._render(self)
+
+    def finish(self, message: Optional[str] = None):
+        """Render the final state once; later updates are ignored"""
+        with self._lock:
+            if self.total is not None:
+                self.completed = self.total
+            if message is not None:
+                self.message = message
+        self.refresh(force=True)
+        self._finished = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.finish()
+        else:
+            self.refresh(force=True)
+            self._finished = True
+
+    def describe(self) -> str:
+        """One-line summary such as 'Converting: 3/10 files (1.2 files/s, ~6s left)'"""
+        if self.total:
+            counts = f"{self.completed:,.0f}/{self.total:,.0f} {self.unit}"
+        else:
+            counts = f"{self.completed:,.0f} {self.unit}"
+        details = f"{self.rate:,.1f} {self.unit}/s"
+        eta = self.eta
+        if eta is not None and not self._finished and self.completed < (self.total or 0):
+            details += f", ~{eta:.0f}s left"
+        text = f"{self.label}: {counts} ({details})" if self.label else f"{counts} ({details})"
+        return f"{text} - {self.message}" if self.message else text
@@ -0,0 +1,111 @@
+import time
+import threading
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, Any, Optional
+
+# HTTP statuses worth retrying: throttling and transient upstream failures
+RETRYABLE_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504}
+
+
+def get_status_code(error: BaseException):
+    """Pull an HTTP status code out of a provider SDK or requests exception, if it has one"""
+    for attribute in ('status_code', 'code', 'status'):
+        value = getattr(error, attribute, None)
+        if isinstance(value, int):
+            return value
+    response = getattr(error, 'response', None)
+    value = getattr(response, 'status_code', None)
+    return value if isinstance(value, int) else None
+
+
+def is_retryable_error(error: BaseException) -> bool:
+    """Decide whether a failed provider call is worth retrying"""
+    status_code = get_status_code(error)
+    if status_code is not None:
+        return status_code in RETRYABLE_STATUS_CODES
+
+    # SDK connection/timeout errors carry no status code; match them by type name
+    name = type(error).__name__.lower()
+    return isinstance(error, (ConnectionError, TimeoutError)) or any(
+        marker in name for marker in ('timeout', 'connection', 'ratelimit', 'unavailable')
+    )
+
+
+class TokenBucket:
+    """Thread-safe token bucket that blocks callers until a token is available"""
+
+    def __init__(self, rate_per_second: float, capacity: float):
+        self.rate = rate_per_second
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """Take one token, sleeping as needed; returns the seconds spent waiting"""
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+                self.updated_at = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return waited
+                delay = (1 - self.tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+
+class ProviderLimiter:
+    """Request-rate and concurrency limits for one AI provider, with queue-wait metrics"""
+
+    def __init__(self, requests_per_minute: float, max_concurrent: int, burst: Optional[float] = None):
+        self.bucket = TokenBucket(requests_per_minute / 60.0, burst or max(1.0, requests_per_minute / 10.0))
+        self.slots = threading.BoundedSemaphore(max_concurrent)
+        self._lock = threading.Lock()
+        self._recent_waits = deque(maxlen=500)
+        self.stats = {
+            'requests': 0,
+            'retries': 0,
+            'failures': 0,
+            'wait_seconds_total': 0.0,
+            'wait_seconds_max': 0.0
+        }
+
+    @contextmanager
+    def slot(self):
+        """Hold a concurrency slot and a rate token for the duration of one request"""
+        started = time.perf_counter()
+        self.slots.acquire()
+        try:
+            self.bucket.acquire()
+            self._record_wait(time.perf_counter() - started)
+            yield
+        finally:
+            self.slots.release()
+
+    def _record_wait(self, waited: float):
+        with self._lock:
+            self.stats['requests'] += 1
+            self.stats['wait_seconds_total'] += waited
+            self.stats['wait_seconds_max'] = max(self.stats['wait_seconds_max'], waited)
+            self._recent_waits.append(waited)
+
+    def record_retry(self):
+        with self._lock:
+            self.stats['retries'] += 1
+
+    def record_failure(self):
+        with self._lock:
+            self.stats['failures'] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return counters plus mean and p95 queue wait over recent requests"""
+        with self._lock:
+            stats = dict(self.stats)
+            waits = sorted(self._recent_waits)
+        stats['wait_seconds_mean'] = stats['wait_seconds_total'] / stats['requests'] if stats['requests'] else 0.0
+        stats['wait_seconds_p95'] = waits[min(len(waits) - 1, int(len(waits) * 0.95))] if waits else 0.0
+        return stats
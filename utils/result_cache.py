@@ -0,0 +1,149 @@
+import os
+import json
+import pickle
+import hashlib
+import inspect
+import functools
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Iterable, Optional
+
+import numpy as np
+from PIL import Image
+
+from utils.tiered_cache import TieredCache
+
+# Memory budget for cached tool results, shared by every session in the process
+RESULT_CACHE_MAX_BYTES = int(os.getenv("RESULT_CACHE_MAX_BYTES", 256 * 1024 * 1024))
+
+# Seconds a result stays valid; 0 keeps entries until they are evicted by the byte budget
+RESULT_CACHE_TTL = float(os.getenv("RESULT_CACHE_TTL", 0))
+
+# Optional directory for a pickled disk tier that survives restarts (only point it at trusted storage)
+RESULT_CACHE_DIR = os.getenv("RESULT_CACHE_DIR")
+RESULT_CACHE_MAX_DISK_BYTES = int(os.getenv("RESULT_CACHE_MAX_DISK_BYTES", 1024 * 1024 * 1024))
+
+_HASH_CHUNK_SIZE = 1024 * 1024
+
+# Digests of uploads already hashed, by Streamlit file_id, so reruns skip re-reading the bytes
+_upload_digests: "OrderedDict[str, str]" = OrderedDict()
+_upload_digests_lock = threading.Lock()
+_MAX_UPLOAD_DIGESTS = 4096
+
+
+def content_hash(data: Any) -> str:
+    """Fast digest of bytes, an uploaded/file-like object, a PIL image or a numpy array"""
+    hasher = hashlib.blake2b(digest_size=16)
+    if isinstance(data, (bytes, bytearray, memoryview)):
+        hasher.update(data)
+    elif isinstance(data, np.ndarray):
+        hasher.update(f"{data.dtype}{data.shape}".encode('utf-8'))
+        hasher.update(np.ascontiguousarray(data).data)
+    elif isinstance(data, Image.Image):
+        hasher.update(f"{data.mode}{data.size}".encode('utf-8'))
+        hasher.update(data.tobytes())
+    elif hasattr(data, 'read'):
+        file_id = getattr(data, 'file_id', None)
+        if file_id is not None:
+            with _upload_digests_lock:
+                digest = _upload_digests.get(file_id)
+            if digest is not None:
+                return digest
+
+        position = data.tell() if hasattr(data, 'tell') else None
+        if hasattr(data, 'seek'):
+            data.seek(0)
+        for chunk in iter(lambda: data.read(_HASH_CHUNK_SIZE), b''):
+            hasher.update(chunk.encode('utf-8') if isinstance(chunk, str) else chunk)
+        if position is not None:
+            data.seek(position)
+
+        if file_id is not None:
+            with _upload_digests_lock:
+                _upload_digests[file_id] = hasher.hexdigest()
+                while len(_upload_digests) > _MAX_UPLOAD_DIGESTS:
+                    _upload_digests.popitem(last=False)
+    else:
+        raise TypeError(f"Cannot content-hash {type(data).__name__}")
+    return hasher.hexdigest()
+
+
+def _key_part(value: Any) -> Any:
+    """Reduce an argument to something JSON-serializable that identifies its content"""
+    if isinstance(value, (bytes, bytearray, memoryview, np.ndarray, Image.Image)) or hasattr(value, 'read'):
+        return {'content': content_hash(value)}
+    if isinstance(value, (list, tuple)):
+        return [_key_part(item) for item in value]
+    if isinstance(value, dict):
+        return {str(k): _key_part(v) for k, v in value.items()}
+    return value
+
+
+def make_result_key(tool: str, params: Dict[str, Any]) -> str:
+    """Build a cache key from a tool name and its inputs (uploads are hashed by content)"""
+    payload = json.dumps({'tool': tool, 'params': _key_part(params)}, sort_keys=True, default=str)
+    return hashlib.blake2b(payload.encode('utf-8'), digest_size=16).hexdigest()
+
+
+def _estimate_size(value: Any) -> int:
+    """Approximate the memory footprint of a cached result"""
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    if isinstance(value, str):
+        return len(value.encode('utf-8'))
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, Image.Image):
+        return len(value.getbands()) * value.width * value.height
+    if isinstance(value, (list, tuple)):
+        return sum(_estimate_size(item) for item in value) + 64
+    if isinstance(value, dict):
+        return sum(_estimate_size(k) + _estimate_size(v) for k, v in value.items()) + 64
+    try:
+        return len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+    except Exception:
+        return 1024
+
+
+class ResultCache(TieredCache):
+    """Process-wide LRU cache for tool results with a byte budget, optional TTL and a pickled disk tier"""
+
+    def __init__(self, max_bytes: int = RESULT_CACHE_MAX_BYTES, ttl_seconds: float = RESULT_CACHE_TTL,
+                 cache_dir: Optional[str] = RESULT_CACHE_DIR, max_disk_bytes: int = RESULT_CACHE_MAX_DISK_BYTES):
+        super().__init__(cache_dir, ttl_seconds, max_bytes, max_disk_bytes)
+
+    def _size_of(self, value: Any) -> int:
+        return _estimate_size(value)
+
+
+def cached_result(tool: Optional[str] = None, ignore: Iterable[str] = ("job",), ttl_seconds: Optional[float] = None,
+                  cache: Optional["ResultCache"] = None):
+    """Decorator that serves repeated calls with the same inputs from the shared result cache
+
+    Uploads, bytes, images and arrays are keyed by content hash, other arguments by value;
+    parameters named in `ignore` (such as a background job handle) are left out of the key.
+    Cached results are shared between sessions, so callers must treat them as read-only.
+    """
+    def decorator(func):
+        name = tool or f"{func.__module__}.{func.__qualname__}"
+        signature = inspect.signature(func)
+        ignored = set(ignore)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            target = cache or result_cache
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            try:
+                key = make_result_key(name, {k: v for k, v in bound.arguments.items() if k not in ignored})
+            except TypeError:
+                return func(*args, **kwargs)
+            return target.get_or_compute(key, lambda: func(*args, **kwargs), ttl_seconds)
+
+        wrapper.uncached = func
+        return wrapper
+    return decorator
+
+
+# Global result cache instance
+result_cache = ResultCache()
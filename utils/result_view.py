@@ -0,0 +1,126 @@
+import csv
+import io
+import math
+import streamlit as st
+from typing import Dict, List, Any, Callable, Hashable, Optional, Sequence, Tuple
+
+import pandas as pd
+
+from utils.session_memory import store_artifact, get_artifact
+
+PAGE_SIZES = [50, 100, 500, 1000]
+DEFAULT_PAGE_SIZE = 100
+
+# Rows are shown in a fixed-height grid so long pages scroll inside it instead of the page
+RESULT_VIEW_HEIGHT = 400
+
+
+def page_bounds(total: int, page: int, page_size: int) -> Tuple[int, int]:
+    """Start and end offsets of a 1-based page, clamped to the result set"""
+    start = min(max(0, (page - 1) * page_size), total)
+    return start, min(start + page_size, total)
+
+
+def filter_results(items: Sequence[Any], query: str) -> Sequence[Any]:
+    """Case-insensitive substring filter over scalar items or the values of dict rows"""
+    query = query.strip().lower()
+    if not query:
+        return items
+    if items and isinstance(items[0], dict):
+        return [row for row in items if any(query in str(value).lower() for value in row.values())]
+    return [item for item in items if query in str(item).lower()]
+
+
+def results_to_bytes(items: Sequence[Any], columns: Optional[List[str]] = None) -> bytes:
+    """Serialize a full result set: CSV for dict rows, one item per line otherwise"""
+    if items and isinstance(items[0], dict):
+        output = io.StringIO()
+        writer = csv.DictWriter(output, fieldnames=columns or list(items[0].keys()), extrasaction='ignore')
+        writer.writeheader()
+        writer.writerows(items)
+        return output.getvalue().encode('utf-8')
+    return '\n'.join(str(item) for item in items).encode('utf-8')
+
+
+def prepared_download_button(label: str, build: Callable[[], bytes], file_name: str, mime: str, key: str,
+                             token: Hashable):
+    """Download button whose bytes are only built once the user asks for them
+
+    A "Prepare" button runs build() and keeps the bytes as a session artifact; the
+    download button is shown from then on, until token (identifying the data) changes.
+    """
+    artifact_key = f"{key}_prepared"
+    prepared = get_artifact(artifact_key)
+    if prepared is None or prepared[0] != token:
+        if not st.button(f"📦 Prepare {file_name}", key=f"{key}_prepare"):
+            return
+        prepared = (token, build())
+        store_artifact(artifact_key, prepared)
+    st.download_button(label=label, data=prepared[1], file_name=file_name, mime=mime, key=key, on_click="ignore")
+
+
+def show_result_view(items: Sequence[Any], key: str, item_label: str = "results",
+                     columns: Optional[List[str]] = None, download_name: Optional[str] = None,
+                     page_size: int = DEFAULT_PAGE_SIZE, filterable: bool = True,
+                     version: Optional[Hashable] = None) -> Dict[str, Any]:
+    """Render a large result set one page at a time
+
+    Items are scalars or dict rows. Only the current page is sent to the browser, as a
+    single grid element, so the cost of a rerun doesn't grow with the result count.
+    The full (unfiltered) set is serialized for download only when the user prepares it;
+    a prepared download is kept until version changes, so download_name requires a
+    version derived from the run or content (e.g. artifact_version() of the stored result).
+    Returns the visible page bounds and the filtered count.
+    """
+    if download_name and version is None:
+        raise ValueError("show_result_view needs a version to offer a download")
+    total = len(items)
+    if not total:
+        st.info(f"No {item_label} found.")
+        return {'total': 0, 'matching': 0, 'start': 0, 'end': 0}
+
+    control_cols = st.columns([3, 1, 1]) if filterable else st.columns([1, 1])
+    query = ""
+    if filterable:
+        with control_cols[0]:
+            query = st.text_input("Filter", key=f"{key}_filter", placeholder=f"Search {item_label}...")
+    visible = filter_results(items, query)
+
+    with control_cols[-1]:
+        size = st.selectbox("Per page", PAGE_SIZES, key=f"{key}_page_size",
+                            index=PAGE_SIZES.index(page_size) if page_size in PAGE_SIZES else 1)
+    pages = max(1, math.ceil(len(visible) / size))
+    page_key = f"{key}_page"
+    # A new or narrower result set may have fewer pages than the one the user was on
+    if st.session_state.get(page_key, 1) > pages:
+        st.session_state[page_key] = pages
+    with control_cols[-2]:
+        page = st.number_input("Page", min_value=1, max_value=pages, step=1, key=page_key)
+
+    start, end = page_bounds(len(visible), int(page), size)
+    if query:
+        st.caption(f"Showing {start + 1 if end else 0:,}–{end:,} of {len(visible):,} matching "
+                   f"{item_label} ({total:,} total)")
+    else:
+        st.caption(f"Showing {start + 1:,}–{end:,} of {total:,} {item_label}")
+
+    window = visible[start:end]
+    if window and isinstance(window[0], dict):
+        frame = pd.DataFrame(list(window), columns=columns)
+    else:
+        frame = pd.DataFrame({(columns or [item_label.title()])[0]: list(window)})
+    frame.index = range(start + 1, end + 1)
+    st.dataframe(frame, width="stretch", height=min(RESULT_VIEW_HEIGHT, 38 + 35 * len(frame)))
+
+    if download_name:
+        is_table = isinstance(items[0], dict)
+        prepared_download_button(
+            label=f"📥 Download all {total:,} {item_label}",
+            build=lambda: results_to_bytes(items, columns),
+            file_name=download_name,
+            mime="text/csv" if is_table else "text/plain",
+            key=f"{key}_download",
+            token=version
+        )
+
+    return {'total': total, 'matching': len(visible), 'start': start, 'end': end}
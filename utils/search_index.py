@@ -0,0 +1,165 @@
+import ast
+import bisect
+import importlib.util
+import re
+import threading
+from collections import defaultdict
+from typing import Dict, List, Any, Tuple
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+_MIN_TRIGRAM_SIMILARITY = 0.4
+
+_indexes: Dict[Tuple[Tuple[str, str], ...], "ToolSearchIndex"] = {}
+_index_lock = threading.Lock()
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lowercase alphanumeric tokens"""
+    return _TOKEN_PATTERN.findall(text.lower())
+
+
+def trigrams(token: str) -> set:
+    """Return the padded character trigrams of a token"""
+    padded = f"  {token} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def extract_tool_categories(module_path: str) -> Dict[str, List[str]]:
+    """Read the tool_categories dict from a module's display_tools() without importing it"""
+    spec = importlib.util.find_spec(module_path)
+    if spec is None or not spec.origin:
+        return {}
+
+    try:
+        with open(spec.origin, 'r', encoding='utf-8') as source_file:
+            tree = ast.parse(source_file.read(), filename=spec.origin)
+    except (OSError, SyntaxError):
+        return {}
+
+    for node in tree.body:
+        if not (isinstance(node, ast.FunctionDef) and node.name == 'display_tools'):
+            continue
+        for statement in node.body:
+            if (isinstance(statement, ast.Assign) and len(statement.targets) == 1
+                    and isinstance(statement.targets[0], ast.Name)
+                    and statement.targets[0].id == 'tool_categories'):
+                try:
+                    return ast.literal_eval(statement.value)
+                except ValueError:
+                    return {}
+    return {}
+
+
+class ToolSearchIndex:
+    """Inverted index over tool names, subcategories and category descriptions"""
+
+    def __init__(self, categories: Dict[str, Any]):
+        # Each document is (category, tool name); tool name None means the category itself
+        self.documents: List[Tuple[str, Any]] = []
+        self.postings: Dict[str, Dict[int, float]] = defaultdict(dict)
+        self.trigram_postings: Dict[str, set] = defaultdict(set)
+        self.sorted_tokens: List[str] = []
+        self._build(categories)
+
+    def _add_document(self, category: str, tool_name, weighted_fields: List[Tuple[str, float]]):
+        doc_id = len(self.documents)
+        self.documents.append((category, tool_name))
+        for text, weight in weighted_fields:
+            for token in tokenize(text):
+                postings = self.postings[token]
+                postings[doc_id] = max(postings.get(doc_id, 0.0), weight)
+
+    def _build(self, categories: Dict[str, Any]):
+        for category_name, category_info in categories.items():
+            self._add_document(category_name, None, [
+                (category_name, 3.0),
+                (category_info.get('description', ''), 1.0)
+            ])
+
+            tool_categories = extract_tool_categories(category_info['module'])
+            for subcategory, tools in tool_categories.items():
+                for tool_name in tools:
+                    self._add_document(category_name, tool_name, [
+                        (tool_name, 3.0),
+                        (subcategory, 1.5),
+                        (category_name, 0.5)
+                    ])
+
+        self.sorted_tokens = sorted(self.postings)
+        for token in self.sorted_tokens:
+            for gram in trigrams(token):
+                self.trigram_postings[gram].add(token)
+
+    def _prefix_tokens(self, prefix: str) -> List[str]:
+        start = bisect.bisect_left(self.sorted_tokens, prefix)
+        matches = []
+        for token in self.sorted_tokens[start:]:
+            if not token.startswith(prefix):
+                break
+            matches.append(token)
+        return matches
+
+    def _fuzzy_tokens(self, token: str) -> List[Tuple[str, float]]:
+        query_grams = trigrams(token)
+        shared = defaultdict(int)
+        for gram in query_grams:
+            for candidate in self.trigram_postings.get(gram, ()):
+                shared[candidate] += 1
+
+        matches = []
+        for candidate, count in shared.items():
+            similarity = count / (len(query_grams) + len(trigrams(candidate)) - count)
+            if similarity >= _MIN_TRIGRAM_SIMILARITY:
+                matches.append((candidate, similarity))
+        return matches
+
+    def _score_token(self, token: str) -> Dict[int, float]:
+        """Score documents for one query token using exact, prefix and trigram matches"""
+        scores: Dict[int, float] = {}
+
+        def merge(index_token: str, factor: float):
+            for doc_id, weight in self.postings[index_token].items():
+                scores[doc_id] = max(scores.get(doc_id, 0.0), weight * factor)
+
+        if token in self.postings:
+            merge(token, 1.0)
+        for prefix_token in self._prefix_tokens(token):
+            if prefix_token != token:
+                merge(prefix_token, 0.8)
+        if not scores:
+            for fuzzy_token, similarity in self._fuzzy_tokens(token):
+                merge(fuzzy_token, 0.6 * similarity)
+        return scores
+
+    def search(self, query: str, limit: int = 50) -> List[Tuple[str, Any, float]]:
+        """Return (category, tool name, score) hits; every query token must match"""
+        query_tokens = tokenize(query)
+        if not query_tokens:
+            return []
+
+        combined = None
+        for token in query_tokens:
+            token_scores = self._score_token(token)
+            if combined is None:
+                combined = token_scores
+            else:
+                combined = {doc_id: combined[doc_id] + score
+                            for doc_id, score in token_scores.items() if doc_id in combined}
+            if not combined:
+                return []
+
+        ranked = sorted(combined.items(), key=lambda item: (-item[1], item[0]))[:limit]
+        return [(*self.documents[doc_id], score) for doc_id, score in ranked]
+
+
+def get_search_index(categories: Dict[str, Any]) -> ToolSearchIndex:
+    """Return the process-wide index for the given categories, building it on first use"""
+    key = tuple((name, info['module']) for name, info in categories.items())
+    index = _indexes.get(key)
+    if index is None:
+        with _index_lock:
+            index = _indexes.get(key)
+            if index is None:
+                index = ToolSearchIndex(categories)
+                _indexes[key] = index
+    return index
@@ -0,0 +1,163 @@
+import os
+import sys
+import time
+import streamlit as st
+from typing import Dict, List, Any, Optional
+
+import numpy as np
+import pandas as pd
+from PIL import Image
+
+# Approximate bytes one browser session may keep in st.session_state before eviction starts
+SESSION_MEMORY_BUDGET = int(float(os.getenv("SESSION_MEMORY_BUDGET_MB", 64)) * 1024 * 1024)
+
+# Append-only logs that are trimmed oldest-first once artifacts alone can't meet the budget,
+# with the number of most recent entries always kept
+TRIMMABLE_LISTS = {
+    'history': 10,
+    'chat_history': 5
+}
+
+_ARTIFACTS_KEY = "_session_artifacts"
+_EVICTIONS_KEY = "_session_evictions"
+_VERSIONS_KEY = "_session_artifact_versions"
+
+
+def estimate_size(value: Any, _seen: Optional[set] = None) -> int:
+    """Approximate the memory held by a session_state value, following containers"""
+    if _seen is None:
+        _seen = set()
+    if id(value) in _seen:
+        return 0
+    _seen.add(id(value))
+
+    if isinstance(value, (bytes, bytearray)):
+        return len(value) + sys.getsizeof(b'')
+    if isinstance(value, str):
+        return sys.getsizeof(value)
+    if isinstance(value, np.ndarray):
+        return value.nbytes + sys.getsizeof(value) if value.base is None else sys.getsizeof(value)
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=False).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(index=True, deep=False))
+    if isinstance(value, Image.Image):
+        return value.width * value.height * len(value.getbands())
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(estimate_size(k, _seen) + estimate_size(v, _seen)
+                                          for k, v in value.items())
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return sys.getsizeof(value) + sum(estimate_size(item, _seen) for item in value)
+    if hasattr(value, 'getbuffer'):
+        return value.getbuffer().nbytes + sys.getsizeof(value)
+    size = getattr(value, 'size', None)
+    if isinstance(size, int) and hasattr(value, 'read'):
+        return size
+    return sys.getsizeof(value)
+
+
+def store_artifact(key: str, value: Any):
+    """Keep a derived artifact (preview, decoded frame, result table) that may be evicted under pressure
+
+    Artifacts can be rebuilt from their inputs, so they are the first thing dropped,
+    least recently used first. Read them back with get_artifact().
+    """
+    st.session_state[key] = value
+    st.session_state.setdefault(_ARTIFACTS_KEY, {})[key] = time.time()
+    versions = st.session_state.setdefault(_VERSIONS_KEY, {})
+    versions[key] = versions.get(key, 0) + 1
+
+
+def artifact_version(key: str) -> int:
+    """How many times an artifact has been stored this session; changes whenever its value is replaced
+
+    The counter outlives eviction, so it can key anything derived from the artifact.
+    """
+    return st.session_state.get(_VERSIONS_KEY, {}).get(key, 0)
+
+
+def get_artifact(key: str, default: Any = None) -> Any:
+    """Return an artifact and mark it as recently used, or default if it was evicted"""
+    if key not in st.session_state:
+        st.session_state.get(_ARTIFACTS_KEY, {}).pop(key, None)
+        return default
+    artifacts = st.session_state.get(_ARTIFACTS_KEY, {})
+    if key in artifacts:
+        artifacts[key] = time.time()
+    return st.session_state[key]
+
+
+def drop_artifact(key: str):
+    st.session_state.get(_ARTIFACTS_KEY, {}).pop(key, None)
+    if key in st.session_state:
+        del st.session_state[key]
+
+
+def get_session_sizes() -> Dict[str, int]:
+    """Approximate size of every session_state entry"""
+    sizes = {}
+    for key in list(st.session_state.keys()):
+        try:
+            sizes[key] = estimate_size(st.session_state[key])
+        except Exception:
+            sizes[key] = 0
+    return sizes
+
+
+def enforce_session_budget(budget: int = SESSION_MEMORY_BUDGET) -> List[str]:
+    """Evict artifacts (least recently used first), then trim old log entries, until under budget
+
+    Returns descriptions of what was evicted. Widget values and other state are never touched.
+    """
+    sizes = get_session_sizes()
+    total = sum(sizes.values())
+    if total <= budget:
+        return []
+
+    evicted = []
+    artifacts = st.session_state.get(_ARTIFACTS_KEY, {})
+    for key, _last_used in sorted(artifacts.items(), key=lambda item: item[1]):
+        if total <= budget:
+            break
+        total -= sizes.get(key, 0)
+        drop_artifact(key)
+        evicted.append(key)
+
+    for key, keep in TRIMMABLE_LISTS.items():
+        entries = st.session_state.get(key)
+        if total <= budget or not isinstance(entries, list):
+            continue
+        dropped = 0
+        while total > budget and len(entries) > keep:
+            total -= estimate_size(entries.pop(0))
+            dropped += 1
+        if dropped:
+            evicted.append(f"{key} ({dropped} oldest entries)")
+
+    if evicted:
+        log = st.session_state.setdefault(_EVICTIONS_KEY, [])
+        log.extend({'time': time.strftime('%H:%M:%S'), 'evicted': item} for item in evicted)
+        del log[:-20]
+    return evicted
+
+
+def get_session_memory_report(limit: int = 10) -> Dict[str, Any]:
+    """Largest session_state entries plus totals, for the admin panel"""
+    sizes = get_session_sizes()
+    artifacts = st.session_state.get(_ARTIFACTS_KEY, {})
+    consumers = [
+        {
+            'Key': key,
+            'Type': type(st.session_state[key]).__name__,
+            'Size (KB)': round(size / 1024, 1),
+            'Evictable': 'artifact' if key in artifacts else ('trimmable' if key in TRIMMABLE_LISTS else '')
+        }
+        for key, size in sorted(sizes.items(), key=lambda item: item[1], reverse=True)[:limit]
+    ]
+    return {
+        'total_bytes': sum(sizes.values()),
+        'budget_bytes': SESSION_MEMORY_BUDGET,
+        'entries': len(sizes),
+        'top_consumers': consumers,
+        'recent_evictions': list(st.session_state.get(_EVICTIONS_KEY, []))
+    }
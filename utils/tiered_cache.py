@@ -0,0 +1,310 @@
+import os
+import time
+import pickle
+import threading
+from collections import OrderedDict
+from typing import Optional, Dict, Any, Callable, List, Tuple
+
+# Pruning brings the disk tier down to this fraction of its budget, so a full scan is rare
+DISK_PRUNE_TARGET = 0.9
+
+
+def estimate_size(value: Any) -> int:
+    """Approximate the memory footprint of a cached value"""
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    if isinstance(value, str):
+        return len(value.encode('utf-8'))
+    if isinstance(value, (list, tuple)):
+        return sum(estimate_size(item) for item in value) + 64
+    if isinstance(value, dict):
+        return sum(estimate_size(k) + estimate_size(v) for k, v in value.items()) + 64
+    try:
+        return len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+    except Exception:
+        return 1024
+
+
+class TieredCache:
+    """Two-tier cache: an in-memory LRU with a byte budget in front of an optional disk tier
+
+    Entries expire after ttl_seconds (0 keeps them until evicted). Only the in-memory
+    bookkeeping runs under the lock; disk reads, writes and pruning happen outside it,
+    so a memory hit never waits on I/O. The disk tier's size is kept as a running total
+    and the directory is only scanned once that total crosses the budget.
+    Subclasses choose the on-disk format (FILE_EXTENSION, _serialize, _deserialize),
+    how values are sized and which values are worth storing.
+    """
+
+    FILE_EXTENSION = ".pkl"
+    SERIALIZE_ERRORS: Tuple[type, ...] = (pickle.PicklingError, TypeError, AttributeError, ValueError)
+    DESERIALIZE_ERRORS: Tuple[type, ...] = (pickle.UnpicklingError, EOFError, AttributeError, ImportError,
+                                            ValueError)
+
+    def __init__(self, cache_dir: Optional[str] = None, ttl_seconds: float = 0,
+                 max_memory_bytes: int = 256 * 1024 * 1024, max_disk_bytes: int = 1024 * 1024 * 1024):
+        self.ttl_seconds = ttl_seconds
+        self.max_memory_bytes = max_memory_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self.cache_dir = cache_dir
+        self._memory: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._memory_bytes = 0
+        self._inflight: Dict[str, threading.Event] = {}
+        # Guards the memory tier, stats and in-flight computations
+        self._lock = threading.Lock()
+        # Guards the disk tier's running total, measured on first write and then kept up to date
+        self._disk_lock = threading.Lock()
+        self._disk_bytes: Optional[int] = None
+        self._pruning = False
+        self.stats = {
+            'memory_hits': 0,
+            'disk_hits': 0,
+            'misses': 0,
+            'stores': 0,
+            'evictions': 0,
+            'expired': 0
+        }
+
+        if self.cache_dir:
+            try:
+                os.makedirs(self.cache_dir, exist_ok=True)
+            except OSError:
+                self.cache_dir = None
+
+    # Subclass hooks
+
+    def _serialize(self, record: Dict[str, Any]) -> bytes:
+        return pickle.dumps(record, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def _deserialize(self, data: bytes) -> Dict[str, Any]:
+        return pickle.loads(data)
+
+    def _size_of(self, value: Any) -> int:
+        return estimate_size(value)
+
+    def _should_store(self, value: Any) -> bool:
+        return True
+
+    def _expires_at(self, ttl_seconds: Optional[float]) -> float:
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        return time.time() + ttl if ttl > 0 else float('inf')
+
+    # Memory tier (call with the lock held)
+
+    def _memory_get(self, key: str) -> Optional[Dict[str, Any]]:
+        entry = self._memory.get(key)
+        if entry is None:
+            return None
+        if entry['expires_at'] < time.time():
+            self._memory_remove(key)
+            self.stats['expired'] += 1
+            return None
+        self._memory.move_to_end(key)
+        return entry
+
+    def _memory_put(self, key: str, entry: Dict[str, Any]):
+        if entry['size'] > self.max_memory_bytes:
+            return
+        self._memory_remove(key)
+        self._memory[key] = entry
+        self._memory_bytes += entry['size']
+        while self._memory_bytes > self.max_memory_bytes and self._memory:
+            self._memory_remove(next(iter(self._memory)))
+            self.stats['evictions'] += 1
+
+    def _memory_remove(self, key: str):
+        entry = self._memory.pop(key, None)
+        if entry is not None:
+            self._memory_bytes -= entry['size']
+
+    # Disk tier (call without the lock)
+
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], f"{key}{self.FILE_EXTENSION}")
+
+    def _disk_get(self, key: str) -> Optional[Dict[str, Any]]:
+        if not self.cache_dir:
+            return None
+        path = self._disk_path(key)
+        try:
+            with open(path, 'rb') as cache_file:
+                record = self._deserialize(cache_file.read())
+        except (OSError, *self.DESERIALIZE_ERRORS):
+            return None
+        if record.get('expires_at', 0) < time.time():
+            with self._lock:
+                self.stats['expired'] += 1
+            self._disk_remove(path)
+            return None
+        return record
+
+    def _disk_put(self, key: str, record: Dict[str, Any]):
+        if not self.cache_dir:
+            return
+        try:
+            data = self._serialize(record)
+        except self.SERIALIZE_ERRORS:
+            return
+        path = self._disk_path(key)
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(temp_path, 'wb') as cache_file:
+                cache_file.write(data)
+            replaced = os.path.getsize(path) if os.path.exists(path) else 0
+            os.replace(temp_path, path)
+        except OSError:
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+            return
+        self._disk_account(len(data) - replaced)
+
+    def _disk_remove(self, path: str) -> bool:
+        try:
+            size = os.path.getsize(path)
+            os.remove(path)
+        except OSError:
+            return False
+        with self._disk_lock:
+            if self._disk_bytes is not None:
+                self._disk_bytes -= size
+        return True
+
+    def _disk_files(self) -> List[Tuple[float, int, str]]:
+        """(mtime, size, path) of every entry file in the disk tier"""
+        files = []
+        for root, _dirs, names in os.walk(self.cache_dir):
+            for name in names:
+                if not name.endswith(self.FILE_EXTENSION):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                files.append((stat.st_mtime, stat.st_size, path))
+        return files
+
+    def _disk_account(self, delta: int):
+        """Add a write to the running total and prune once it crosses the budget"""
+        with self._disk_lock:
+            if self._disk_bytes is None:
+                # First write: the scan already includes the file just written
+                self._disk_bytes = sum(size for _mtime, size, _path in self._disk_files())
+            else:
+                self._disk_bytes += delta
+            if self._disk_bytes <= self.max_disk_bytes or self._pruning:
+                return
+            self._pruning = True
+        try:
+            self._enforce_disk_budget()
+        finally:
+            with self._disk_lock:
+                self._pruning = False
+
+    def _enforce_disk_budget(self):
+        """Remove the least recently written files until the disk tier is under DISK_PRUNE_TARGET of its budget"""
+        files = self._disk_files()
+        total = sum(size for _mtime, size, _path in files)
+        target = self.max_disk_bytes * DISK_PRUNE_TARGET
+        removed = 0
+        for _mtime, size, path in sorted(files):
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+        with self._disk_lock:
+            self._disk_bytes = total
+        with self._lock:
+            self.stats['evictions'] += removed
+
+    # Public API
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Return a cached value, or default on a miss"""
+        with self._lock:
+            entry = self._memory_get(key)
+            if entry is not None:
+                self.stats['memory_hits'] += 1
+                return entry['value']
+
+        record = self._disk_get(key)
+        with self._lock:
+            if record is None:
+                self.stats['misses'] += 1
+                return default
+            self.stats['disk_hits'] += 1
+            self._memory_put(key, {'value': record['value'], 'expires_at': record['expires_at'],
+                                   'size': self._size_of(record['value'])})
+            return record['value']
+
+    def set(self, key: str, value: Any, ttl_seconds: Optional[float] = None):
+        """Store a value in memory and, when configured, on disk"""
+        record = {'value': value, 'expires_at': self._expires_at(ttl_seconds)}
+        with self._lock:
+            self._memory_put(key, dict(record, size=self._size_of(value)))
+            self.stats['stores'] += 1
+        self._disk_put(key, record)
+
+    def get_or_compute(self, key: str, compute: Callable[[], Any], ttl_seconds: Optional[float] = None) -> Any:
+        """Return the cached value for key, computing it once on a miss
+
+        Concurrent callers asking for the same missing key wait for the first one instead
+        of repeating the work. Values rejected by _should_store are returned but not cached,
+        and exceptions propagate and leave nothing cached.
+        """
+        missing = object()
+        while True:
+            value = self.get(key, missing)
+            if value is not missing:
+                return value
+            with self._lock:
+                pending = self._inflight.get(key)
+                if pending is None:
+                    done = self._inflight[key] = threading.Event()
+                    break
+            pending.wait()
+            # Loop: the owner either stored a value or failed, in which case we compute ourselves
+
+        try:
+            value = compute()
+            if self._should_store(value):
+                self.set(key, value, ttl_seconds)
+            return value
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            done.set()
+
+    def clear(self):
+        """Drop every entry from both tiers"""
+        with self._lock:
+            self._memory.clear()
+            self._memory_bytes = 0
+        if self.cache_dir:
+            for _mtime, _size, path in self._disk_files():
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            with self._disk_lock:
+                self._disk_bytes = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and current memory usage"""
+        with self._lock:
+            stats = dict(self.stats)
+            stats['entries'] = len(self._memory)
+            stats['memory_bytes'] = self._memory_bytes
+            stats['max_memory_bytes'] = self.max_memory_bytes
+        stats['disk_bytes'] = self._disk_bytes
+        hits = stats['memory_hits'] + stats['disk_hits']
+        lookups = hits + stats['misses']
+        stats['hit_rate'] = hits / lookups if lookups else 0.0
+        return stats
@@ -0,0 +1,102 @@
+import ast
+import importlib
+import importlib.util
+import sys
+import threading
+import time
+from functools import lru_cache
+from typing import Dict, List, Any, Optional
+
+# Third-party packages that dominate cold-start time when a tool module is imported
+HEAVY_DEPENDENCIES = [
+    "cv2", "sklearn", "matplotlib", "seaborn", "scipy", "pandas",
+    "numpy", "PIL", "cryptography", "qrcode", "requests"
+]
+
+_loaded_modules: Dict[str, Any] = {}
+_import_records: Dict[str, Dict[str, Any]] = {}
+_import_lock = threading.Lock()
+
+
+def _loaded_heavy_dependencies() -> set:
+    """Return the heavy dependencies currently present in sys.modules"""
+    return {name for name in HEAVY_DEPENDENCIES if name in sys.modules}
+
+
+def load_tool_module(module_path: str):
+    """Import a tool module on first use and cache it for the rest of the process"""
+    module = _loaded_modules.get(module_path)
+    if module is not None:
+        return module
+
+    with _import_lock:
+        module = _loaded_modules.get(module_path)
+        if module is not None:
+            return module
+
+        heavy_before = _loaded_heavy_dependencies()
+        start = time.perf_counter()
+        module = importlib.import_module(module_path)
+        elapsed = time.perf_counter() - start
+
+        _import_records[module_path] = {
+            'import_seconds': elapsed,
+            'pulled_in': sorted(_loaded_heavy_dependencies() - heavy_before),
+            'imported_at': time.time()
+        }
+        _loaded_modules[module_path] = module
+        return module
+
+
+def is_module_loaded(module_path: str) -> bool:
+    """Check whether a tool module has already been imported through the registry"""
+    return module_path in _loaded_modules
+
+
+@lru_cache(maxsize=None)
+def declared_heavy_dependencies(module_path: str) -> tuple:
+    """Statically list the heavy dependencies a module imports, without importing it"""
+    spec = importlib.util.find_spec(module_path)
+    if spec is None or not spec.origin:
+        return ()
+
+    try:
+        with open(spec.origin, 'r', encoding='utf-8') as source_file:
+            tree = ast.parse(source_file.read(), filename=spec.origin)
+    except (OSError, SyntaxError):
+        return ()
+
+    found = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names = [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom) and node.module and node.level == 0:
+            names = [node.module]
+        else:
+            continue
+
+        for name in names:
+            root = name.split('.')[0]
+            if root in HEAVY_DEPENDENCIES:
+                found.add(root)
+
+    return tuple(sorted(found))
+
+
+def get_import_report(categories: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Build a per-category report of heavy dependencies and measured import cost"""
+    report = []
+    for category_name, category_info in categories.items():
+        module_path = category_info['module']
+        record: Optional[Dict[str, Any]] = _import_records.get(module_path)
+
+        report.append({
+            'Category': category_name,
+            'Module': module_path,
+            'Loaded': module_path in _loaded_modules,
+            'Heavy Dependencies': ', '.join(declared_heavy_dependencies(module_path)) or '-',
+            'Pulled In On Load': (', '.join(record['pulled_in']) or '-') if record else '-',
+            'Import Time (ms)': round(record['import_seconds'] * 1000, 1) if record else None
+        })
+
+    return report